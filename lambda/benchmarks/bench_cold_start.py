@@ -0,0 +1,90 @@
+"""
+핸들러 cold start 벤치마크 (import + DynamoDB 클라이언트 준비 시간)
+- 핸들러마다 새 파이썬 프로세스에서 측정 (모듈 캐시 없는 cold start 재현, 네트워크 호출 없음)
+- import: 핸들러 모듈 import 시간 (init 단계)
+- first use: 첫 요청이 DynamoDB를 쓰기 전에 추가로 드는 시간 (client 모드의 지연 생성 비용)
+- 모드별 비교
+  resource: 기존 boto3.resource('dynamodb') (DYNAMODB_ACCESS=resource)
+  client:   linksnap_common.dynamo 지연 생성 client
+  preload:  client + AWS_PRELOAD_CLIENTS=dynamodb (생성 비용을 init 단계로 이동)
+
+사용법:
+  python lambda/benchmarks/bench_cold_start.py --runs 7
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+LAYER_DIR = os.path.join(LAMBDA_DIR, 'layers', 'common', 'python')
+
+HANDLERS = [
+    ('create_url', 'shorten_url'),
+    ('create_url', 'shorten_batch'),
+    ('redirect', 'redirect'),
+    ('redirect', 'click_consumer'),
+    ('stats', 'get_url_stats'),
+    ('stats', 'get_site_stats'),
+    ('stats', 'list_urls'),
+]
+
+MODES = {
+    'resource': {'DYNAMODB_ACCESS': 'resource'},
+    'client': {'DYNAMODB_ACCESS': 'client'},
+    'preload': {'DYNAMODB_ACCESS': 'client', 'AWS_PRELOAD_CLIENTS': 'dynamodb'},
+}
+
+# 자식 프로세스에서 실행: import 시간 → 첫 DynamoDB 사용 준비 시간 (ms, JSON 출력)
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+imported = time.perf_counter()
+from linksnap_common import dynamo
+if dynamo.DYNAMODB_ACCESS == 'client':
+    dynamo.get_client('dynamodb')
+ready = time.perf_counter()
+print(json.dumps({'import': (imported - start) * 1000, 'first_use': (ready - imported) * 1000}))
+"""
+
+
+def probe(function_dir, module, mode_env):
+    env = {
+        **os.environ,
+        'AWS_DEFAULT_REGION': 'ap-northeast-2',
+        'AWS_ACCESS_KEY_ID': 'bench',
+        'AWS_SECRET_ACCESS_KEY': 'bench',
+        'PYTHONPATH': os.pathsep.join([os.path.join(LAMBDA_DIR, 'functions', function_dir), LAYER_DIR]),
+        'PYTHONDONTWRITEBYTECODE': '1',
+        **mode_env
+    }
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, module], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=7, help='핸들러/모드별 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--modes', default=','.join(MODES))
+    args = parser.parse_args()
+    modes = args.modes.split(',')
+
+    print(f"{'handler':<16}" + ''.join(f"{mode + ' import/first/total (ms)':>38}" for mode in modes))
+    for function_dir, module in HANDLERS:
+        row = f"{module:<16}"
+        for mode in modes:
+            samples = [probe(function_dir, module, MODES[mode]) for _ in range(args.runs)]
+            imported = statistics.median(s['import'] for s in samples)
+            first_use = statistics.median(s['first_use'] for s in samples)
+            total = statistics.median(s['import'] + s['first_use'] for s in samples)
+            row += f"{f'{imported:.1f} / {first_use:.1f} / {total:.1f}':>38}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
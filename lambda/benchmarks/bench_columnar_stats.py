@@ -0,0 +1,94 @@
+"""
+클릭 통계 집계 벤치마크 (행 단위 get_url_stats.calculate_stats vs NumPy 컬럼 집계 linksnap_common.columnar)
+- DynamoDB 없이 메모리에 만든 클릭 아이템(리소스 API가 돌려주는 dict 형태)으로 집계 시간만 측정
+- User-Agent/referer 원문은 실제 트래픽처럼 종류가 제한된 풀에서 뽑음 (--user-agents, --referers)
+- full(원문) / compact(기록 시점 분류) / mixed 형식별 rows/s와 결과 일치 여부
+
+사용법:
+  python lambda/benchmarks/bench_columnar_stats.py --rows 1000000 --schema full,compact
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(LAMBDA_DIR, 'layers', 'common', 'python'))
+sys.path.insert(0, os.path.join(LAMBDA_DIR, 'functions', 'stats'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import get_url_stats  # noqa: E402
+from linksnap_common import columnar  # noqa: E402
+from linksnap_common.clicks import build_click_item  # noqa: E402
+
+DEVICE_TEMPLATES = [
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_{n} like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 14; SM-S91{n}) AppleWebKit/537.36 Chrome/129.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (iPad; CPU OS 17_{n} like Mac OS X) AppleWebKit/605.1.15 Version/17.0 Safari/604.1',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/12{n}.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_{n}) AppleWebKit/605.1.15 Version/17.1 Safari/605.1.15'
+]
+REFERER_HOSTS = ['https://t.co', 'https://www.google.com', 'https://m.facebook.com', 'https://news.ycombinator.com',
+                 'https://www.instagram.com', 'https://blog.example.kr']
+COUNTRIES = ['KR', 'US', 'JP', 'DE', 'unknown']
+
+
+def build_items(rows, schema, user_agent_count, referer_count, days, seed=42):
+    """리소스 API 결과와 같은 dict 목록 (schema: full / compact / mixed)"""
+    rng = random.Random(seed)
+    user_agents = [rng.choice(DEVICE_TEMPLATES).format(n=i) for i in range(user_agent_count)]
+    referers = ['direct'] + [f"{rng.choice(REFERER_HOSTS)}/p/{i}?utm_source=s{i % 7}" for i in range(referer_count)]
+    now = datetime.utcnow()
+
+    items = []
+    for i in range(rows):
+        clicked_at = now - timedelta(seconds=rng.randint(0, days * 86400 - 1), microseconds=rng.randint(0, 999999))
+        item_schema = schema if schema != 'mixed' else ('compact' if i % 2 else 'full')
+        items.append(build_click_item(
+            'bench01', clicked_at, uuid.UUID(int=rng.getrandbits(128)),
+            rng.choice(user_agents), rng.choice(referers), rng.choice(COUNTRIES), f"10.0.{i % 256}.{i % 251}",
+            schema=item_schema
+        ))
+    return items
+
+
+def timed(calculate, items, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stats = calculate(items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--schema', default='full,compact,mixed', help='full / compact / mixed (쉼표로 여러 개)')
+    parser.add_argument('--user-agents', type=int, default=2000, help='서로 다른 User-Agent 수')
+    parser.add_argument('--referers', type=int, default=500, help='서로 다른 referer URL 수')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not columnar.AVAILABLE:
+        sys.exit('numpy가 필요합니다: pip install numpy')
+
+    print(f"rows={args.rows} user_agents={args.user_agents} referers={args.referers} (best of {args.repeat})")
+    print(f"{'schema':>8} {'engine':>9} {'wall (s)':>9} {'rows/s':>12} {'speedup':>8} {'same result':>12}")
+    for schema in args.schema.split(','):
+        items = build_items(args.rows, schema, args.user_agents, args.referers, args.days)
+        python_time, expected = timed(get_url_stats.calculate_stats, items, args.repeat)
+        columnar_time, stats = timed(columnar.calculate_stats, items, args.repeat)
+
+        print(f"{schema:>8} {'python':>9} {python_time:>9.3f} {args.rows / python_time:>12,.0f} {'1.0x':>8} {'-':>12}")
+        print(f"{schema:>8} {'columnar':>9} {columnar_time:>9.3f} {args.rows / columnar_time:>12,.0f} "
+              f"{python_time / columnar_time:>7.1f}x {str(stats == expected):>12}")
+
+
+if __name__ == '__main__':
+    main()
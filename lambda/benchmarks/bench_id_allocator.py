@@ -0,0 +1,128 @@
+"""
+단축 코드 할당기 벤치마크 (발급 속도 / 충돌 수)
+- legacy: md5(url + time)[:6] hex (기존 generate_url_id, 24비트)
+- random: 무작위 base62 (--length 자리)
+- block:  할당 카운터에서 --block-size개씩 범위 임대 (로컬 counters 테이블 대체)
+
+충돌 수 = --count개 발급하는 동안 이미 쓰인 코드가 다시 나온 횟수
+  (legacy는 그만큼 기존 링크를 덮어썼고, random은 그만큼 조건부 put 재시도가 발생)
+  메모리를 줄이기 위해 코드 값을 나머지 기준으로 나눠 여러 번 같은 시드로 다시 생성하며 집계
+retry@N = 테이블에 --count개가 찼을 때 새 무작위 코드 하나가 기존 코드와 겹칠 확률
+
+사용법:
+  python lambda/benchmarks/bench_id_allocator.py --count 10000000 --length 7
+"""
+import argparse
+import hashlib
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'layers', 'common', 'python'))
+
+from linksnap_common.ids import BlockIdAllocator, RandomIdAllocator, decode_base62  # noqa: E402
+
+
+class LocalCounterTable:
+    """할당 카운터 ADD만 흉내내는 counters 테이블 대체"""
+
+    def __init__(self):
+        self.items = {}
+        self.write_requests = 0
+
+    def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+        self.write_requests += 1
+        value = self.items.get(Key['counterId'], 0) + ExpressionAttributeValues[':block']
+        self.items[Key['counterId']] = value
+        return {'Attributes': {'next': value}}
+
+
+def legacy_ids(count, seed):
+    base = 1_700_000_000.0 + seed
+    for i in range(count):
+        yield hashlib.md5(f"https://example.com/campaign/{i}{base + i * 1e-4}".encode()).hexdigest()[:6]
+
+
+def random_ids(count, seed, length):
+    allocator = RandomIdAllocator(length=length, randbelow=random.Random(seed).randrange)
+    for _ in range(count):
+        yield allocator.next_id()
+
+
+def block_ids(count, length, block_size, table=None):
+    allocator = BlockIdAllocator(table or LocalCounterTable(), block_size=block_size, length=length)
+    for _ in range(count):
+        yield allocator.next_id()
+
+
+def measure_rate(ids):
+    started = time.perf_counter()
+    count = sum(1 for _ in ids)
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed else 0
+
+
+def count_collisions(make_ids, to_int, count, bucket_size=2_000_000):
+    """같은 스트림을 나머지 구간별로 나눠 여러 번 생성하며 중복 횟수 집계"""
+    passes = max(1, count // bucket_size)
+    collisions = 0
+    for part in range(passes):
+        seen = set()
+        for code in make_ids():
+            value = to_int(code)
+            if value % passes != part:
+                continue
+            if value in seen:
+                collisions += 1
+            else:
+                seen.add(value)
+    return collisions
+
+
+def expected_collisions(count, space):
+    """무작위 균등 발급 시 기대 중복 횟수 = count - 기대 고유 개수"""
+    return count + space * math.expm1(count * math.log1p(-1 / space))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='단축 코드 할당기 벤치마크')
+    parser.add_argument('--count', type=int, default=10_000_000, help='발급할 코드 수')
+    parser.add_argument('--length', type=int, default=7, help='base62 코드 길이')
+    parser.add_argument('--block-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    count, length = args.count, args.length
+    block_table = LocalCounterTable()
+    scenarios = [
+        ('legacy md5 hex6', 16 ** 6,
+         lambda: legacy_ids(count, args.seed), lambda code: int(code, 16)),
+        (f"random base62 len={length}", 62 ** length,
+         lambda: random_ids(count, args.seed, length), decode_base62),
+        (f"block base62 len={length}", 62 ** length,
+         lambda: block_ids(count, length, args.block_size), decode_base62),
+    ]
+
+    print(f"count={count:,}, block_size={args.block_size}")
+    print(f"{'allocator':<26}{'ids/s':>12}{'collisions':>13}{'expected':>12}{'rate':>10}{'retry@N':>12}")
+
+    for name, space, make_ids, to_int in scenarios:
+        rate = measure_rate(make_ids())
+        collisions = count_collisions(make_ids, to_int, count)
+        # 블록 방식은 범위가 겹치지 않으므로 기대 충돌/재시도 확률 0
+        is_block = name.startswith('block')
+        expected = 0 if is_block else expected_collisions(count, space)
+        retry = 0 if is_block else min(1.0, count / space)
+        print(f"{name:<26}{rate:>12,.0f}{collisions:>13,}{expected:>12,.0f}"
+              f"{collisions / count:>10.2e}{retry:>12.2e}")
+
+    # 블록 임대 한 번이 DynamoDB 조율 1회 → count / block_size회만 카운터에 씀
+    measure_rate(block_ids(count, length, args.block_size, block_table))
+    print(f"block allocator counter writes: {block_table.write_requests:,} "
+          f"({block_table.write_requests / count:.4f} per id)")
+
+
+if __name__ == '__main__':
+    main()
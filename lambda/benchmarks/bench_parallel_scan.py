@@ -0,0 +1,140 @@
+"""
+병렬 segment 스캔 벤치마크 (get_site_stats.scan_site_stats 전체 스캔 경로)
+- 로컬 DynamoDB 대체 테이블: 아이템을 키 해시로 segment에 배정하고, 스캔 호출마다 페이지 크기에 비례한 지연(sleep)을 줌
+  (네트워크/읽기 대기 동안 GIL이 풀리는 실제 client 호출과 같은 조건)
+- SCAN_SEGMENTS별 벽시계 시간과 결과 일치 여부 비교
+
+사용법:
+  python lambda/benchmarks/bench_parallel_scan.py --urls 20000 --segments 1,2,4,8
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(LAMBDA_DIR, 'layers', 'common', 'python'))
+sys.path.insert(0, os.path.join(LAMBDA_DIR, 'functions', 'stats'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import get_site_stats  # noqa: E402
+
+
+class LocalScanTable:
+    """Segment/TotalSegments, Limit(페이지 크기), ExclusiveStartKey를 지원하는 scan 전용 대체 테이블"""
+
+    def __init__(self, items, key, page_size=1000, call_latency=0.03, item_latency=0.00002):
+        self.items = items
+        self.key = key
+        self.page_size = page_size
+        self.call_latency = call_latency
+        self.item_latency = item_latency
+        self.calls = 0
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    def _segment_of(self, item, total_segments):
+        return zlib.crc32(str(item[self.key]).encode()) % total_segments
+
+    def _segment_items(self, segment, total_segments):
+        with self._lock:
+            if total_segments not in self._segments:
+                segments = [[] for _ in range(total_segments)]
+                for item in self.items:
+                    segments[self._segment_of(item, total_segments)].append(item)
+                self._segments[total_segments] = segments
+        return self._segments[total_segments][segment]
+
+    def scan(self, Segment=None, TotalSegments=None, ExclusiveStartKey=None, **kwargs):
+        self.calls += 1
+        items = self._segment_items(Segment, TotalSegments) if TotalSegments else self.items
+        start = ExclusiveStartKey['offset'] if ExclusiveStartKey else 0
+        page = items[start:start + self.page_size]
+        time.sleep(self.call_latency + self.item_latency * len(page))
+
+        response = {'Items': [dict(item) for item in page]}
+        if start + self.page_size < len(items):
+            response['LastEvaluatedKey'] = {'offset': start + self.page_size}
+        return response
+
+
+def build_tables(url_count, clicks_per_url, page_size, call_latency, item_latency):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    urls = []
+    clicks = []
+    for i in range(url_count):
+        url_id = f"u{i:07d}"
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        urls.append({
+            'urlId': url_id,
+            'shortUrl': f"https://lnk.example/{url_id}",
+            'originalUrl': f"https://example.com/{i}",
+            'clickCount': rng.randint(0, 5000),
+            'createdAt': created_at.isoformat()
+        })
+        for _ in range(clicks_per_url):
+            clicked_at = now - timedelta(minutes=rng.randint(0, 60 * 48))
+            clicks.append({'urlId': url_id, 'clickKey': f"{clicked_at.isoformat()}#{rng.random()}",
+                           'timestamp': clicked_at.isoformat()})
+
+    def table(items, key):
+        return LocalScanTable(items, key, page_size, call_latency, item_latency)
+
+    return table(urls, 'urlId'), table(clicks, 'clickKey')
+
+
+def comparable(stats):
+    """segment 수와 무관해야 하는 값 (같은 clickCount/createdAt끼리의 순서는 스캔 순서에 따라 달라짐)"""
+    return (
+        stats['totalUrls'], stats['totalClicks'], stats['todayClicks'], stats['yesterdayClicks'],
+        [url['clickCount'] for url in stats['popularUrls']],
+        [url['createdAt'] for url in stats['recentUrls']]
+    )
+
+
+def run(segments, urls_table, clicks_table, now):
+    get_site_stats.SCAN_SEGMENTS = segments
+    get_site_stats.urls_table = urls_table
+    get_site_stats.clicks_table = clicks_table
+    urls_table.calls = clicks_table.calls = 0
+
+    start = time.perf_counter()
+    stats = get_site_stats.scan_site_stats(now, include_all_urls=False)
+    return time.perf_counter() - start, urls_table.calls + clicks_table.calls, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--urls', type=int, default=20000)
+    parser.add_argument('--clicks-per-url', type=int, default=2)
+    parser.add_argument('--segments', default='1,2,4,8,16')
+    parser.add_argument('--page-size', type=int, default=1000, help='스캔 페이지당 아이템 수 (1MB 한도 대체)')
+    parser.add_argument('--call-latency', type=float, default=0.03, help='스캔 호출당 고정 지연 (초)')
+    parser.add_argument('--item-latency', type=float, default=0.00002, help='아이템당 추가 지연 (초)')
+    args = parser.parse_args()
+
+    get_site_stats.STATS_SOURCE = 'raw'
+    get_site_stats.click_counter = None
+    urls_table, clicks_table = build_tables(
+        args.urls, args.clicks_per_url, args.page_size, args.call_latency, args.item_latency
+    )
+    now = datetime.utcnow()
+
+    print(f"urls={args.urls} clicks={len(clicks_table.items)} page_size={args.page_size}")
+    print(f"{'segments':>8} {'scan calls':>11} {'wall (s)':>9} {'speedup':>8} {'same result':>12}")
+    baseline = None
+    for segments in [int(s) for s in args.segments.split(',')]:
+        elapsed, calls, stats = run(segments, urls_table, clicks_table, now)
+        if baseline is None:
+            baseline = (elapsed, stats)
+        same = comparable(stats) == comparable(baseline[1])
+        print(f"{segments:>8} {calls:>11} {elapsed:>9.3f} {baseline[0] / elapsed:>7.1f}x {str(same):>12}")
+
+
+if __name__ == '__main__':
+    main()
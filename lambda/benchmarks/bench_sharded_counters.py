@@ -0,0 +1,147 @@
+"""
+샤딩 클릭 카운터 부하 벤치마크
+- 로컬 DynamoDB 대체 테이블: 파티션 키별 쓰기 한도(기본 1000 WCU/s)를 토큰 버킷으로 재현
+- 인기 링크 1개에 초당 N회 클릭이 몰릴 때 모드별 반영 처리량/스로틀 비율 비교
+  single(샤드 1개 = 기존 urls.clickCount 방식) / sharded / sharded + write-behind
+
+사용법:
+  python lambda/benchmarks/bench_sharded_counters.py --rate 5000 --seconds 10
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'layers', 'common', 'python'))
+
+from linksnap_common.counters import ShardedCounter  # noqa: E402
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ThrottlingException(Exception):
+    pass
+
+
+class LocalCounterTable:
+    """파티션 키별 토큰 버킷으로 쓰기 한도를 흉내내는 counters 테이블 대체"""
+
+    def __init__(self, clock, partition_wcu=1000):
+        self.clock = clock
+        self.partition_wcu = partition_wcu
+        self.items = {}
+        self.buckets = {}
+        self.write_requests = 0
+        self.throttled = 0
+
+    def _consume(self, partition_key):
+        tokens, updated = self.buckets.get(partition_key, (self.partition_wcu, 0.0))
+        now = self.clock()
+        tokens = min(self.partition_wcu, tokens + (now - updated) * self.partition_wcu)
+        if tokens < 1:
+            self.buckets[partition_key] = (tokens, now)
+            self.throttled += 1
+            raise ThrottlingException(partition_key)
+        self.buckets[partition_key] = (tokens - 1, now)
+
+    def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+        self.write_requests += 1
+        counter_id = Key['counterId']
+        self._consume(counter_id)
+        item = self.items.setdefault(counter_id, {'counterId': counter_id, 'count': 0})
+        item['urlId'] = ExpressionAttributeValues[':url']
+        item['count'] += ExpressionAttributeValues[':inc']
+
+
+class LocalDynamoDB:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):
+        return self.table
+
+    def batch_get_item(self, RequestItems):
+        responses = {}
+        for table_name, request in RequestItems.items():
+            responses[table_name] = [
+                dict(self.table.items[key['counterId']])
+                for key in request['Keys'] if key['counterId'] in self.table.items
+            ]
+        return {'Responses': responses}
+
+
+def run_scenario(name, rate, seconds, containers, shard_count, flush_interval, partition_wcu):
+    clock = SimulatedClock()
+    table = LocalCounterTable(clock, partition_wcu)
+    dynamodb = LocalDynamoDB(table)
+    counters = [
+        ShardedCounter(dynamodb, 'counters', shard_count=shard_count,
+                       flush_interval=flush_interval, clock=clock)
+        for _ in range(containers)
+    ]
+
+    offered = rate * seconds
+    rejected = 0
+    for i in range(offered):
+        clock.now = i / rate
+        try:
+            counters[i % containers].increment('viral')
+        except ThrottlingException:
+            rejected += 1
+
+    # 남은 write-behind 누적분 기록 (스로틀 해소될 때까지 시간 진행)
+    for counter in counters:
+        while counter._pending:
+            clock.now += 0.1
+            counter.flush()
+
+    recorded = counters[0].read('viral')
+    return {
+        'name': name,
+        'offered': offered,
+        'recorded': recorded,
+        'lost': rejected,
+        'write_requests': table.write_requests,
+        'throttled': table.throttled,
+        'throughput': recorded / seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='샤딩 클릭 카운터 부하 벤치마크')
+    parser.add_argument('--rate', type=int, default=5000, help='초당 클릭 수 (단일 인기 링크)')
+    parser.add_argument('--seconds', type=int, default=10)
+    parser.add_argument('--containers', type=int, default=20, help='동시 Lambda 컨테이너 수')
+    parser.add_argument('--shards', type=int, default=10)
+    parser.add_argument('--flush-seconds', type=float, default=1.0)
+    parser.add_argument('--partition-wcu', type=int, default=1000, help='파티션 키당 초당 쓰기 한도')
+    args = parser.parse_args()
+
+    scenarios = [
+        ('single (shards=1)', 1, 0),
+        (f"sharded (shards={args.shards})", args.shards, 0),
+        (f"sharded + write-behind ({args.flush_seconds}s)", args.shards, args.flush_seconds),
+    ]
+
+    print(f"offered load: {args.rate} clicks/s x {args.seconds}s, containers={args.containers}, "
+          f"partition limit={args.partition_wcu} WCU/s")
+    print(f"{'mode':<36}{'recorded':>10}{'lost':>8}{'writes':>9}{'throttled':>11}{'clicks/s':>10}")
+
+    baseline = None
+    for name, shard_count, flush_interval in scenarios:
+        result = run_scenario(name, args.rate, args.seconds, args.containers,
+                              shard_count, flush_interval, args.partition_wcu)
+        baseline = baseline or result['throughput']
+        gain = result['throughput'] / baseline if baseline else 0
+        print(f"{result['name']:<36}{result['recorded']:>10}{result['lost']:>8}"
+              f"{result['write_requests']:>9}{result['throttled']:>11}"
+              f"{result['throughput']:>10.0f}  (x{gain:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+URL 일괄 단축 Lambda (POST /shorten/batch)
+- 요청: {"urls": ["https://...", {"url": "https://..."}, ...]} 또는 NDJSON (한 줄에 URL 하나)
+  JSON 객체 요청의 redirectStatus/cacheMaxAge는 배치 전체에 적용 (NDJSON은 기본 정책)
+- 전체 검증 1회 → 코드 일괄 할당(이미 있는 코드는 batch_get으로 걸러 재할당) → 항목별 조건부 put 동시 실행
+  (batch_write_item은 조건을 못 걸어 동시 생성/다른 배치/만료 코드 회수와 겹치면 덮어씀
+   → 조건 실패 항목은 새 코드로 재할당, SHORTEN_BATCH_WRITE_CONCURRENCY개씩 병렬)
+- dedup 모드: 배치 안 같은 URL은 하나만 만들고, 정책이 같은 살아있는 기존 링크는 재사용 (status 200)
+  (대표 링크 등록도 조건부 → 동시에 다른 요청이 같은 URL을 먼저 등록했으면 방금 만든 링크는 지우고 그 링크 반환)
+- 응답: 항목별 결과 (입력 순서 index 기준, status 200/201/400/503)
+"""
+import base64
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from linksnap_common.batch import batch_get_keys
+from linksnap_common.cache_policy import InvalidCachePolicy, policy_of
+from linksnap_common.dedup import url_dedup_key
+from linksnap_common.expiry import URL_TTL_ATTR, is_reclaimable
+from linksnap_common.ids import try_put_new_item
+from shorten_url import (
+    URL_DEDUP_ENABLED, URL_ID_RECLAIM_EXPIRED, build_url_item, dedup_index, dynamodb, get_base_url, id_allocator,
+    link_response, parse_cache_policy, purge_reclaimed, site_summary, table, validate_url
+)
+
+MAX_BATCH_ITEMS = int(os.environ.get('SHORTEN_BATCH_MAX_ITEMS', '5000'))
+MAX_ALLOCATION_ROUNDS = 5
+BATCH_WRITE_CONCURRENCY = int(os.environ.get('SHORTEN_BATCH_WRITE_CONCURRENCY', '16'))
+
+HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+
+def error_response(status_code, message):
+    return {
+        'statusCode': status_code,
+        'headers': HEADERS,
+        'body': json.dumps({'error': message})
+    }
+
+
+def request_body(event):
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded'):
+        body = base64.b64decode(body).decode('utf-8')
+    return body
+
+
+def is_ndjson(event, body):
+    headers = {k.lower(): v for k, v in (event.get('headers') or {}).items()}
+    if 'ndjson' in headers.get('content-type', ''):
+        return True
+    return not body.lstrip().startswith(('{', '['))
+
+
+def parse_entry(value):
+    """{"url": ...} 또는 문자열 → URL"""
+    if isinstance(value, dict):
+        return value.get('url', '')
+    return value
+
+
+def parse_urls(event):
+    """요청 본문 → (URL 목록, 배치 옵션) (JSON 배열/객체 또는 NDJSON), 형식 오류면 ValueError"""
+    body = request_body(event)
+
+    if is_ndjson(event, body):
+        urls = []
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # JSON 문자열/객체 줄과 따옴표 없는 URL 줄 모두 허용
+            urls.append(parse_entry(json.loads(line)) if line[0] in '{"' else line)
+        return urls, {}
+
+    parsed = json.loads(body)
+    entries = parsed.get('urls') if isinstance(parsed, dict) else parsed
+    if not isinstance(entries, list):
+        raise ValueError('urls must be an array')
+    return [parse_entry(entry) for entry in entries], parsed if isinstance(parsed, dict) else {}
+
+
+def allocate_ids(count):
+    """서로 다르고 테이블에 없는 코드 count개 할당 (batch_get 사전 확인, 실제 선점 여부는 조건부 put이 판정)
+    - URL_ID_RECLAIM_EXPIRED면 삭제 시각(ttl)이 지난 만료 링크의 코드도 후보로 사용
+    - block 할당기는 스레드 안전하지 않으므로 메인 스레드에서만 호출
+    """
+    ids = {}
+    for _ in range(MAX_ALLOCATION_ROUNDS):
+        needed = count - len(ids)
+        if needed <= 0:
+            break
+        candidates = [url_id for url_id in {id_allocator.next_id() for _ in range(needed)} if url_id not in ids]
+        existing = batch_get_keys(
+            dynamodb, table.name, [{'urlId': url_id} for url_id in candidates], 'urlId, #ttl', {'#ttl': URL_TTL_ATTR}
+        )
+        taken = {
+            item['urlId'] for item in existing
+            if not (URL_ID_RECLAIM_EXPIRED and is_reclaimable(item))
+        }
+        ids.update(dict.fromkeys(url_id for url_id in candidates if url_id not in taken))
+
+    if len(ids) < count:
+        raise RuntimeError(f"단축 코드 할당 실패 ({len(ids)}/{count})")
+    return list(ids)
+
+
+def parallel_map(fn, values):
+    """fn을 BATCH_WRITE_CONCURRENCY개 스레드로 실행, 입력 순서대로 결과 반환 (항목별 예외는 결과로 반환)"""
+    def call(value):
+        try:
+            return fn(value)
+        except Exception as e:
+            return e
+
+    if not values:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(BATCH_WRITE_CONCURRENCY, len(values)))) as executor:
+        return list(executor.map(call, values))
+
+
+def store_new_items(pending, base_url, now, cache_policy):
+    """pending [(index, URL)] → {index: 저장한 아이템, 끝내 실패하면 None}
+    - 항목마다 조건부 put (attribute_not_exists(urlId), 회수 모드면 삭제 시각 지난 만료 링크도 허용)
+    - 조건 실패(다른 요청이 사전 확인 뒤에 코드를 선점)는 새 코드로 재할당해 MAX_ALLOCATION_ROUNDS회까지 재시도
+    - 덮어쓴 만료 링크는 이전 링크의 샤드 카운터/롤업 버킷 정리
+    """
+    stored = {}
+    for _ in range(MAX_ALLOCATION_ROUNDS):
+        if not pending:
+            break
+        items = [
+            build_url_item(url_id, original_url, base_url, now, cache_policy)
+            for url_id, (_, original_url) in zip(allocate_ids(len(pending)), pending)
+        ]
+        outcomes = parallel_map(lambda item: try_put_new_item(table, item, URL_ID_RECLAIM_EXPIRED), items)
+
+        retry = []
+        for (index, original_url), item, outcome in zip(pending, items, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"[WARN] URL 저장 실패 (urlId={item['urlId']}): {outcome}")
+                stored[index] = None
+                continue
+            saved, old_item = outcome
+            if not saved:
+                print(f"[WARN] 단축 코드 충돌, 재할당 (urlId={item['urlId']})")
+                retry.append((index, original_url))
+                continue
+            stored[index] = item
+            if old_item:
+                purge_reclaimed(old_item)
+        pending = retry
+
+    for index, _ in pending:
+        stored[index] = None
+    return stored
+
+
+def claim_links(created, represented, now):
+    """새 링크들을 정규화 URL의 대표로 조건부 등록 (정책이 다른 살아있는 대표가 있는 URL은 건너뜀)
+    {index: 먼저 등록된 살아있는 링크} 반환 (등록 성공/등록 실패는 제외)
+    """
+    targets = [
+        (index, item) for index, item in created
+        if url_dedup_key(item['originalUrl']) not in represented
+    ]
+    winners = {}
+    outcomes = parallel_map(lambda item: dedup_index.claim(item, now), [item for _, item in targets])
+    for (index, item), outcome in zip(targets, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"[WARN] 대표 링크 등록 실패 (urlId={item['urlId']}): {outcome}")
+        elif outcome:
+            winners[index] = outcome
+    return winners
+
+
+def link_result(index, status, item, **extra):
+    return {'index': index, 'status': status, **link_response(item, **extra)}
+
+
+def split_duplicates(valid, results, cache_policy, now):
+    """dedup 모드: 기존 링크 재사용 결과를 채우고
+    (새로 만들 항목, 배치 안 중복 항목 → 대표 index, 정책이 다른 대표가 이미 있는 dedupKey) 반환
+    """
+    existing = dedup_index.find_live_many(dynamodb, [url for _, url in valid], now)
+    first_index = {}
+    pending = []
+    duplicates = {}
+
+    for index, original_url in valid:
+        key = url_dedup_key(original_url)
+        if key in existing and policy_of(existing[key]) == cache_policy:
+            results[index] = link_result(index, 200, existing[key], deduplicated=True)
+        elif key in first_index:
+            duplicates[index] = first_index[key]
+        else:
+            first_index[key] = index
+            pending.append((index, original_url))
+
+    return pending, duplicates, set(existing)
+
+
+def handler(event, context):
+    try:
+        # 1. 요청 파싱
+        try:
+            urls, options = parse_urls(event)
+            cache_policy = parse_cache_policy(options)
+        except InvalidCachePolicy as e:
+            return error_response(400, str(e))
+        except (ValueError, TypeError, AttributeError) as e:
+            return error_response(400, f"invalid request body: {e}")
+
+        if not urls:
+            return error_response(400, 'urls is required')
+        if len(urls) > MAX_BATCH_ITEMS:
+            return error_response(413, f"too many urls (max {MAX_BATCH_ITEMS})")
+
+        # 2. 전체 검증 (실패 항목은 결과에만 남기고 나머지는 계속 처리)
+        results = [None] * len(urls)
+        valid = []
+        for index, original_url in enumerate(urls):
+            error = validate_url(original_url)
+            if error:
+                results[index] = {'index': index, 'status': 400, 'error': error}
+            else:
+                valid.append((index, original_url))
+
+        # 3. dedup 모드: 기존 링크 재사용 / 배치 안 중복 합치기
+        now = datetime.utcnow()
+        duplicates = {}
+        represented = set()
+        if URL_DEDUP_ENABLED:
+            valid, duplicates, represented = split_duplicates(valid, results, cache_policy, now)
+
+        # 4. 코드 할당 + 항목별 조건부 put (충돌 항목은 재할당, 끝내 실패한 항목은 503)
+        base_url = get_base_url(event)
+        stored = store_new_items(valid, base_url, now, cache_policy)
+        created = []
+        for index, _ in valid:
+            item = stored[index]
+            if item is None:
+                results[index] = {'index': index, 'status': 503, 'error': 'write failed, retry this url'}
+            else:
+                results[index] = link_result(index, 201, item)
+                created.append((index, item))
+
+        # 5. 대표 링크 등록 (같은 URL이 동시에 생성돼 다른 링크가 먼저 등록됐으면 방금 만든 아이템은 지우고 그 링크 반환)
+        if URL_DEDUP_ENABLED:
+            winners = claim_links(created, represented, now)
+            for index, existing in winners.items():
+                if policy_of(existing) == cache_policy:
+                    table.delete_item(Key={'urlId': stored[index]['urlId']})
+                    results[index] = link_result(index, 200, existing, deduplicated=True)
+            created = [(index, item) for index, item in created if results[index]['status'] == 201]
+
+        # 배치 안 중복 항목은 대표 항목 결과를 따름
+        for index, first in duplicates.items():
+            if results[first]['status'] == 201:
+                results[index] = {**results[first], 'index': index, 'status': 200, 'deduplicated': True}
+            else:
+                results[index] = {**results[first], 'index': index}
+        created = [item for _, item in created]
+
+        # 사이트 요약 갱신 (배치당 한 번, 실패해도 생성은 성공 처리)
+        if site_summary is not None:
+            try:
+                site_summary.record_urls_created(created)
+            except Exception as e:
+                print(f"[WARN] 사이트 요약 갱신 실패 ({len(created)}건): {e}")
+
+        # 6. 응답 (항목별 결과)
+        deduplicated = sum(1 for result in results if result.get('deduplicated'))
+        return {
+            'statusCode': 200,
+            'headers': HEADERS,
+            'body': json.dumps({
+                'created': len(created),
+                'deduplicated': deduplicated,
+                'failed': len(urls) - len(created) - deduplicated,
+                'results': results
+            })
+        }
+
+    except Exception as e:
+        return error_response(500, str(e))
@@ -1,12 +1,49 @@
 import json
-import boto3
-import hashlib
-import time
 import os
 from datetime import datetime, timedelta
 
-dynamodb = boto3.resource('dynamodb')
+from linksnap_common.cache_policy import InvalidCachePolicy, build_cache_policy, policy_of
+from linksnap_common.dedup import DedupIndex, IdempotencyConflict, request_fingerprint
+from linksnap_common.dynamo import dynamodb_resource
+from linksnap_common.expiry import expiry_attributes, purge_url_state
+from linksnap_common.ids import create_allocator, put_with_new_id
+from linksnap_common.listing import listing_attributes
+from linksnap_common.site_summary import SiteSummary
+
+dynamodb = dynamodb_resource()
 table = dynamodb.Table(os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
+counters_table = dynamodb.Table(os.environ.get('COUNTERS_TABLE', 'url-shortener-counters-dev'))
+rollups_table = dynamodb.Table(os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev'))
+
+# random: 무작위 base62 + 조건부 put 재시도 / block: counters 테이블에서 코드 범위를 임대
+URL_ID_ALLOCATOR = os.environ.get('URL_ID_ALLOCATOR', 'random')
+id_allocator = create_allocator(
+    URL_ID_ALLOCATOR,
+    counters_table=counters_table,
+    length=int(os.environ.get('URL_ID_LENGTH', '7')),
+    block_size=int(os.environ.get('URL_ID_BLOCK_SIZE', '1000'))
+)
+
+# 사이트 요약 문서(totalUrls/최근 URL) 증분 갱신
+SITE_SUMMARY_ENABLED = os.environ.get('SITE_SUMMARY_ENABLED', 'false').lower() == 'true'
+site_summary = SiteSummary(rollups_table) if SITE_SUMMARY_ENABLED else None
+
+# 삭제 시각(ttl)이 지난 만료 링크의 코드는 TTL 삭제 전이라도 새 링크에 사용 (이전 링크의 샤드 카운터/롤업 버킷은 삭제)
+URL_ID_RECLAIM_EXPIRED = os.environ.get('URL_ID_RECLAIM_EXPIRED', 'false').lower() == 'true'
+CLICK_COUNTER_SHARDS = int(os.environ.get('CLICK_COUNTER_SHARDS', '10'))
+
+# 정규화 URL이 같은 살아있는 링크가 있으면 새로 만들지 않고 재사용 / Idempotency-Key 헤더 재시도 응답 재사용
+URL_DEDUP_ENABLED = os.environ.get('URL_DEDUP_ENABLED', 'false').lower() == 'true'
+IDEMPOTENCY_ENABLED = os.environ.get('IDEMPOTENCY_ENABLED', 'false').lower() == 'true'
+dedup_index = DedupIndex(
+    dynamodb.Table(os.environ.get('DEDUP_TABLE', 'url-shortener-dedup-dev')),
+    idempotency_ttl=int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '86400'))
+) if URL_DEDUP_ENABLED or IDEMPOTENCY_ENABLED else None
+
+# 새 링크의 기본 리다이렉트 정책 (요청 body의 redirectStatus/cacheMaxAge로 링크별 지정 가능)
+REDIRECT_DEFAULT_STATUS = int(os.environ.get('REDIRECT_DEFAULT_STATUS', '301'))
+REDIRECT_DEFAULT_MAX_AGE = int(os.environ.get('REDIRECT_DEFAULT_MAX_AGE', '0'))
+REDIRECT_MAX_AGE_LIMIT = int(os.environ.get('REDIRECT_MAX_AGE_LIMIT', '31536000'))
 
 
 def get_base_url(event):
@@ -26,10 +63,94 @@ def get_base_url(event):
     return os.environ.get('BASE_URL', 'http://localhost')
 
 
-def generate_url_id(url):
-    """URL + 현재시간 해시해서 6자리 코드 생성"""
-    unique_string = f"{url}{time.time()}"
-    return hashlib.md5(unique_string.encode()).hexdigest()[:6]
+def validate_url(original_url):
+    """URL 검증, 문제가 있으면 에러 메시지 반환"""
+    if not original_url:
+        return 'url is required'
+    if not isinstance(original_url, str) or not original_url.startswith(('http://', 'https://')):
+        return 'url must start with http:// or https://'
+    return None
+
+
+def parse_cache_policy(body):
+    """요청 body의 redirectStatus/cacheMaxAge → 정책 속성 (잘못된 값이면 InvalidCachePolicy)"""
+    return build_cache_policy(
+        body.get('redirectStatus'),
+        body.get('cacheMaxAge'),
+        default_status=REDIRECT_DEFAULT_STATUS,
+        default_max_age=REDIRECT_DEFAULT_MAX_AGE,
+        max_age_limit=REDIRECT_MAX_AGE_LIMIT
+    )
+
+
+def build_url_item(url_id, original_url, base_url, now, cache_policy=None):
+    """urls 테이블 아이템 생성 (만료 30일, 만료 epoch/TTL 속성 포함)"""
+    expires_at = (now + timedelta(days=30)).isoformat()
+    return {
+        'urlId': url_id,
+        'shortUrl': f"{base_url}/{url_id}",
+        'originalUrl': original_url,
+        'createdAt': now.isoformat(),
+        'expiresAt': expires_at,
+        **expiry_attributes(expires_at),
+        'clickCount': 0,
+        **(cache_policy or policy_of({})),
+        **listing_attributes(url_id)
+    }
+
+
+def link_response(url_item, **extra):
+    """생성/재사용한 링크 응답 body"""
+    return {
+        'urlId': url_item['urlId'],
+        'shortUrl': url_item['shortUrl'],
+        'originalUrl': url_item['originalUrl'],
+        'createdAt': url_item['createdAt'],
+        'expiresAt': url_item['expiresAt'],
+        **policy_of(url_item),
+        **extra
+    }
+
+
+def purge_reclaimed(old_item):
+    """회수한 코드의 이전 링크 클릭 상태 삭제 (실패해도 생성은 성공 처리)"""
+    try:
+        purge_url_state(old_item['urlId'], counters_table, CLICK_COUNTER_SHARDS, rollups_table)
+    except Exception as e:
+        print(f"[WARN] 회수한 코드 상태 삭제 실패 (urlId={old_item['urlId']}): {e}")
+
+
+def create_link(original_url, base_url, cache_policy):
+    """단축 링크 생성 (dedup 모드면 정책이 같은 살아있는 기존 링크 재사용), (statusCode, 응답 body) 반환
+    - 정책이 다른 기존 링크가 대표로 등록돼 있으면 새 링크를 만들고 대표는 그대로 둠
+    """
+    now = datetime.utcnow()
+
+    existing = dedup_index.find_live(original_url, now) if URL_DEDUP_ENABLED else None
+    if existing and policy_of(existing) == cache_policy:
+        return 200, link_response(existing, deduplicated=True)
+
+    # 새 코드 할당 + 조건부 put (기존 코드와 충돌하면 다른 코드로 재시도, 회수 모드면 삭제 시각 지난 만료 코드는 덮어씀)
+    url_item = put_with_new_id(
+        table, id_allocator, lambda url_id: build_url_item(url_id, original_url, base_url, now, cache_policy),
+        reclaim_expired=URL_ID_RECLAIM_EXPIRED, on_reclaim=purge_reclaimed
+    )
+
+    # 같은 URL이 동시에 생성돼 다른 링크가 먼저 등록됐으면 방금 만든 아이템은 지우고 그 링크 반환
+    if URL_DEDUP_ENABLED and not existing:
+        existing = dedup_index.claim(url_item, now)
+        if existing and policy_of(existing) == cache_policy:
+            table.delete_item(Key={'urlId': url_item['urlId']})
+            return 200, link_response(existing, deduplicated=True)
+
+    # 사이트 요약 갱신 (실패해도 생성은 성공 처리, 다음 reconcile에서 보정)
+    if site_summary is not None:
+        try:
+            site_summary.record_url_created(url_item)
+        except Exception as e:
+            print(f"[WARN] 사이트 요약 갱신 실패 (urlId={url_item['urlId']}): {e}")
+
+    return 201, link_response(url_item)
 
 
 def handler(event, context):
@@ -41,56 +162,63 @@ def handler(event, context):
         
         original_url = body.get('url', '')
         
-        # 2. URL 검증
-        if not original_url:
+        # 2. URL / 리다이렉트 정책 검증
+        error = validate_url(original_url)
+        if not error:
+            try:
+                cache_policy = parse_cache_policy(body)
+            except InvalidCachePolicy as e:
+                error = str(e)
+        if error:
             return {
                 'statusCode': 400,
                 'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'url is required'})
+                'body': json.dumps({'error': error})
             }
         
-        if not original_url.startswith(('http://', 'https://')):
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'url must start with http:// or https://'})
-            }
+        # 3. Idempotency-Key (같은 키로 완료된 요청이면 저장된 응답을 그대로 반환)
+        headers = {k.lower(): v for k, v in (event.get('headers') or {}).items()}
+        idempotency_key = headers.get('idempotency-key') if IDEMPOTENCY_ENABLED else None
+        if idempotency_key:
+            try:
+                replay = dedup_index.begin(idempotency_key, request_fingerprint({'url': original_url, **cache_policy}))
+            except IdempotencyConflict as e:
+                return {
+                    'statusCode': 409,
+                    'headers': {'Content-Type': 'application/json'},
+                    'body': json.dumps({'error': str(e)})
+                }
+            if replay:
+                return {
+                    'statusCode': replay['statusCode'],
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*',
+                        'Idempotent-Replayed': 'true'
+                    },
+                    'body': replay['body']
+                }
         
-        # 3. 데이터 생성
-        url_id = generate_url_id(original_url)
-        now = datetime.utcnow()
-        expires_at = now + timedelta(days=30)
+        # 4. 단축 링크 생성 (API Gateway에서 동적으로 base URL 추출)
+        try:
+            status_code, response_body = create_link(original_url, get_base_url(event), cache_policy)
+        except Exception:
+            if idempotency_key:
+                dedup_index.abandon(idempotency_key)
+            raise
         
-        # 4. 단축 URL 생성 (API Gateway에서 동적으로 URL 추출)
-        base_url = get_base_url(event)
-        short_url = f"{base_url}/{url_id}"
+        response_json = json.dumps(response_body)
+        if idempotency_key:
+            dedup_index.complete(idempotency_key, status_code, response_json)
         
-        # 5. DynamoDB 저장
-        table.put_item(
-            Item={
-                'urlId': url_id,
-                'shortUrl': short_url,
-                'originalUrl': original_url,
-                'createdAt': now.isoformat(),
-                'expiresAt': expires_at.isoformat(),
-                'clickCount': 0
-            }
-        )
-        
-        # 6. 응답 (shortUrl 추가!)
+        # 5. 응답
         return {
-            'statusCode': 201,
+            'statusCode': status_code,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({
-                'urlId': url_id,
-                'shortUrl': short_url,  # ← 추가됨!
-                'originalUrl': original_url,
-                'createdAt': now.isoformat(),
-                'expiresAt': expires_at.isoformat()
-            })
+            'body': response_json
         }
         
     except Exception as e:
@@ -98,4 +226,4 @@ def handler(event, context):
             'statusCode': 500,
             'headers': {'Content-Type': 'application/json'},
             'body': json.dumps({'error': str(e)})
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,69 @@
+"""
+봇/미리보기 요청 판별 (리다이렉트 응답은 그대로, 클릭 기록만 건너뜀)
+- head: HEAD 요청 (링크 확인, 메일 보안 스캐너)
+- prefetch: 브라우저 prefetch/prerender, 링크 미리보기 헤더 (Purpose / Sec-Purpose / X-Purpose / X-Moz)
+- bot: User-Agent 봇 시그니처 (linksnap_common.classify, 미리 컴파일한 정규식 + 원문별 memo)
+  (Slackbot, facebookexternalhit, Twitterbot 등 미리보기 크롤러, 업타임 모니터, HTTP 라이브러리)
+- 걸러낸 요청은 clicks/카운터 쓰기와 GeoIP 조회 없이 컨테이너 카운터(EMF 메트릭)로만 셈
+  (tally 모드의 롤업 버킷 flt#{사유}는 큐 이벤트로 넘겨 click_consumer가 배치마다 합산, 컨테이너에 쌓아두지 않음)
+"""
+import json
+import time
+from collections import defaultdict
+
+from linksnap_common.classify import is_bot
+
+PREFETCH_HEADERS = ('purpose', 'sec-purpose', 'x-purpose', 'x-moz')
+PREFETCH_VALUES = ('prefetch', 'prerender', 'preview')
+REASONS = ('head', 'prefetch', 'bot')
+
+
+def filter_reason(method, headers):
+    """클릭으로 세지 않을 요청이면 사유, 사람 클릭이면 None"""
+    if (method or 'GET').upper() == 'HEAD':
+        return 'head'
+
+    for name in PREFETCH_HEADERS:
+        value = (headers.get(name) or '').lower()
+        if value and any(keyword in value for keyword in PREFETCH_VALUES):
+            return 'prefetch'
+
+    if is_bot(headers.get('user-agent', '')):
+        return 'bot'
+    return None
+
+
+class FilteredClicks:
+    """걸러낸 요청 사유별 컨테이너 카운터 (emit_metrics로 CloudWatch EMF 출력, DynamoDB 쓰기 없음)"""
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self._emitted = defaultdict(int)
+
+    def add(self, reason):
+        self.counts[reason] += 1
+
+    def emit_metrics(self, namespace, function_name):
+        """지난 출력 이후 사유별 증가분을 CloudWatch Embedded Metric Format 로그로 출력"""
+        deltas = {reason: self.counts[reason] - self._emitted[reason] for reason in REASONS}
+        self._emitted = defaultdict(int, self.counts)
+
+        print(json.dumps({
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': namespace,
+                    'Dimensions': [['FunctionName']],
+                    'Metrics': [
+                        {'Name': 'FilteredHeadClicks', 'Unit': 'Count'},
+                        {'Name': 'FilteredPrefetchClicks', 'Unit': 'Count'},
+                        {'Name': 'FilteredBotClicks', 'Unit': 'Count'}
+                    ]
+                }]
+            },
+            'FunctionName': function_name,
+            'FilteredHeadClicks': deltas['head'],
+            'FilteredPrefetchClicks': deltas['prefetch'],
+            'FilteredBotClicks': deltas['bot'],
+            'filteredClicks': dict(self.counts)
+        }))
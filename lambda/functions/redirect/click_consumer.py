@@ -0,0 +1,132 @@
+"""
+클릭 이벤트 Consumer Lambda
+SQS (click events) → 배치 단위로 clicks 테이블 기록 + 클릭 카운트/롤업/사이트 요약 합산 증가
+- 걸러낸 요청 이벤트(f = 사유, BOT_FILTER_MODE=tally)는 클릭으로 세지 않고 배치마다 롤업 flt#{사유}에만 합산
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from click_events import decode_click_event
+from linksnap_common.clicks import build_click_item
+from linksnap_common.rollups import RollupWriter
+from redirect import (
+    clicks_table, get_country_from_ip, increment_click_count, click_counter, rollup_writer,
+    rollups_table, update_click_aggregates
+)
+
+# 걸러낸 요청 합산용 (ROLLUPS_ENABLED가 꺼져 있어도 flt# 버킷은 기록)
+filtered_writer = rollup_writer if rollup_writer is not None else RollupWriter(rollups_table)
+
+
+def build_item_from_event(click_event, message_id):
+    """클릭 이벤트 → clicks 테이블 아이템 (messageId 기반 키로 재처리 시에도 중복 없음)"""
+    client_ip = click_event.get('ip', 'unknown')
+
+    return build_click_item(
+        click_event['u'],
+        datetime.utcfromtimestamp(click_event['t'] / 1000),
+        message_id,
+        click_event.get('ua', 'unknown'),
+        click_event.get('r', 'direct'),
+        click_event.get('c') or get_country_from_ip(client_ip),
+        client_ip
+    )
+
+
+def group_click_records(records):
+    """SQS 레코드를 urlId별로 묶음 (디코딩 불가 메시지는 버림)
+    → (urlId별 클릭 이벤트, (urlId, 사유)별 걸러낸 요청 수)
+    """
+    events_by_url = defaultdict(list)
+    filtered = defaultdict(int)
+
+    for record in records:
+        try:
+            click_event = decode_click_event(record['body'])
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"[WARN] 클릭 이벤트 디코딩 실패 (messageId={record.get('messageId')}): {e}")
+            continue
+
+        if click_event is None:
+            print(f"[WARN] 알 수 없는 클릭 이벤트 형식 (messageId={record.get('messageId')})")
+            continue
+
+        if click_event.get('f'):
+            filtered[(click_event['u'], click_event['f'])] += 1
+            continue
+
+        events_by_url[click_event['u']].append((record['messageId'], click_event))
+
+    return events_by_url, filtered
+
+
+def process_click_records(records):
+    """클릭 이벤트 배치 처리, 재시도가 필요한 messageId 목록 반환"""
+    events_by_url, filtered = group_click_records(records)
+    failed_message_ids = []
+    stats_items = []
+
+    # 1. url별로 한 번만 클릭 카운트 증가 (배치 내 클릭 수만큼)
+    for short_code, events in events_by_url.items():
+        try:
+            increment_click_count(short_code, len(events))
+        except Exception as e:
+            print(f"[WARN] clickCount 증가 실패 (shortCode={short_code}): {e}")
+            failed_message_ids.extend(message_id for message_id, _ in events)
+            continue
+
+        stats_items.extend(build_item_from_event(click_event, message_id) for message_id, click_event in events)
+
+    # write-behind 카운터는 배치 끝에서 바로 기록 (이미 배치 단위로 합산됨)
+    if click_counter is not None:
+        click_counter.flush()
+
+    # 2. clicks 테이블 상세 로그는 batch_write로 기록 (실패해도 카운터는 이미 반영됨)
+    try:
+        with clicks_table.batch_writer(overwrite_by_pkeys=['urlId', 'clickKey']) as batch:
+            for item in stats_items:
+                batch.put_item(Item=item)
+    except Exception as e:
+        print(f"[WARN] clicks 테이블 배치 기록 실패 ({len(stats_items)}건): {e}")
+
+    # 3. 롤업 버킷 증가 (배치 안에서 같은 버킷끼리 합산 후 한 번씩 기록)
+    if rollup_writer is not None:
+        for item in stats_items:
+            rollup_writer.add_click_item(item)
+        rollup_writer.flush()
+
+    # 4. 사이트 요약 문서 / 목록 GSI 클릭 수 갱신 (배치당 한 번, 실패 시 다음 reconcile에서 보정)
+    if stats_items:
+        try:
+            update_click_aggregates(stats_items)
+        except Exception as e:
+            print(f"[WARN] 사이트 요약/목록 클릭 수 갱신 실패 ({len(stats_items)}건): {e}")
+
+    # 5. 걸러낸 요청 사유별 합산 (배치마다 바로 기록 → 컨테이너에 쌓아두지 않음)
+    if filtered:
+        for (short_code, reason), count in filtered.items():
+            filtered_writer.add_filtered(short_code, reason, count)
+        filtered_writer.flush()
+
+    return failed_message_ids
+
+
+def drain_local_queue(queue, batch_size=100):
+    """LocalClickQueue에 쌓인 이벤트를 모두 처리 (테스트/로컬 실행용)"""
+    failed_message_ids = []
+    while len(queue):
+        failed_message_ids.extend(process_click_records(queue.drain(batch_size)))
+    return failed_message_ids
+
+
+def handler(event, context):
+    records = event.get('Records', [])
+    failed_message_ids = process_click_records(records)
+
+    if failed_message_ids:
+        print(f"[WARN] {len(failed_message_ids)}/{len(records)}건 재시도 대기")
+
+    # ReportBatchItemFailures: 실패한 메시지만 큐로 돌려보냄
+    return {
+        'batchItemFailures': [{'itemIdentifier': message_id} for message_id in failed_message_ids]
+    }
@@ -0,0 +1,186 @@
+"""
+클릭 이벤트 큐
+- 리다이렉트 hot path에서는 압축된 클릭 이벤트만 큐에 넣고 바로 응답
+- 실제 통계 기록은 click_consumer가 배치로 처리
+- 백엔드: sqs (운영), local (프로세스 내 큐, 테스트용)
+- 리다이렉트 handler는 반환 전에 flush → 컨테이너가 회수돼도 버퍼에 남은 이벤트가 없음
+- 걸러낸 요청 이벤트(f = 사유)는 클릭이 아니라 롤업 flt#{사유} 합산용 (BOT_FILTER_MODE=tally)
+"""
+import json
+import os
+import time
+from collections import deque
+
+from linksnap_common.batch import backoff_delay
+
+CLICK_QUEUE_BACKEND = os.environ.get('CLICK_QUEUE_BACKEND', 'sqs')
+CLICK_QUEUE_URL = os.environ.get('CLICK_QUEUE_URL', '')
+# 1이면 클릭마다 즉시 전송, 2~10이면 모아서 send_message_batch
+# (버퍼는 호출마다 flush되므로 한 호출에서 이벤트를 여러 개 넣을 때만 묶임)
+CLICK_QUEUE_BATCH_SIZE = int(os.environ.get('CLICK_QUEUE_BATCH_SIZE', '1'))
+# 전송 실패(요청 오류, send_message_batch의 Failed 항목) 재시도 횟수, 끝내 실패하면 ClickEventsDropped 메트릭
+CLICK_QUEUE_SEND_ATTEMPTS = int(os.environ.get('CLICK_QUEUE_SEND_ATTEMPTS', '3'))
+
+# 이벤트 포맷 버전 (필드 구성이 바뀌면 올리고 consumer에서 분기)
+EVENT_VERSION = 1
+
+SQS_MAX_BATCH = 10
+
+
+def build_click_event(short_code, headers, client_ip):
+    """리다이렉트 요청에서 압축된 클릭 이벤트 생성 (키 이름을 짧게 유지)"""
+    return {
+        'v': EVENT_VERSION,
+        'u': short_code,
+        't': int(time.time() * 1000),
+        'ua': headers.get('user-agent', 'unknown'),
+        'r': headers.get('referer', 'direct'),
+        'c': headers.get('cloudfront-viewer-country', ''),
+        'ip': client_ip,
+    }
+
+
+def build_filtered_event(short_code, reason):
+    """봇/미리보기/HEAD로 걸러낸 요청 이벤트 (consumer가 사유별로만 합산, User-Agent/IP는 싣지 않음)"""
+    return {
+        'v': EVENT_VERSION,
+        'u': short_code,
+        't': int(time.time() * 1000),
+        'f': reason,
+    }
+
+
+def encode_click_event(click_event):
+    """큐 전송용 직렬화"""
+    return json.dumps(click_event, separators=(',', ':'))
+
+
+def decode_click_event(body):
+    """큐 메시지 본문 → 클릭 이벤트 (알 수 없는 버전이면 None)"""
+    click_event = json.loads(body) if isinstance(body, str) else body
+    if click_event.get('v') != EVENT_VERSION or not click_event.get('u'):
+        return None
+    return click_event
+
+
+class LocalClickQueue:
+    """프로세스 내 메모리 큐 (테스트/로컬 실행용)"""
+
+    def __init__(self, maxlen=None):
+        self._messages = deque(maxlen=maxlen)
+        self._next_id = 0
+
+    def put(self, click_event):
+        self._next_id += 1
+        self._messages.append({
+            'messageId': f"local-{self._next_id}",
+            'body': encode_click_event(click_event),
+        })
+
+    def flush(self):
+        pass
+
+    def drain(self, max_messages=100):
+        """쌓인 메시지를 SQS 레코드 형태로 꺼냄 (consumer에 그대로 전달 가능)"""
+        records = []
+        while self._messages and len(records) < max_messages:
+            records.append(self._messages.popleft())
+        return records
+
+    def __len__(self):
+        return len(self._messages)
+
+
+class SqsClickQueue:
+    """SQS 백엔드 (batch_size > 1이면 flush 전까지 모아서 전송, 실패 항목은 백오프 재시도)"""
+
+    def __init__(self, queue_url, batch_size=1, sqs_client=None, max_attempts=3, sleep=time.sleep):
+        if not queue_url:
+            raise ValueError('CLICK_QUEUE_URL is required for sqs backend')
+        self.queue_url = queue_url
+        self.batch_size = max(1, min(batch_size, SQS_MAX_BATCH))
+        self.max_attempts = max(1, max_attempts)
+        self.dropped = 0
+        self._sqs = sqs_client
+        self._sleep = sleep
+        self._buffer = []
+
+    @property
+    def sqs(self):
+        if self._sqs is None:
+            from linksnap_common.aws import get_client
+            self._sqs = get_client('sqs')
+        return self._sqs
+
+    def put(self, click_event):
+        self._buffer.append(encode_click_event(click_event))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """버퍼 전송 (예외를 올리지 않음), 재시도 후에도 못 보낸 이벤트는 dropped에 더하고 메트릭 출력"""
+        if not self._buffer:
+            return
+        messages, self._buffer = self._buffer, []
+        dropped = 0
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self._sleep(backoff_delay(attempt))
+            try:
+                messages, rejected = self._send(messages)
+            except Exception as e:
+                print(f"[WARN] 클릭 이벤트 전송 실패 ({len(messages)}건, 시도 {attempt + 1}): {e}")
+                continue
+            dropped += rejected
+            if not messages:
+                break
+
+        dropped += len(messages)
+        if dropped:
+            self.dropped += dropped
+            print(f"[WARN] 클릭 이벤트 {dropped}건 전송 포기")
+            emit_dropped_metric(dropped)
+
+    def _send(self, messages):
+        """메시지 전송, (재시도할 메시지 목록, 요청 자체가 잘못돼 재시도하지 않는 건수) 반환"""
+        if len(messages) == 1:
+            self.sqs.send_message(QueueUrl=self.queue_url, MessageBody=messages[0])
+            return [], 0
+
+        response = self.sqs.send_message_batch(
+            QueueUrl=self.queue_url,
+            Entries=[{'Id': str(i), 'MessageBody': body} for i, body in enumerate(messages)]
+        )
+        failed = response.get('Failed', [])
+        if failed:
+            print(f"[WARN] 클릭 이벤트 {len(failed)}건 전송 실패: {failed}")
+        retry = [messages[int(entry['Id'])] for entry in failed if not entry.get('SenderFault')]
+        return retry, len(failed) - len(retry)
+
+
+def emit_dropped_metric(count, namespace='LinkSnap/Redirect'):
+    """전송하지 못한 클릭 이벤트 수를 CloudWatch Embedded Metric Format 로그로 출력"""
+    function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'redirect')
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': namespace,
+                'Dimensions': [['FunctionName']],
+                'Metrics': [{'Name': 'ClickEventsDropped', 'Unit': 'Count'}]
+            }]
+        },
+        'FunctionName': function_name,
+        'ClickEventsDropped': count
+    }))
+
+
+def create_click_queue(backend=None):
+    """환경 변수 기준으로 큐 백엔드 생성"""
+    backend = backend or CLICK_QUEUE_BACKEND
+    if backend == 'local':
+        return LocalClickQueue()
+    if backend == 'sqs':
+        return SqsClickQueue(CLICK_QUEUE_URL, CLICK_QUEUE_BATCH_SIZE, max_attempts=CLICK_QUEUE_SEND_ATTEMPTS)
+    raise ValueError(f"unknown click queue backend: {backend}")
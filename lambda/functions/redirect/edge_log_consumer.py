@@ -0,0 +1,124 @@
+"""
+CDN 엣지 로그 클릭 Consumer Lambda (CLICK_SOURCE=edge)
+S3 (CloudFront 표준 액세스 로그, gzip TSV) → 리다이렉트 응답 줄만 클릭 이벤트로 변환 → click_consumer와 같은 배치 경로로 기록
+- CDN 캐시 적중분까지 집계되므로 origin(리다이렉트 Lambda)은 클릭을 세지 않음
+- clickKey는 x-edge-request-id 기반 → 같은 로그 파일을 다시 처리해도 clicks 테이블은 중복 없음 (카운터는 다시 증가)
+- BOT_FILTER_MODE가 off가 아니면 봇 User-Agent 줄은 클릭에서 뺌
+  (tally면 걸러낸 요청 이벤트로 넘겨 click_consumer 배치 처리에서 flt#{사유}에 합산)
+"""
+import gzip
+import io
+import re
+from datetime import datetime, timezone
+from urllib.parse import unquote, unquote_plus
+
+from bot_filter import filter_reason
+from click_consumer import process_click_records
+from click_events import EVENT_VERSION
+from redirect import BOT_FILTER_MODE
+from linksnap_common.aws import get_client
+from linksnap_common.cache_policy import REDIRECT_STATUSES
+
+SHORT_CODE_PATTERN = re.compile(r'^/(?:[^/]+/)?([0-9A-Za-z]{6,12})$')
+RECORD_BATCH_SIZE = 500
+
+
+def _field(value):
+    """로그 값 디코딩 ('-'는 빈 값, User-Agent 등은 URL 인코딩돼 있음)"""
+    if not value or value == '-':
+        return ''
+    return unquote(value)
+
+
+def parse_log_lines(lines):
+    """CloudFront 로그 줄 → 필드명 dict (#Fields 헤더 기준)"""
+    fields = None
+    for line in lines:
+        line = line.rstrip('\n')
+        if line.startswith('#Fields:'):
+            fields = line[len('#Fields:'):].split()
+            continue
+        if not line or line.startswith('#') or fields is None:
+            continue
+        yield dict(zip(fields, line.split('\t')))
+
+
+def click_event_from_log(entry):
+    """리다이렉트 응답 로그 줄 → 클릭 이벤트 (리다이렉트가 아니면 None)"""
+    if entry.get('cs-method') != 'GET' or not entry.get('x-edge-request-id'):
+        return None
+    try:
+        if int(entry.get('sc-status', 0)) not in REDIRECT_STATUSES:
+            return None
+    except ValueError:
+        return None
+
+    match = SHORT_CODE_PATTERN.match(entry.get('cs-uri-stem', ''))
+    if not match:
+        return None
+
+    requested_at = datetime.strptime(f"{entry['date']} {entry['time']}", '%Y-%m-%d %H:%M:%S')
+    return {
+        'v': EVENT_VERSION,
+        'u': match.group(1),
+        't': int(requested_at.replace(tzinfo=timezone.utc).timestamp() * 1000),
+        'ua': _field(entry.get('cs(User-Agent)')) or 'unknown',
+        'r': _field(entry.get('cs(Referer)')) or 'direct',
+        'c': '',
+        'ip': entry.get('c-ip') or 'unknown',
+    }
+
+
+def log_records(lines):
+    """로그 줄 → click_consumer 입력 형태의 레코드 (messageId = 엣지 요청 ID)"""
+    for entry in parse_log_lines(lines):
+        click_event = click_event_from_log(entry)
+        if click_event is None:
+            continue
+
+        if BOT_FILTER_MODE != 'off':
+            reason = filter_reason('GET', {'user-agent': click_event['ua']})
+            if reason is not None:
+                if BOT_FILTER_MODE != 'tally':
+                    continue
+                click_event['f'] = reason
+
+        yield {'messageId': entry['x-edge-request-id'], 'body': click_event}
+
+
+def process_log_lines(lines, batch_size=RECORD_BATCH_SIZE):
+    """로그 줄을 batch_size 단위로 처리, (처리한 클릭 수, 기록 실패 수) 반환"""
+    processed = failed = 0
+    batch = []
+    for record in log_records(lines):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            failed += len(process_click_records(batch))
+            processed += len(batch)
+            batch = []
+    if batch:
+        failed += len(process_click_records(batch))
+        processed += len(batch)
+    return processed, failed
+
+
+def read_log_object(bucket, key):
+    """S3 로그 객체(.gz)를 줄 단위로 스트리밍 압축 해제"""
+    body = get_client('s3').get_object(Bucket=bucket, Key=key)['Body']
+    return io.TextIOWrapper(gzip.GzipFile(fileobj=body), encoding='utf-8', errors='replace')
+
+
+def handler(event, context):
+    processed = failed = 0
+
+    for record in event.get('Records', []):
+        bucket = record['s3']['bucket']['name']
+        key = unquote_plus(record['s3']['object']['key'])
+        done, errors = process_log_lines(read_log_object(bucket, key))
+        processed += done
+        failed += errors
+
+        if errors:
+            print(f"[WARN] 엣지 로그 클릭 {errors}/{done}건 카운터 기록 실패 (s3://{bucket}/{key})")
+
+    return {'processed': processed, 'failed': failed}
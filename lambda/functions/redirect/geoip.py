@@ -0,0 +1,113 @@
+"""
+로컬 GeoIP 조회
+- geoip_build.py로 만든 바이너리 인덱스(IP 범위 → 국가 코드)를 mmap으로 로드
+- 범위 시작 주소 기준 정렬 배열 + 이진 탐색 (컨테이너당 1회 로드)
+
+파일 포맷 (big-endian)
+  header : magic(8) + v4_count(uint32) + v6_count(uint32)
+  v4     : [start(4) end(4) country(2)] * v4_count
+  v6     : [start(16) end(16) country(2)] * v6_count
+"""
+import ipaddress
+import mmap
+import os
+import struct
+
+MAGIC = b'LSGEOIP1'
+HEADER = struct.Struct('>8sII')
+V4_RECORD_SIZE = 4 + 4 + 2
+V6_RECORD_SIZE = 16 + 16 + 2
+
+GEOIP_DB_PATH = os.environ.get(
+    'GEOIP_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'geoip.bin')
+)
+
+
+class GeoIpDatabase:
+    """mmap 기반 IP 범위 인덱스"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.v4_count, self.v6_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"invalid geoip database: {path}")
+
+        self._v4_offset = HEADER.size
+        self._v6_offset = self._v4_offset + self.v4_count * V4_RECORD_SIZE
+
+    def lookup(self, ip):
+        """IP 문자열 → 국가 코드 (범위에 없으면 None)"""
+        address = ipaddress.ip_address(ip)
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if address.version == 4:
+            return self._search(address.packed, self._v4_offset, self.v4_count, 4)
+        return self._search(address.packed, self._v6_offset, self.v6_count, 16)
+
+    def _search(self, key, offset, count, width):
+        """start <= key 인 마지막 레코드를 이진 탐색 후 end 범위 확인"""
+        mm = self._mm
+        record_size = width * 2 + 2
+        lo, hi = 0, count
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = offset + mid * record_size
+            if mm[start:start + width] <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo == 0:
+            return None
+
+        record = offset + (lo - 1) * record_size
+        if key > mm[record + width:record + width * 2]:
+            return None
+        return mm[record + width * 2:record + record_size].decode('ascii')
+
+    def close(self):
+        self._mm.close()
+
+
+_database = None
+_database_loaded = False
+
+
+def get_database():
+    """컨테이너당 1회 로드 (파일이 없으면 None)"""
+    global _database, _database_loaded
+    if not _database_loaded:
+        _database_loaded = True
+        try:
+            _database = GeoIpDatabase(GEOIP_DB_PATH)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] GeoIP DB 로드 실패 ({GEOIP_DB_PATH}): {e}")
+            _database = None
+    return _database
+
+
+def lookup_country(ip):
+    """IP 주소로 국가 코드 조회 (사설/잘못된 IP, DB 미존재 시 'unknown')"""
+    if not ip or ip == 'unknown':
+        return 'unknown'
+
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return 'unknown'
+
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+
+    if address.is_private or address.is_loopback or address.is_reserved:
+        return 'unknown'
+
+    database = get_database()
+    if database is None:
+        return 'unknown'
+
+    return database.lookup(str(address)) or 'unknown'
@@ -0,0 +1,87 @@
+"""
+GeoIP 바이너리 인덱스 빌더
+IP 범위 CSV (start_ip,end_ip,country_code) → geoip.py가 읽는 바이너리 포맷
+
+사용법:
+  python geoip_build.py dbip-country-lite.csv data/geoip.bin
+"""
+import argparse
+import csv
+import ipaddress
+import os
+
+from geoip import HEADER, MAGIC
+
+
+def read_ranges(csv_path):
+    """CSV에서 (start, end, country) 범위 읽기 (헤더/잘못된 행은 건너뜀)"""
+    v4_ranges, v6_ranges = [], []
+
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 3:
+                continue
+            try:
+                start = ipaddress.ip_address(row[0].strip())
+                end = ipaddress.ip_address(row[1].strip())
+            except ValueError:
+                continue
+
+            country = row[2].strip().upper()
+            if start.version != end.version or start > end or len(country) != 2 or country == 'ZZ':
+                continue
+
+            target = v4_ranges if start.version == 4 else v6_ranges
+            target.append((int(start), int(end), country))
+
+    return v4_ranges, v6_ranges
+
+
+def merge_ranges(ranges):
+    """정렬 후 겹치는 범위 검증 + 인접한 같은 국가 범위 병합"""
+    merged = []
+    for start, end, country in sorted(ranges):
+        if merged:
+            prev_start, prev_end, prev_country = merged[-1]
+            if start <= prev_end:
+                raise ValueError(f"overlapping ranges: {prev_start}-{prev_end} / {start}-{end}")
+            if start == prev_end + 1 and country == prev_country:
+                merged[-1] = (prev_start, end, country)
+                continue
+        merged.append((start, end, country))
+    return merged
+
+
+def build_database(csv_path, output_path):
+    """CSV → 바이너리 인덱스 파일 생성, (v4, v6) 범위 수 반환"""
+    v4_ranges, v6_ranges = read_ranges(csv_path)
+    v4_ranges = merge_ranges(v4_ranges)
+    v6_ranges = merge_ranges(v6_ranges)
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(v4_ranges), len(v6_ranges)))
+        for width, ranges in ((4, v4_ranges), (16, v6_ranges)):
+            for start, end, country in ranges:
+                f.write(start.to_bytes(width, 'big'))
+                f.write(end.to_bytes(width, 'big'))
+                f.write(country.encode('ascii'))
+
+    return len(v4_ranges), len(v6_ranges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='IP 범위 CSV를 GeoIP 바이너리 인덱스로 변환')
+    parser.add_argument('csv_path', help='start_ip,end_ip,country_code 형식의 CSV')
+    parser.add_argument('output_path', help='출력 파일 경로 (예: data/geoip.bin)')
+    args = parser.parse_args()
+
+    v4_count, v6_count = build_database(args.csv_path, args.output_path)
+    print(f"GeoIP 인덱스 생성 완료: {args.output_path} (IPv4 {v4_count}개, IPv6 {v6_count}개 범위)")
+
+
+if __name__ == '__main__':
+    main()
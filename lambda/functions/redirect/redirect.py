@@ -1,30 +1,122 @@
 import json
-import boto3
 import os
+import time
 import uuid
-import urllib.request
+from collections import defaultdict
 from datetime import datetime
 
-dynamodb = boto3.resource('dynamodb')
+from bot_filter import FilteredClicks, filter_reason
+from click_events import build_click_event, build_filtered_event, create_click_queue
+from geoip import lookup_country
+from url_cache import NOT_FOUND, UrlCache
+from linksnap_common.cache_policy import policy_of, redirect_headers
+from linksnap_common.clicks import build_click_item
+from linksnap_common.counters import ShardedCounter, total_click_count
+from linksnap_common.dynamo import dynamodb_resource
+from linksnap_common.expiry import EXPIRES_EPOCH_ATTR, URL_TTL_ATTR, is_expired
+from linksnap_common.listing import set_listing_clicks
+from linksnap_common.rollups import RollupWriter
+from linksnap_common.site_summary import SiteSummary, read_url_items, url_entry
+
+dynamodb = dynamodb_resource()
 urls_table = dynamodb.Table(os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
-stats_table = dynamodb.Table(os.environ.get('STATS_TABLE', 'url-shortener-stats-dev'))
+clicks_table = dynamodb.Table(os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev'))
+
+# sync: 리다이렉트 전에 직접 기록 / async: 큐에 이벤트만 넣고 click_consumer가 배치 기록
+CLICK_RECORDING_MODE = os.environ.get('CLICK_RECORDING_MODE', 'sync')
+click_queue = create_click_queue() if CLICK_RECORDING_MODE == 'async' else None
+
+# origin: 리다이렉트 요청마다 클릭 기록 / edge: CDN 액세스 로그(edge_log_consumer)로만 집계
+# (CDN이 캐시한 리다이렉트는 origin에 오지 않으므로 edge 모드에서는 origin 요청을 세지 않음 → 중복 방지)
+CLICK_SOURCE = os.environ.get('CLICK_SOURCE', 'origin')
+
+# single: urls.clickCount 직접 증가 / sharded: counters 테이블 샤드에 분산 기록
+# (write-behind는 쓰지 않음 — 호출 끝에 flush할 지점이 없어 마지막 구간이 유실됨, consumer는 배치 단위로 이미 합산)
+CLICK_COUNTER_MODE = os.environ.get('CLICK_COUNTER_MODE', 'single')
+click_counter = ShardedCounter(
+    dynamodb,
+    os.environ.get('COUNTERS_TABLE', 'url-shortener-counters-dev'),
+    shard_count=int(os.environ.get('CLICK_COUNTER_SHARDS', '10'))
+) if CLICK_COUNTER_MODE == 'sharded' else None
+
+# 클릭 배치 수집 시점(click_consumer/edge_log_consumer)에 롤업(시간대/일별/디바이스/유입/국가 버킷) 증가
+# (아래 사이트 요약/listClicks도 배치 경로 전용 — sync 리다이렉트는 카운터 증가와 클릭 put만 실행)
+rollups_table = dynamodb.Table(os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev'))
+ROLLUPS_ENABLED = os.environ.get('ROLLUPS_ENABLED', 'false').lower() == 'true'
+rollup_writer = RollupWriter(rollups_table) if ROLLUPS_ENABLED else None
+
+# 사이트 요약 문서(totalClicks/일별/인기 URL) 증분 갱신
+SITE_SUMMARY_ENABLED = os.environ.get('SITE_SUMMARY_ENABLED', 'false').lower() == 'true'
+site_summary = SiteSummary(rollups_table) if SITE_SUMMARY_ENABLED else None
+
+# URL 목록 GSI(byClicks) 정렬 키 listClicks를 클릭 배치마다 최신 합계로 갱신
+URL_LISTING_ENABLED = os.environ.get('URL_LISTING_ENABLED', 'false').lower() == 'true'
+
+# off: 모든 요청을 클릭으로 기록 / skip: HEAD·prefetch·봇 요청은 기록 안 함 (EMF 메트릭만)
+# tally: skip + 사유를 담은 이벤트를 클릭 큐에 넣어 click_consumer가 배치마다 롤업 버킷 flt#{사유}에 합산
+#   (async 모드 전용 — sync 모드는 호출 끝에 기록할 배치가 없으므로 skip과 같게 동작)
+BOT_FILTER_MODE = os.environ.get('BOT_FILTER_MODE', 'off')
+BOT_TALLY_ENABLED = BOT_FILTER_MODE == 'tally' and click_queue is not None
+filtered_clicks = FilteredClicks()
+
+# 컨테이너 단위 URL 캐시 (크기 0이면 비활성화)
+url_cache = UrlCache(
+    maxsize=int(os.environ.get('URL_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('URL_CACHE_TTL_SECONDS', '300')),
+    negative_ttl=float(os.environ.get('URL_CACHE_NEGATIVE_TTL_SECONDS', '60'))
+)
+# N회 호출마다 캐시 카운터를 EMF 메트릭으로 출력 (0이면 출력 안 함)
+URL_CACHE_METRICS_INTERVAL = int(os.environ.get('URL_CACHE_METRICS_INTERVAL', '100'))
+_invocations = 0
 
 
 def get_country_from_ip(ip):
-    """IP 주소로 국가 코드 조회 (무료 API 사용)"""
-    try:
-        if not ip or ip == 'unknown' or ip.startswith('127.') or ip.startswith('10.'):
-            return 'unknown'
-        
-        # ip-api.com API 
-        url = f"http://ip-api.com/json/{ip}?fields=countryCode"
-        req = urllib.request.Request(url, headers={'User-Agent': 'LinkSnap/1.0'})
-        
-        with urllib.request.urlopen(req, timeout=2) as response:
-            data = json.loads(response.read().decode())
-            return data.get('countryCode', 'unknown')
-    except Exception:
-        return 'unknown'
+    """IP 주소로 국가 코드 조회 (번들된 로컬 GeoIP 인덱스 사용, 네트워크 호출 없음)"""
+    return lookup_country(ip)
+
+
+def resolve_url(short_code):
+    """shortCode → {originalUrl, expiresAt, expiresAtEpoch, ttl, redirectStatus, cacheMaxAge}
+    (캐시 우선, 없으면 DynamoDB 조회 후 캐시, 캐시 수명은 링크 삭제 시각(ttl)까지 → 회수된 코드의 이전 링크를 내주지 않음)
+    """
+    cached = url_cache.get(short_code)
+    if cached is NOT_FOUND:
+        return None
+    if cached is not None:
+        return cached
+
+    response = urls_table.get_item(
+        Key={'urlId': short_code},
+        ProjectionExpression='originalUrl, expiresAt, expiresAtEpoch, #ttl, redirectStatus, cacheMaxAge',
+        ExpressionAttributeNames={'#ttl': URL_TTL_ATTR}
+    )
+    item = response.get('Item')
+
+    if not item:
+        url_cache.put(short_code, NOT_FOUND)
+        return None
+
+    resolved = {
+        'originalUrl': item['originalUrl'],
+        'expiresAt': item.get('expiresAt', ''),
+        **policy_of(item)
+    }
+    if item.get(EXPIRES_EPOCH_ATTR) is not None:
+        resolved[EXPIRES_EPOCH_ATTR] = int(item[EXPIRES_EPOCH_ATTR])
+    ttl = item.get(URL_TTL_ATTR)
+    url_cache.put(short_code, resolved, max_age=int(ttl) - time.time() if ttl is not None else None)
+    return resolved
+
+
+def emit_cache_metrics(context):
+    """URL_CACHE_METRICS_INTERVAL 호출마다 캐시 카운터 출력"""
+    global _invocations
+    _invocations += 1
+    if URL_CACHE_METRICS_INTERVAL > 0 and _invocations % URL_CACHE_METRICS_INTERVAL == 0:
+        function_name = getattr(context, 'function_name', 'redirect')
+        url_cache.emit_metrics('LinkSnap/Redirect', function_name)
+        if BOT_FILTER_MODE != 'off':
+            filtered_clicks.emit_metrics('LinkSnap/Redirect', function_name)
 
 
 def get_client_ip(event):
@@ -42,35 +134,89 @@ def get_client_ip(event):
     return ip
 
 
+def increment_click_count(short_code, amount=1):
+    """클릭 카운트 증가 (CLICK_COUNTER_MODE에 따라 단일 아이템 또는 샤드)"""
+    if click_counter is not None:
+        click_counter.increment(short_code, amount)
+        return
+
+    urls_table.update_item(
+        Key={'urlId': short_code},
+        UpdateExpression='SET clickCount = if_not_exists(clickCount, :zero) + :inc',
+        ExpressionAttributeValues={':inc': amount, ':zero': 0}
+    )
+
+
+def current_click_totals(url_ids):
+    """URL별 최신 클릭 합계 (urls.clickCount + 샤드 합계) → 요약/목록용 url_entry 목록"""
+    url_items = read_url_items(dynamodb, urls_table.name, url_ids)
+    shard_totals = click_counter.read_many(url_ids) if click_counter is not None else {}
+    return [url_entry(item, total_click_count(item, shard_totals)) for item in url_items]
+
+
+def update_click_aggregates(click_items):
+    """클릭 아이템 목록을 사이트 요약(일별 합계 + 인기 목록)과 목록 GSI(listClicks)에 반영"""
+    if site_summary is None and not URL_LISTING_ENABLED:
+        return
+
+    entries = current_click_totals(list({item['urlId'] for item in click_items}))
+
+    if URL_LISTING_ENABLED:
+        set_listing_clicks(urls_table, entries)
+
+    if site_summary is not None:
+        day_counts = defaultdict(int)
+        for item in click_items:
+            # clickKey는 두 형식 모두 ISO 시각으로 시작 → 앞 10자리가 날짜
+            day_counts[item['clickKey'][:10]] += 1
+        site_summary.record_clicks(dict(day_counts), entries)
+
+
 def record_click(short_code, event):
-    """클릭 통계 기록"""
+    """클릭 통계 기록 (sync 모드: 클릭 카운트 증가 + clicks 테이블 put만)"""
     headers = event.get('headers', {}) or {}
     
     # 클라이언트 IP에서 국가 조회
     client_ip = get_client_ip(event)
     country = headers.get('cloudfront-viewer-country') or get_country_from_ip(client_ip)
     
-    # url 테이블 클릭 카운트 증가 (가장 중요 — 먼저 실행)
-    urls_table.update_item(
-        Key={'urlId': short_code},
-        UpdateExpression='SET clickCount = if_not_exists(clickCount, :zero) + :inc',
-        ExpressionAttributeValues={':inc': 1, ':zero': 0}
-    )
+    # 클릭 카운트 증가 (가장 중요 — 먼저 실행)
+    increment_click_count(short_code)
     
-    # stats 테이블에 상세 클릭 로그 저장 (실패해도 리다이렉트는 정상 처리)
+    # clicks 테이블에 상세 클릭 로그 저장 (실패해도 리다이렉트는 정상 처리)
+    click_item = build_click_item(
+        short_code,
+        datetime.utcnow(),
+        uuid.uuid4(),
+        headers.get('user-agent', 'unknown'),
+        headers.get('referer', 'direct'),
+        country,
+        client_ip
+    )
     try:
-        stats_table.put_item(
-            Item={
-                'statsId': f"{short_code}#{uuid.uuid4()}",
-                'timestamp': datetime.utcnow().isoformat(),
-                'userAgent': headers.get('user-agent', 'unknown'),
-                'referer': headers.get('referer', 'direct'),
-                'country': country,
-                'ip': client_ip
-            }
-        )
+        clicks_table.put_item(Item=click_item)
+    except Exception as e:
+        print(f"[WARN] clicks 테이블 기록 실패 (shortCode={short_code}): {e}")
+
+    # 롤업/사이트 요약/listClicks는 여기서 갱신하지 않음 (모든 리다이렉트가 요약 아이템 하나에 몰리는 핫 키 방지)
+    # → 배치 consumer 경로, 또는 sync 모드면 보관 작업의 롤업 합산(COMPACTION_FOLD_ROLLUPS)과 요약 reconcile이 반영
+
+
+def enqueue_click(short_code, event):
+    """클릭 이벤트를 큐에 넣고 바로 반환 (async 모드)"""
+    headers = event.get('headers', {}) or {}
+    try:
+        click_queue.put(build_click_event(short_code, headers, get_client_ip(event)))
+    except Exception as e:
+        print(f"[WARN] 클릭 이벤트 큐 전송 실패 (shortCode={short_code}): {e}")
+
+
+def enqueue_filtered(short_code, reason):
+    """걸러낸 요청을 사유와 함께 큐에 넣음 (tally 모드, consumer가 flt#{사유} 버킷에 합산)"""
+    try:
+        click_queue.put(build_filtered_event(short_code, reason))
     except Exception as e:
-        print(f"[WARN] stats 테이블 기록 실패 (shortCode={short_code}): {e}")
+        print(f"[WARN] 걸러낸 요청 이벤트 큐 전송 실패 (shortCode={short_code}): {e}")
 
 
 def handler(event, context):
@@ -86,9 +232,9 @@ def handler(event, context):
                 'body': json.dumps({'error': 'shortCode is required'})
             }
         
-        # 2. DynamoDB에서 원본 URL 조회 (urlId = shortCode)
-        response = urls_table.get_item(Key={'urlId': short_code})
-        item = response.get('Item')
+        # 2. 원본 URL 조회 (컨테이너 캐시 → DynamoDB, urlId = shortCode)
+        item = resolve_url(short_code)
+        emit_cache_metrics(context)
         
         if not item:
             return {
@@ -97,26 +243,36 @@ def handler(event, context):
                 'body': json.dumps({'error': 'URL not found'})
             }
         
-        # 3. 만료 체크
-        expires_at = item.get('expiresAt', '')
-        if expires_at:
-            if datetime.utcnow().isoformat() > expires_at:
-                return {
-                    'statusCode': 410,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'URL has expired'})
-                }
+        # 3. 만료 체크 (expiresAtEpoch 숫자 비교, 없는 기존 아이템은 expiresAt 문자열 비교)
+        if is_expired(item):
+            return {
+                'statusCode': 410,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'error': 'URL has expired'})
+            }
         
-        # 4. 통계 기록
-        record_click(short_code, event)
+        # 4. 통계 기록 (async 모드에서는 큐 적재만 하고 DynamoDB 쓰기는 consumer가 처리, edge 모드는 로그에서 집계)
+        #    봇/미리보기/HEAD 요청은 리다이렉트만 하고 클릭으로 세지 않음 (BOT_FILTER_MODE, edge 모드는 로그 consumer가 거름)
+        if CLICK_SOURCE != 'edge':
+            reason = None
+            if BOT_FILTER_MODE != 'off':
+                method = event.get('requestContext', {}).get('http', {}).get('method', 'GET')
+                reason = filter_reason(method, event.get('headers', {}) or {})
+
+            if reason is not None:
+                filtered_clicks.add(reason)
+                if BOT_TALLY_ENABLED:
+                    enqueue_filtered(short_code, reason)
+            elif click_queue is not None:
+                enqueue_click(short_code, event)
+            else:
+                record_click(short_code, event)
         
-        # 5. 리다이렉트
+        # 5. 리다이렉트 (링크별 정책: 301/308 + expiresAt 이내 max-age, 또는 302 no-cache)
+        status_code, headers = redirect_headers(item, item['originalUrl'], shared_only=CLICK_SOURCE == 'edge')
         return {
-            'statusCode': 301,
-            'headers': {
-                'Location': item['originalUrl'],
-                'Cache-Control': 'no-cache'
-            },
+            'statusCode': status_code,
+            'headers': headers,
             'body': ''
         }
         
@@ -125,4 +281,9 @@ def handler(event, context):
             'statusCode': 500,
             'headers': {'Content-Type': 'application/json'},
             'body': json.dumps({'error': str(e)})
-        }
\ No newline at end of file
+        }
+
+    finally:
+        # 버퍼에 남은 클릭 이벤트 전송 (CLICK_QUEUE_BATCH_SIZE > 1이어도 호출 사이에 버퍼를 남기지 않음)
+        if click_queue is not None:
+            click_queue.flush()
@@ -0,0 +1,115 @@
+"""
+컨테이너 단위 LRU + TTL 캐시 (shortCode → originalUrl/expiresAt)
+- warm 컨테이너에서 자주 조회되는 링크는 DynamoDB 조회 생략
+- 존재하지 않는 shortCode(404)도 짧은 TTL로 캐시
+- put의 max_age로 항목별 수명 상한 (링크 삭제/코드 회수 시각 이후까지 남지 않도록)
+"""
+import json
+import time
+from collections import OrderedDict
+
+# 404 결과를 나타내는 캐시 값
+NOT_FOUND = object()
+
+
+class UrlCache:
+    """크기 제한 LRU 캐시 + 항목별 만료 시간"""
+
+    def __init__(self, maxsize=1024, ttl=300, negative_ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._emitted = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        """캐시 조회 (없거나 만료되면 None, 404 캐시면 NOT_FOUND)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires = entry
+        if self._clock() >= expires:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, max_age=None):
+        """캐시 저장 (NOT_FOUND는 negative_ttl 적용, max_age가 더 짧으면 max_age초)"""
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.negative_ttl if value is NOT_FOUND else self.ttl
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """캐시 사이징용 카운터"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def emit_metrics(self, namespace, function_name):
+        """CloudWatch Embedded Metric Format 로그 출력 (지난 출력 이후 증가분, API 호출 없이 메트릭 생성)"""
+        stats = self.stats()
+        deltas = {name: stats[name] - self._emitted[name] for name in self._emitted}
+        self._emitted = {name: stats[name] for name in self._emitted}
+
+        print(json.dumps({
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': namespace,
+                    'Dimensions': [['FunctionName']],
+                    'Metrics': [
+                        {'Name': 'UrlCacheHits', 'Unit': 'Count'},
+                        {'Name': 'UrlCacheMisses', 'Unit': 'Count'},
+                        {'Name': 'UrlCacheEvictions', 'Unit': 'Count'},
+                        {'Name': 'UrlCacheSize', 'Unit': 'Count'}
+                    ]
+                }]
+            },
+            'FunctionName': function_name,
+            'UrlCacheHits': deltas['hits'],
+            'UrlCacheMisses': deltas['misses'],
+            'UrlCacheEvictions': deltas['evictions'],
+            'UrlCacheSize': stats['size'],
+            'urlCache': stats
+        }))
@@ -0,0 +1,179 @@
+"""
+원시 클릭 보관(compaction) Lambda (EventBridge 매일)
+- clicks 테이블 원시 클릭은 CLICK_TTL_DAYS 뒤 DynamoDB TTL로 삭제 → 그 전에 하루 단위 압축 파일로 보관
+  (통계 API는 롤업/최근 N일만 읽으므로 hot 테이블 크기와 스캔 비용은 TTL 기간 안으로 유지)
+- 대상: 보관 기간 안에서 ARCHIVE_AFTER_DAYS일보다 오래되고 아직 manifest가 없는 날짜
+  (늦게 들어오는 클릭 - SQS 재시도, 엣지 로그 지연 - 이 다 반영된 뒤, 빠진 날은 다음 실행에서 이어서)
+- 한 번에 오래된 순으로 COMPACTION_MAX_DAYS일까지만 → Lambda 제한 시간 안에 끝나도록, 나머지는 다음 실행
+- 스캔 한 번(SCAN_SEGMENTS 병렬)으로 여러 날짜 처리, segment마다 날짜별 파일 하나를 저장소로 바로 스트리밍
+    clicks/dt=YYYY-MM-DD/part-0000.ndjson.gz ...
+    clicks/dt=YYYY-MM-DD/_manifest.json   건수, 파일 목록, URL별 일별 클릭 수 (마지막에 기록 = 완료 표시)
+- 같은 날짜를 다시 보관하면 같은 키로 덮어씀 (event {"days": ["2026-10-01"]}로 지정)
+- COMPACTION_FOLD_ROLLUPS=true: 보관하면서 롤업 버킷에도 합산 (수집 시점 롤업 ROLLUPS_ENABLED를 쓰지 않는 배포용)
+  일별 버킷은 manifest의 urlClicks로 SET, 차원 버킷은 날짜별 표시 아이템으로 한 번만 ADD → 같은 날짜를 다시 돌려도 중복 없음 (rollups.fold_day)
+"""
+import json
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from linksnap_common.aggregate import parallel_scan
+from linksnap_common.archive import ARCHIVE_FORMAT, archive_record, create_archive_store, open_writer, writer_class
+from linksnap_common.clicks import CLICK_TTL_DAYS, read_click
+from linksnap_common.dynamo import dynamodb_resource
+from linksnap_common.rollups import dimension_buckets, fold_day
+
+dynamodb = dynamodb_resource()
+clicks_table = dynamodb.Table(os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev'))
+rollups_table = dynamodb.Table(os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev'))
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '2'))
+ARCHIVE_PREFIX = 'clicks'
+COMPACTION_MAX_DAYS = int(os.environ.get('COMPACTION_MAX_DAYS', '3'))
+COMPACTION_FOLD_ROLLUPS = os.environ.get('COMPACTION_FOLD_ROLLUPS', 'false').lower() == 'true'
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '1'))
+
+
+def partition(day):
+    return f"{ARCHIVE_PREFIX}/dt={day}"
+
+
+def manifest_key(day):
+    return f"{partition(day)}/_manifest.json"
+
+
+def part_key(day, segment, archive_format):
+    return f"{partition(day)}/part-{segment:04d}.{writer_class(archive_format).extension}"
+
+
+def pending_days(store, now=None):
+    """TTL로 지워지기 전이고 ARCHIVE_AFTER_DAYS보다 오래됐는데 manifest가 없는 날짜 (오래된 순)"""
+    today = (now or datetime.utcnow()).date()
+    first = today - timedelta(days=CLICK_TTL_DAYS - 1)
+    last = today - timedelta(days=ARCHIVE_AFTER_DAYS)
+    days = []
+    day = first
+    while day <= last:
+        if not store.exists(manifest_key(day.isoformat())):
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def make_fold(store, days, archive_format, fold_rollups):
+    """segment 하나의 클릭을 날짜별 파일로 스트리밍
+    → {날짜: part 정보}, {(날짜, urlId): 클릭 수}, {(날짜, urlId, 차원 버킷): 클릭 수} (fold_rollups가 아니면 빈 dict)
+    - 도중에 실패하면 열어 둔 파일(멀티파트 업로드)은 취소하고 예외를 그대로 올림
+    """
+    wanted = set(days)
+
+    def fold(items, segment):
+        writers = {}
+        url_clicks = defaultdict(int)
+        dimension_clicks = defaultdict(int)
+
+        try:
+            for item in items:
+                # clickKey는 full/compact 모두 ISO 시각으로 시작 → 앞 10자리가 날짜
+                day = item['clickKey'][:10]
+                if day not in wanted:
+                    continue
+
+                if day not in writers:
+                    key = part_key(day, segment, archive_format)
+                    writers[day] = (key, open_writer(store.open_stream(key), archive_format))
+                writers[day][1].write(archive_record(item))
+                url_clicks[(day, item['urlId'])] += 1
+
+                if fold_rollups:
+                    click = read_click(item)
+                    if click['timestamp'] is None:
+                        print(f"[WARN] 롤업 합산 제외, timestamp 없음 ({item.get('urlId')}/{item.get('clickKey')})")
+                        continue
+                    for bucket in dimension_buckets(click['timestamp'], click['device'], click['referer'], click['country']):
+                        dimension_clicks[(day, item['urlId'], bucket)] += 1
+
+            parts = {}
+            for day, (key, writer) in writers.items():
+                parts[day] = {'key': key, 'records': writer.count, 'bytes': writer.finish()}
+        except Exception:
+            for _, writer in writers.values():
+                writer.abort()
+            raise
+
+        return parts, dict(url_clicks), dict(dimension_clicks)
+
+    return fold
+
+
+def compact(store, days, archive_format=None, fold_rollups=None, now=None):
+    """days(ISO 날짜 목록)의 클릭을 보관, 날짜별 manifest 목록 반환"""
+    if not days:
+        return []
+    archive_format = archive_format or ARCHIVE_FORMAT
+    fold_rollups = COMPACTION_FOLD_ROLLUPS if fold_rollups is None else fold_rollups
+    days = sorted(days)
+    until = (date.fromisoformat(days[-1]) + timedelta(days=1)).isoformat()
+
+    partials = parallel_scan(
+        clicks_table,
+        make_fold(store, days, archive_format, fold_rollups),
+        segments=SCAN_SEGMENTS,
+        pass_segment=True,
+        FilterExpression='clickKey BETWEEN :since AND :until',
+        ExpressionAttributeValues={':since': days[0], ':until': until}
+    )
+
+    created_at = (now or datetime.utcnow()).isoformat()
+    manifests = []
+    for day in days:
+        parts = []
+        records = 0
+        url_clicks = defaultdict(int)
+        dimension_clicks = defaultdict(int)
+
+        for segment_parts, segment_clicks, segment_dimensions in partials:
+            if day in segment_parts:
+                parts.append(segment_parts[day])
+                records += segment_parts[day]['records']
+            for (click_day, url_id), count in segment_clicks.items():
+                if click_day == day:
+                    url_clicks[url_id] += count
+            for (click_day, url_id, bucket), count in segment_dimensions.items():
+                if click_day == day:
+                    dimension_clicks[(url_id, bucket)] += count
+
+        # manifest(완료 표시)보다 먼저 → 롤업 반영 중 실패하면 다음 실행에서 다시 (fold_day는 다시 돌려도 중복 없음)
+        if fold_rollups and not fold_day(rollups_table, date.fromisoformat(day), url_clicks, dimension_clicks):
+            print(f"[compaction] {day}: 차원 롤업은 이미 합산됨, 일별 버킷만 다시 기록")
+
+        manifest = {
+            'date': day,
+            'format': archive_format,
+            'records': records,
+            'parts': parts,
+            'urlClicks': dict(url_clicks),
+            'foldedRollups': fold_rollups,
+            'createdAt': created_at
+        }
+        store.put(manifest_key(day), json.dumps(manifest, ensure_ascii=False).encode())
+        manifests.append(manifest)
+    return manifests
+
+
+def handler(event, context):
+    store = create_archive_store()
+    days = sorted((event or {}).get('days') or pending_days(store))
+    remaining = 0
+    if COMPACTION_MAX_DAYS > 0 and len(days) > COMPACTION_MAX_DAYS:
+        days, remaining = days[:COMPACTION_MAX_DAYS], len(days) - COMPACTION_MAX_DAYS
+        print(f"[compaction] 오래된 {COMPACTION_MAX_DAYS}일만 처리, {remaining}일은 다음 실행에서")
+    manifests = compact(store, days)
+
+    for manifest in manifests:
+        print(f"[compaction] {manifest['date']}: {manifest['records']}건, 파일 {len(manifest['parts'])}개")
+    return {
+        'days': [manifest['date'] for manifest in manifests],
+        'records': sum(manifest['records'] for manifest in manifests),
+        'remaining': remaining
+    }
@@ -1,144 +1,189 @@
 import json
-import boto3
 import os
 from datetime import datetime, timedelta
-from boto3.dynamodb.conditions import Attr
 
-dynamodb = boto3.resource('dynamodb')
+from linksnap_common.aggregate import TopN, parallel_scan
+from linksnap_common.clicks import click_projection, read_click
+from linksnap_common.counters import ShardedCounter, total_click_count
+from linksnap_common import rollups
+from linksnap_common.dynamo import dynamodb_resource
+from linksnap_common.expiry import add_live_filter
+from linksnap_common.site_summary import SUMMARY_LIST_SIZE, URL_ENTRY_FIELDS, SiteSummary, day_clicks, url_entry
+
+dynamodb = dynamodb_resource()
 urls_table = dynamodb.Table(os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
-stats_table = dynamodb.Table(os.environ.get('STATS_TABLE', 'url-shortener-stats-dev'))
+clicks_table = dynamodb.Table(os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev'))
 
+# raw: clicks 테이블 스캔으로 오늘/어제 집계 / rollups: 사이트 전체 일별 버킷 조회
+STATS_SOURCE = os.environ.get('STATS_SOURCE', 'raw')
+rollups_table = dynamodb.Table(os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev'))
 
-def get_all_urls():
-    """모든 URL 조회"""
-    response = urls_table.scan()
-    items = response.get('Items', [])
-    
-    while 'LastEvaluatedKey' in response:
-        response = urls_table.scan(
-            ExclusiveStartKey=response['LastEvaluatedKey']
-        )
-        items.extend(response.get('Items', []))
-    
-    return items
+# scan: urls 테이블 전체 스캔으로 매 요청 집계 / summary: 사이트 요약 문서 1건 조회 (없으면 scan으로 대체)
+SITE_STATS_SOURCE = os.environ.get('SITE_STATS_SOURCE', 'scan')
+site_summary = SiteSummary(rollups_table)
 
+# single: urls.clickCount만 사용 / sharded: counters 테이블 샤드 합계를 더함
+CLICK_COUNTER_MODE = os.environ.get('CLICK_COUNTER_MODE', 'single')
+click_counter = ShardedCounter(
+    dynamodb,
+    os.environ.get('COUNTERS_TABLE', 'url-shortener-counters-dev'),
+    shard_count=int(os.environ.get('CLICK_COUNTER_SHARDS', '10'))
+) if CLICK_COUNTER_MODE == 'sharded' else None
 
-def get_all_clicks():
-    """모든 클릭 데이터 조회"""
-    response = stats_table.scan()
-    items = response.get('Items', [])
-    
-    while 'LastEvaluatedKey' in response:
-        response = stats_table.scan(
-            ExclusiveStartKey=response['LastEvaluatedKey']
-        )
-        items.extend(response.get('Items', []))
-    
-    return items
+# scan 모드 응답의 allUrls 최대 개수 (비우면 전체, 전체 목록은 GET /urls 페이지 조회 권장)
+ALL_URLS_LIMIT = int(os.environ['SITE_STATS_ALL_URLS_LIMIT']) if os.environ.get('SITE_STATS_ALL_URLS_LIMIT') else None
 
+# 만료된 링크는 urls 스캔 필터로 제외 (totalUrls/인기/최근 목록 모두 살아있는 링크 기준)
+EXCLUDE_EXPIRED_URLS = os.environ.get('EXCLUDE_EXPIRED_URLS', 'false').lower() == 'true'
 
-def handler(event, context):
-    try:
-        # 1. 모든 URL 조회
-        all_urls = get_all_urls()
-        total_urls = len(all_urls)
-        
-        # 2. 전체 클릭 수 = urls 테이블의 clickCount 합산 (atomic counter 기준, 가장 정확)
-        total_clicks = sum(int(url.get('clickCount', 0)) for url in all_urls)
-        
-        # 3. 인기 URL (클릭수 기준 상위 10개)
-        popular_urls = sorted(
-            all_urls,
-            key=lambda x: int(x.get('clickCount', 0)),
-            reverse=True
-        )[:10]
-        
-        popular_urls_list = [
-            {
-                'urlId': url.get('urlId'),
-                'shortUrl': url.get('shortUrl'),
-                'originalUrl': url.get('originalUrl'),
-                'clickCount': int(url.get('clickCount', 0)),
-                'createdAt': url.get('createdAt')
-            }
-            for url in popular_urls
-        ]
-        
-        # 4. 오늘/어제 클릭 수 (stats 테이블에서 timestamp 기반 집계)
-        all_clicks = get_all_clicks()
-        
-        now = datetime.utcnow()
-        today = now.date()
-        yesterday = today - timedelta(days=1)
-        
+# 전체 스캔(urls / clicks / counters)을 나눌 segment 수 (1이면 순차 스캔)
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '1'))
+
+
+def scan_all_urls(fold):
+    """urls 테이블을 SCAN_SEGMENTS개로 나눠 스캔, segment별 fold 결과 리스트 (요약에 필요한 속성만)"""
+    scan_kwargs = {'ProjectionExpression': ', '.join(URL_ENTRY_FIELDS)}
+    if EXCLUDE_EXPIRED_URLS:
+        add_live_filter(scan_kwargs)
+    return parallel_scan(urls_table, fold, segments=SCAN_SEGMENTS, **scan_kwargs)
+
+
+def scan_all_clicks(since, fold):
+    """since 이후 클릭을 SCAN_SEGMENTS개로 나눠 스캔, segment별 fold 결과 리스트 (timestamp만 가져옴)"""
+    return parallel_scan(
+        clicks_table,
+        fold,
+        segments=SCAN_SEGMENTS,
+        FilterExpression='clickKey >= :since',
+        ExpressionAttributeValues={':since': since.isoformat()},
+        **click_projection('timestamp')
+    )
+
+
+def count_recent_clicks(today, yesterday):
+    """clicks 테이블에서 오늘/어제 클릭 수 집계 (segment마다 누적 후 합산)"""
+    def fold(clicks):
         today_clicks = 0
         yesterday_clicks = 0
         
-        for click in all_clicks:
-            timestamp_str = click.get('timestamp', '')
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str)
-                click_date = timestamp.date()
-                
-                if click_date == today:
-                    today_clicks += 1
-                elif click_date == yesterday:
-                    yesterday_clicks += 1
-            except (ValueError, TypeError):
-                pass
-        
-        # 5. 최근 등록된 URL (최근 10개)
-        recent_urls = sorted(
-            all_urls,
-            key=lambda x: x.get('createdAt', ''),
-            reverse=True
-        )[:10]
-        
-        recent_urls_list = [
-            {
-                'urlId': url.get('urlId'),
-                'shortUrl': url.get('shortUrl'),
-                'originalUrl': url.get('originalUrl'),
-                'clickCount': int(url.get('clickCount', 0)),
-                'createdAt': url.get('createdAt')
-            }
-            for url in recent_urls
-        ]
+        for click in clicks:
+            timestamp = read_click(click)['timestamp']
+            if timestamp is None:
+                continue
+            
+            click_date = timestamp.date()
+            if click_date == today:
+                today_clicks += 1
+            elif click_date == yesterday:
+                yesterday_clicks += 1
         
-        # 6. 전체 URL 목록 (드롭다운/선택용, 클릭수 내림차순)
-        all_urls_sorted = sorted(
-            all_urls,
-            key=lambda x: int(x.get('clickCount', 0)),
-            reverse=True
-        )
-        
-        all_urls_list = [
-            {
-                'urlId': url.get('urlId'),
-                'shortUrl': url.get('shortUrl'),
-                'originalUrl': url.get('originalUrl'),
-                'clickCount': int(url.get('clickCount', 0)),
-                'createdAt': url.get('createdAt')
-            }
-            for url in all_urls_sorted
-        ]
+        return today_clicks, yesterday_clicks
+
+    partials = scan_all_clicks(datetime.combine(yesterday, datetime.min.time()), fold)
+    return sum(p[0] for p in partials), sum(p[1] for p in partials)
+
+
+def fold_url_stats(urls, shard_totals, include_all_urls):
+    """URL 스캔 결과(segment 하나) → 부분 집계 (합계 + 상위 N 힙)"""
+    partial = {
+        'totalUrls': 0,
+        'totalClicks': 0,
+        'popularUrls': TopN(SUMMARY_LIST_SIZE, key=lambda u: u['clickCount']),
+        'recentUrls': TopN(SUMMARY_LIST_SIZE, key=lambda u: u.get('createdAt') or ''),
+        'allUrls': TopN(ALL_URLS_LIMIT, key=lambda u: u['clickCount']) if include_all_urls else None
+    }
+    for url in urls:
+        entry = url_entry(url, total_click_count(url, shard_totals))
+        partial['totalUrls'] += 1
+        partial['totalClicks'] += entry['clickCount']
+        partial['popularUrls'].push(entry)
+        partial['recentUrls'].push(entry)
+        if partial['allUrls'] is not None:
+            partial['allUrls'].push(entry)
+    return partial
+
+
+def merge_url_stats(partials):
+    """segment별 부분 집계 병합 (합계는 더하고 힙은 다시 상위 N개로)"""
+    merged = partials[0]
+    for partial in partials[1:]:
+        merged['totalUrls'] += partial['totalUrls']
+        merged['totalClicks'] += partial['totalClicks']
+        for key in ('popularUrls', 'recentUrls', 'allUrls'):
+            if merged[key] is not None:
+                merged[key].merge(partial[key])
+    return merged
+
+
+def scan_site_stats(now=None, include_all_urls=True):
+    """urls 테이블 전체 스캔으로 사이트 통계 집계
+    - 스캔 페이지를 받는 대로 합계/상위 N 힙에 누적 → 메모리는 테이블 크기가 아니라 목록 크기에 비례
+    - SCAN_SEGMENTS > 1이면 segment별로 동시에 부분 집계한 뒤 병합
+    """
+    # sharded 모드면 URL별 clickCount에 샤드 합계를 더함 (이후 집계/정렬 공통 사용)
+    shard_totals = click_counter.read_all(segments=SCAN_SEGMENTS) if click_counter is not None else {}
+
+    # 1~3. URL 수 / 전체 클릭 수(clickCount 합산, atomic counter 기준) / 인기·최근·전체 목록
+    url_stats = merge_url_stats(scan_all_urls(lambda urls: fold_url_stats(urls, shard_totals, include_all_urls)))
+    
+    # 4. 오늘/어제 클릭 수 (롤업 일별 버킷 또는 clicks 테이블 timestamp 기반 집계)
+    now = now or datetime.utcnow()
+    today = now.date()
+    yesterday = today - timedelta(days=1)
+    
+    if STATS_SOURCE == 'rollups':
+        day_counts = rollups.read_day_counts(rollups_table, rollups.SITE_SCOPE, [today, yesterday])
+        today_clicks = day_counts[today]
+        yesterday_clicks = day_counts[yesterday]
+    else:
+        today_clicks, yesterday_clicks = count_recent_clicks(today, yesterday)
+    
+    stats = {
+        'totalUrls': url_stats['totalUrls'],
+        'totalClicks': url_stats['totalClicks'],
+        'todayClicks': today_clicks,
+        'yesterdayClicks': yesterday_clicks,
+        'popularUrls': url_stats['popularUrls'].items(),
+        'recentUrls': url_stats['recentUrls'].items()
+    }
+    
+    # 5. 전체 URL 목록 (드롭다운/선택용, 클릭수 내림차순, ALL_URLS_LIMIT개까지)
+    if url_stats['allUrls'] is not None:
+        stats['allUrls'] = url_stats['allUrls'].items()
+    
+    return stats
+
+
+def summary_site_stats(summary, now=None):
+    """사이트 요약 문서 → 응답 형태 (allUrls는 제외, 전체 목록은 별도 API로 조회)"""
+    today = (now or datetime.utcnow()).date()
+
+    return {
+        'totalUrls': int(summary.get('totalUrls', 0)),
+        'totalClicks': int(summary.get('totalClicks', 0)),
+        'todayClicks': day_clicks(summary, today),
+        'yesterdayClicks': day_clicks(summary, today - timedelta(days=1)),
+        'popularUrls': [url_entry(url) for url in summary.get('topUrls', [])],
+        'recentUrls': [url_entry(url) for url in summary.get('recentUrls', [])]
+    }
+
+
+def handler(event, context):
+    try:
+        summary = site_summary.read() if SITE_STATS_SOURCE == 'summary' else None
+        if summary:
+            body = summary_site_stats(summary)
+        else:
+            body = scan_site_stats()
         
-        # 7. 응답
+        # 응답
         return {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({
-                'totalUrls': total_urls,
-                'totalClicks': total_clicks,
-                'todayClicks': today_clicks,
-                'yesterdayClicks': yesterday_clicks,
-                'popularUrls': popular_urls_list,
-                'recentUrls': recent_urls_list,
-                'allUrls': all_urls_list
-            })
+            'body': json.dumps(body)
         }
         
     except Exception as e:
@@ -1,48 +1,63 @@
 import json
-import boto3
 import os
 from datetime import datetime, timedelta
 from collections import defaultdict
-from boto3.dynamodb.conditions import Key
 
-dynamodb = boto3.resource('dynamodb')
+from linksnap_common.clicks import click_projection, iter_url_clicks, read_click, window_start
+from linksnap_common.counters import ShardedCounter, total_click_count
+from linksnap_common.dynamo import dynamodb_resource
+from linksnap_common import columnar, rollups
+
+dynamodb = dynamodb_resource()
 urls_table = dynamodb.Table(os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
-stats_table = dynamodb.Table(os.environ.get('STATS_TABLE', 'url-shortener-stats-dev'))
+clicks_table = dynamodb.Table(os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev'))
+
+# 통계 페이지 기본 조회 기간 (일별 차트가 최근 30일을 표시)
+DEFAULT_STATS_DAYS = 30
+MAX_STATS_DAYS = int(os.environ.get('MAX_STATS_DAYS', '90'))
+
+# raw: clicks 테이블 원시 클릭으로 계산 / rollups: 사전 집계 버킷만 읽음
+STATS_SOURCE = os.environ.get('STATS_SOURCE', 'raw')
+rollups_table = dynamodb.Table(os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev'))
 
+# raw 모드 집계 방식 - python: 행 단위 누적 / columnar: NumPy 열 배열 집계 (numpy 없으면 python으로)
+STATS_ENGINE = os.environ.get('STATS_ENGINE', 'python')
+if STATS_ENGINE == 'columnar' and not columnar.AVAILABLE:
+    print("[WARN] STATS_ENGINE=columnar 이지만 numpy가 없어 행 단위 집계 사용")
 
-def parse_user_agent(user_agent):
-    """User-Agent에서 디바이스 타입 추출"""
-    user_agent = user_agent.lower()
-    if 'mobile' in user_agent or 'android' in user_agent or 'iphone' in user_agent:
-        return 'mobile'
-    elif 'tablet' in user_agent or 'ipad' in user_agent:
-        return 'tablet'
-    else:
-        return 'desktop'
+# single: urls.clickCount만 사용 / sharded: counters 테이블 샤드 합계를 더함
+CLICK_COUNTER_MODE = os.environ.get('CLICK_COUNTER_MODE', 'single')
+click_counter = ShardedCounter(
+    dynamodb,
+    os.environ.get('COUNTERS_TABLE', 'url-shortener-counters-dev'),
+    shard_count=int(os.environ.get('CLICK_COUNTER_SHARDS', '10'))
+) if CLICK_COUNTER_MODE == 'sharded' else None
 
 
-def get_click_stats(url_id):
-    """특정 URL의 클릭 통계 조회"""
-    # stats 테이블에서 해당 urlId로 시작하는 모든 항목 조회
-    response = stats_table.scan(
-        FilterExpression=Key('statsId').begins_with(f"{url_id}#")
+def get_click_stats(url_id, days=DEFAULT_STATS_DAYS):
+    """특정 URL의 최근 N일 클릭을 Query 페이지 단위로 흘려보냄 (다른 URL 데이터는 읽지 않음)"""
+    return iter_url_clicks(
+        clicks_table,
+        url_id,
+        since=window_start(days),
+        **click_projection('timestamp', 'device', 'referer')
     )
-    
-    items = response.get('Items', [])
-    
-    # 페이지네이션 처리
-    while 'LastEvaluatedKey' in response:
-        response = stats_table.scan(
-            FilterExpression=Key('statsId').begins_with(f"{url_id}#"),
-            ExclusiveStartKey=response['LastEvaluatedKey']
-        )
-        items.extend(response.get('Items', []))
-    
-    return items
 
 
-def calculate_stats(click_items):
-    """클릭 데이터로 통계 계산"""
+def parse_days(event):
+    """?days=N 쿼리 파라미터 (1 ~ MAX_STATS_DAYS, 기본 30)"""
+    query_params = event.get('queryStringParameters', {}) or {}
+    try:
+        days = int(query_params.get('days', DEFAULT_STATS_DAYS))
+    except (TypeError, ValueError):
+        days = DEFAULT_STATS_DAYS
+    return max(1, min(days, MAX_STATS_DAYS))
+
+
+def calculate_stats(click_items, days=DEFAULT_STATS_DAYS):
+    """클릭 데이터로 통계 계산 (iterable을 한 번 훑으며 카운터/히스토그램에 누적, 리스트로 모으지 않음)
+    - dailyClicks는 최근 days일 (?days= 조회 기간)
+    """
     now = datetime.utcnow()
     today = now.date()
     yesterday = today - timedelta(days=1)
@@ -54,15 +69,15 @@ def calculate_stats(click_items):
     referer_distribution = defaultdict(int)  # 유입 경로
     today_clicks = 0
     yesterday_clicks = 0
-    total_clicks = len(click_items)
+    total_clicks = 0
     
     for item in click_items:
-        timestamp_str = item.get('timestamp', '')
-        user_agent = item.get('userAgent', 'unknown')
-        referer = item.get('referer', 'direct')
+        total_clicks += 1
+        # full/compact 형식 모두 (compact는 디바이스/유입 도메인이 이미 분류되어 있음)
+        click = read_click(item)
+        timestamp = click['timestamp']
         
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str)
+        if timestamp is not None:
             click_date = timestamp.date()
             click_hour = timestamp.hour
             
@@ -77,34 +92,22 @@ def calculate_stats(click_items):
                 today_clicks += 1
             elif click_date == yesterday:
                 yesterday_clicks += 1
-                
-        except (ValueError, TypeError):
-            pass
         
         # 디바이스 분포
-        device = parse_user_agent(user_agent)
-        device_distribution[device] += 1
+        device_distribution[click['device']] += 1
         
-        # 유입 경로 (referer 도메인 추출)
-        if referer and referer != 'direct':
-            try:
-                from urllib.parse import urlparse
-                domain = urlparse(referer).netloc or 'direct'
-                referer_distribution[domain] += 1
-            except:
-                referer_distribution['direct'] += 1
-        else:
-            referer_distribution['direct'] += 1
+        # 유입 경로 (referer 도메인)
+        referer_distribution[click['referer']] += 1
     
     # 시간대별 클릭을 리스트로 변환 (0-23시)
     hourly_clicks_list = [{'hour': h, 'clicks': hourly_clicks[h]} for h in range(24)]
     
-    # 일별 클릭을 최근 30일로 정리
+    # 일별 클릭을 최근 days일로 정리
     daily_clicks_list = sorted(
         [{'date': d, 'clicks': c} for d, c in daily_clicks.items()],
         key=lambda x: x['date'],
         reverse=True
-    )[:30]
+    )[:days]
     
     return {
         'totalClicks': total_clicks,
@@ -147,15 +150,20 @@ def handler(event, context):
                 'body': json.dumps({'error': 'URL not found'})
             }
         
-        # 3. 클릭 데이터 조회
-        click_items = get_click_stats(short_code)
-        
-        # 4. 통계 계산
-        stats = calculate_stats(click_items)
+        # 3~4. 통계 계산 (롤업 버킷 또는 최근 N일 원시 클릭)
+        days = parse_days(event)
+        if STATS_SOURCE == 'rollups':
+            stats = rollups.read_stats(rollups_table, short_code, days)
+        else:
+            click_items = get_click_stats(short_code, days)
+            if STATS_ENGINE == 'columnar' and columnar.AVAILABLE:
+                stats = columnar.calculate_stats(click_items, days=days)
+            else:
+                stats = calculate_stats(click_items, days)
         
-        # urls 테이블의 clickCount(atomic counter)를 정식 totalClicks로 사용
-        url_click_count = int(url_item.get('clickCount', 0))
-        stats['totalClicks'] = url_click_count
+        # urls 테이블의 clickCount(atomic counter, sharded 모드면 샤드 합계 포함)를 정식 totalClicks로 사용
+        shard_totals = click_counter.read_many([short_code]) if click_counter is not None else {}
+        stats['totalClicks'] = total_click_count(url_item, shard_totals)
         
         # 5. 응답
         return {
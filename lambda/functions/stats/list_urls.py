@@ -0,0 +1,87 @@
+"""
+URL 목록 조회 Lambda (GET /urls)
+- 정렬 GSI(byCreatedAt / byClicks)를 Query해서 한 페이지씩 반환 → 전체 스캔/정렬 없음
+- 쿼리 파라미터: limit, sort(createdAt|clicks), order(desc|asc), prefix(urlId 접두어), cursor
+- EXCLUDE_EXPIRED_URLS=true: 만료된 링크는 Query 필터로 제외 (응답에서 걸러내지 않음)
+"""
+import json
+import os
+
+from linksnap_common.dynamo import dynamodb_resource
+from linksnap_common.listing import (
+    DEFAULT_PAGE_SIZE, LIST_CLICKS_ATTR, MAX_PAGE_SIZE, SORT_INDEXES, InvalidCursor, query_urls
+)
+from linksnap_common.site_summary import url_entry
+
+dynamodb = dynamodb_resource()
+urls_table = dynamodb.Table(os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
+
+EXCLUDE_EXPIRED_URLS = os.environ.get('EXCLUDE_EXPIRED_URLS', 'false').lower() == 'true'
+
+HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+
+def error_response(status_code, message):
+    return {
+        'statusCode': status_code,
+        'headers': HEADERS,
+        'body': json.dumps({'error': message})
+    }
+
+
+def parse_limit(query_params):
+    """?limit=N (1 ~ MAX_PAGE_SIZE, 기본 50)"""
+    try:
+        limit = int(query_params.get('limit', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def list_entry(item):
+    """GSI 아이템 → 응답 객체 (clickCount는 clickCount/listClicks 중 큰 값)"""
+    click_count = max(int(item.get('clickCount', 0)), int(item.get(LIST_CLICKS_ATTR, 0)))
+    return url_entry(item, click_count)
+
+
+def handler(event, context):
+    try:
+        # 1. 쿼리 파라미터 검증
+        query_params = event.get('queryStringParameters', {}) or {}
+        sort = query_params.get('sort', 'createdAt')
+        order = query_params.get('order', 'desc')
+
+        if sort not in SORT_INDEXES:
+            return error_response(400, f"sort must be one of {', '.join(SORT_INDEXES)}")
+        if order not in ('asc', 'desc'):
+            return error_response(400, 'order must be asc or desc')
+
+        # 2. GSI 한 페이지 조회
+        try:
+            items, next_cursor = query_urls(
+                urls_table,
+                sort=sort,
+                limit=parse_limit(query_params),
+                cursor=query_params.get('cursor'),
+                prefix=query_params.get('prefix'),
+                ascending=order == 'asc',
+                exclude_expired=EXCLUDE_EXPIRED_URLS
+            )
+        except InvalidCursor as e:
+            return error_response(400, str(e))
+
+        # 3. 응답
+        return {
+            'statusCode': 200,
+            'headers': HEADERS,
+            'body': json.dumps({
+                'urls': [list_entry(item) for item in items],
+                'nextCursor': next_cursor
+            })
+        }
+
+    except Exception as e:
+        return error_response(500, str(e))
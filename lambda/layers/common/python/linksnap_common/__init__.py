@@ -0,0 +1,4 @@
+"""
+LinkSnap Lambda 공통 레이어
+여러 함수 패키지(redirect, stats, create_url)가 함께 쓰는 모듈
+"""
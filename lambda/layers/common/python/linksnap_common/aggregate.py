@@ -0,0 +1,80 @@
+"""
+스트리밍 집계 도구
+- 스캔 결과를 페이지 단위 제너레이터로 흘려보내며 누적 → 테이블 전체를 리스트로 모으지 않음
+- TopN: 크기 N 최소 힙으로 상위 N개만 유지 (같은 값이면 먼저 들어온 항목 우선, heapq.nlargest와 같은 순서)
+- parallel_scan: Segment/TotalSegments로 나눈 스캔을 스레드마다 부분 집계 → 호출 측에서 병합
+"""
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_scan(table, **scan_kwargs):
+    """테이블 스캔을 아이템 단위로 (메모리에는 한 페이지만)"""
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def iter_query(table, **query_kwargs):
+    """Query 결과를 아이템 단위로 (LastEvaluatedKey 따라 끝까지)"""
+    while True:
+        response = table.query(**query_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def parallel_scan(table, fold, segments=1, pass_segment=False, **scan_kwargs):
+    """테이블을 segments개로 나눠 동시에 스캔, segment마다 fold(아이템 iterable)의 결과 리스트 반환 (segment 순)
+    - segments <= 1이면 기존 순차 스캔 그대로 (fold 한 번)
+    - pass_segment: fold(아이템 iterable, segment 번호)로 호출 (segment별 출력 파일 이름 등)
+    - client 기반 Table(linksnap_common.dynamo)은 스레드 간 공유 가능, 연결 풀 크기(AWS_MAX_POOL_CONNECTIONS)보다
+      segments가 크면 남는 스레드는 연결을 기다림
+    """
+    def run(items, segment):
+        return fold(items, segment) if pass_segment else fold(items)
+
+    if segments <= 1:
+        return [run(iter_scan(table, **scan_kwargs), 0)]
+
+    def scan_segment(segment):
+        return run(iter_scan(table, Segment=segment, TotalSegments=segments, **scan_kwargs), segment)
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        return list(executor.map(scan_segment, range(segments)))
+
+
+class TopN:
+    """key 기준 상위 limit개 (limit=None이면 전부 유지, 정렬만 스트리밍)"""
+
+    def __init__(self, limit, key):
+        self.limit = limit
+        self.key = key
+        self._heap = []
+        self._seq = itertools.count()
+
+    def push(self, item):
+        # (key, -순번): 같은 key 중 가장 늦게 들어온 항목이 힙 맨 앞 → 먼저 밀려남
+        entry = (self.key(item), -next(self._seq), item)
+        if self.limit is None or len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif self.limit > 0 and entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other):
+        """다른 TopN(다른 segment의 부분 결과)을 합침"""
+        for item in other.items():
+            self.push(item)
+        return self
+
+    def items(self):
+        """key 내림차순 (같은 key는 들어온 순서)"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,342 @@
+"""
+원시 클릭 보관 저장소 (clicks 테이블 TTL로 삭제되기 전에 날짜별 압축 파일로 보관)
+- 저장소: ARCHIVE_URL
+  s3://bucket/prefix   S3 또는 S3 호환 저장소 (ARCHIVE_S3_ENDPOINT로 엔드포인트 지정, 예: MinIO)
+  file:///path         로컬 디렉터리 (테스트/로컬 실행용)
+- 파일 형식
+  ndjson   gzip NDJSON (표준 라이브러리만 사용, 기본값)
+  parquet  열 단위 Parquet (pyarrow 필요, 없으면 RuntimeError)
+- 레코드는 full/compact 형식과 무관하게 같은 필드 (ARCHIVE_FIELDS, 없는 값은 null)
+  → Athena 등에서 dt=YYYY-MM-DD 파티션으로 바로 조회
+- 파일은 저장소 스트림(open_stream)으로 바로 흘려보냄 → 날짜 하나 분량을 메모리에 모으지 않음
+  (S3는 ARCHIVE_PART_BYTES 단위 멀티파트 업로드, 한 조각도 안 되면 put_object 한 번)
+"""
+import gzip
+import json
+import os
+from datetime import timezone
+from urllib.parse import urlparse
+
+from linksnap_common.classify import classify_user_agent
+from linksnap_common.clicks import read_click
+
+ARCHIVE_URL = os.environ.get('ARCHIVE_URL', '')
+ARCHIVE_S3_ENDPOINT = os.environ.get('ARCHIVE_S3_ENDPOINT', '')
+ARCHIVE_FORMAT = os.environ.get('ARCHIVE_FORMAT', 'ndjson')
+# 스트리밍 업로드 조각 크기 (S3 멀티파트 조각은 마지막을 빼고 최소 5 MiB)
+ARCHIVE_PART_BYTES = max(5 * 1024 * 1024, int(os.environ.get('ARCHIVE_PART_BYTES', str(8 * 1024 * 1024))))
+# Parquet row group 크기 (이만큼 모이면 스트림에 기록)
+PARQUET_ROW_GROUP_SIZE = 50000
+
+ARCHIVE_FIELDS = (
+    'urlId', 'clickKey', 'ts', 'device', 'os', 'app', 'referer', 'country',
+    'userAgent', 'refererUrl', 'ipHash', 'schema'
+)
+
+
+def archive_record(item):
+    """clicks 아이템 (full/compact) → 보관 레코드 (원문 User-Agent/referer는 full 형식에만 있음, full은 os/app을 원문에서 분류)"""
+    click = read_click(item)
+    timestamp = click['timestamp']
+    compact = 'v' in item
+    if compact:
+        os_name, app = item.get('os'), item.get('app')
+    else:
+        user_agent = classify_user_agent(item.get('userAgent', ''))
+        os_name, app = user_agent.os, user_agent.in_app
+    return {
+        'urlId': item['urlId'],
+        'clickKey': item['clickKey'],
+        'ts': int(timestamp.replace(tzinfo=timezone.utc).timestamp()) if timestamp is not None else None,
+        'device': click['device'],
+        'os': os_name,
+        'app': app,
+        'referer': click['referer'],
+        'country': click['country'],
+        'userAgent': None if compact else item.get('userAgent'),
+        'refererUrl': None if compact else item.get('referer'),
+        'ipHash': item.get('iph'),
+        'schema': 'compact' if compact else 'full'
+    }
+
+
+class NdjsonWriter:
+    """gzip NDJSON (레코드를 쓰는 즉시 압축해서 스트림으로 → 메모리에는 업로드 대기 조각만)"""
+
+    extension = 'ndjson.gz'
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._gzip = gzip.GzipFile(fileobj=stream, mode='wb')
+        self.count = 0
+
+    def write(self, record):
+        self._gzip.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode() + b'\n')
+        self.count += 1
+
+    def finish(self):
+        """압축을 마치고 스트림 닫기, 기록한 바이트 수 반환"""
+        self._gzip.close()
+        self._stream.close()
+        return self._stream.size
+
+    def abort(self):
+        self._stream.abort()
+
+
+def archive_schema():
+    import pyarrow as pa
+
+    return pa.schema([(field, pa.int64() if field == 'ts' else pa.string()) for field in ARCHIVE_FIELDS])
+
+
+class ParquetWriter:
+    """Parquet (PARQUET_ROW_GROUP_SIZE 행마다 row group 하나씩 스트림에 기록, snappy 압축)"""
+
+    extension = 'parquet'
+
+    def __init__(self, stream):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError('ARCHIVE_FORMAT=parquet 에는 pyarrow가 필요함')
+        self._stream = stream
+        self._writer = None
+        self._columns = {field: [] for field in ARCHIVE_FIELDS}
+        self._rows = 0
+        self.count = 0
+
+    def write(self, record):
+        for field in ARCHIVE_FIELDS:
+            self._columns[field].append(record.get(field))
+        self._rows += 1
+        self.count += 1
+        if self._rows >= PARQUET_ROW_GROUP_SIZE:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(self._columns, schema=archive_schema())
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._stream, table.schema, compression='snappy')
+        self._writer.write_table(table)
+        self._columns = {field: [] for field in ARCHIVE_FIELDS}
+        self._rows = 0
+
+    def finish(self):
+        """남은 행 기록 후 스트림 닫기, 기록한 바이트 수 반환"""
+        if self._rows or self._writer is None:
+            self._write_row_group()
+        self._writer.close()
+        self._stream.close()
+        return self._stream.size
+
+    def abort(self):
+        self._stream.abort()
+
+
+WRITERS = {'ndjson': NdjsonWriter, 'parquet': ParquetWriter}
+
+
+def writer_class(archive_format=None):
+    archive_format = archive_format or ARCHIVE_FORMAT
+    if archive_format not in WRITERS:
+        raise ValueError(f"unknown archive format: {archive_format}")
+    return WRITERS[archive_format]
+
+
+def open_writer(stream, archive_format=None):
+    """저장소 스트림(store.open_stream)에 기록하는 writer"""
+    return writer_class(archive_format)(stream)
+
+
+def read_ndjson(data):
+    """gzip NDJSON 바이트 → 레코드 목록 (확인/복원용)"""
+    return [json.loads(line) for line in gzip.decompress(data).splitlines() if line]
+
+
+class LocalStream:
+    """로컬 파일 스트림 (임시 파일에 쓰고 close에서 이름 변경 → 중간에 실패하면 반쪽 파일이 남지 않음)"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, 'wb')
+        self.size = 0
+        self.closed = False
+
+    def write(self, data):
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self.size
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._file.close()
+        os.remove(self._tmp_path)
+
+
+class S3MultipartStream:
+    """S3 멀티파트 업로드 스트림 (part_bytes마다 조각 하나 업로드 → 메모리에는 조각 하나만)
+    - close 전까지 한 조각도 안 찼으면 put_object 한 번, 실패 시 abort로 업로드 취소
+    """
+
+    def __init__(self, s3, bucket, key, part_bytes=ARCHIVE_PART_BYTES):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_bytes = part_bytes
+        self.size = 0
+        self.closed = False
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def write(self, data):
+        self._buffer += data
+        self.size += len(data)
+        if len(self._buffer) >= self.part_bytes:
+            self._upload_part()
+        return len(data)
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self.size
+
+    def flush(self):
+        pass
+
+    def _upload_part(self):
+        if self._upload_id is None:
+            self._upload_id = self.s3.create_multipart_upload(Bucket=self.bucket, Key=self.key)['UploadId']
+        number = len(self._parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=number, Body=bytes(self._buffer)
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': number})
+        self._buffer = bytearray()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._upload_id is None:
+            self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+            return
+        if self._buffer:
+            self._upload_part()
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, MultipartUpload={'Parts': self._parts}
+        )
+
+    def abort(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            try:
+                self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            except Exception as e:
+                print(f"[WARN] 멀티파트 업로드 취소 실패 ({self.key}): {e}")
+
+
+class LocalArchiveStore:
+    """로컬 디렉터리 (키 = 상대 경로)"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def open_stream(self, key):
+        return LocalStream(self._path(key))
+
+    def get(self, key):
+        with open(self._path(key), 'rb') as f:
+            return f.read()
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+
+class S3ArchiveStore:
+    """S3 / S3 호환 저장소 (prefix 아래에 키 저장)"""
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, s3_client=None):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.endpoint_url = endpoint_url
+        self._s3 = s3_client
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            from linksnap_common.aws import client_config, get_client, session
+            if self.endpoint_url:
+                self._s3 = session().create_client('s3', endpoint_url=self.endpoint_url, config=client_config())
+            else:
+                self._s3 = get_client('s3')
+        return self._s3
+
+    def _key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put(self, key, data):
+        self.s3.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def open_stream(self, key):
+        return S3MultipartStream(self.s3, self.bucket, self._key(key))
+
+    def get(self, key):
+        return self.s3.get_object(Bucket=self.bucket, Key=self._key(key))['Body'].read()
+
+    def exists(self, key):
+        try:
+            self.s3.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+
+def create_archive_store(url=None):
+    """ARCHIVE_URL(s3://bucket/prefix 또는 file:///path) 기준으로 저장소 생성"""
+    url = url or ARCHIVE_URL
+    parsed = urlparse(url)
+    if parsed.scheme == 's3':
+        return S3ArchiveStore(parsed.netloc, parsed.path, endpoint_url=ARCHIVE_S3_ENDPOINT or None)
+    if parsed.scheme == 'file':
+        return LocalArchiveStore(parsed.path)
+    raise ValueError(f"ARCHIVE_URL must be s3://... or file://... (got {url!r})")
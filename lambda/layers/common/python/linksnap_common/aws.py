@@ -0,0 +1,48 @@
+"""
+AWS 클라이언트 공용 생성 (컨테이너당 서비스별 하나, 처음 호출할 때 생성)
+- keep-alive + standard 재시도 모드 + 짧은 타임아웃 (기본 legacy 모드는 DynamoDB 10회 재시도, 타임아웃 60초)
+- AWS_PRELOAD_CLIENTS=dynamodb,sqs 처럼 지정하면 import(init 단계)에서 미리 생성 → 첫 요청 지연을 init으로 옮김
+"""
+import os
+
+PRELOAD_CLIENTS = [name.strip() for name in os.environ.get('AWS_PRELOAD_CLIENTS', '').split(',') if name.strip()]
+
+_session = None
+_clients = {}
+
+
+def client_config():
+    """연결 재사용/재시도/타임아웃 설정"""
+    from botocore.config import Config
+
+    return Config(
+        retries={
+            'mode': os.environ.get('AWS_RETRY_MODE', 'standard'),
+            'max_attempts': int(os.environ.get('AWS_MAX_ATTEMPTS', '3'))
+        },
+        connect_timeout=float(os.environ.get('AWS_CONNECT_TIMEOUT', '1')),
+        read_timeout=float(os.environ.get('AWS_READ_TIMEOUT', '5')),
+        tcp_keepalive=True,
+        max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '10'))
+    )
+
+
+def session():
+    """botocore 세션 (boto3를 import하지 않음 → boto3.compat이 끌어오는 s3transfer 등 import 비용 없음)"""
+    global _session
+    if _session is None:
+        from botocore.session import get_session
+        _session = get_session()
+    return _session
+
+
+def get_client(service_name):
+    """서비스별 low-level client (컨테이너 안에서 재사용 → 연결 풀 공유)"""
+    client = _clients.get(service_name)
+    if client is None:
+        client = _clients[service_name] = session().create_client(service_name, config=client_config())
+    return client
+
+
+for _service_name in PRELOAD_CLIENTS:
+    get_client(_service_name)
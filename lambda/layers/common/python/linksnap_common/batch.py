@@ -0,0 +1,48 @@
+"""
+DynamoDB 배치 API 헬퍼
+- batch_get_item: 100개 키 단위, UnprocessedKeys는 지수 백오프(+지터)로 max_attempts번까지 재요청
+- backoff_delay: 재시도 간격 (클릭 큐 전송 등 다른 재시도에도 사용)
+"""
+import random
+import time
+
+BATCH_GET_LIMIT = 100
+
+
+def backoff_delay(attempt, base=0.05, cap=2.0):
+    """full jitter 지수 백오프 (초)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class UnprocessedKeysError(Exception):
+    """재시도 후에도 batch_get_item이 처리하지 못한 키가 남음 (일부만 읽은 결과를 돌려주지 않음)"""
+
+
+def batch_get_keys(dynamodb, table_name, keys, projection=None, names=None, max_attempts=6, sleep=time.sleep):
+    """키 목록 일괄 조회, 존재하는 아이템 목록 반환 (names: projection의 #이름 → 속성 이름)
+    - UnprocessedKeys가 max_attempts번 뒤에도 남으면 UnprocessedKeysError
+    """
+    items = []
+
+    for i in range(0, len(keys), BATCH_GET_LIMIT):
+        request = {'Keys': keys[i:i + BATCH_GET_LIMIT]}
+        if projection:
+            request['ProjectionExpression'] = projection
+        if names:
+            request['ExpressionAttributeNames'] = names
+        request_items = {table_name: request}
+
+        for attempt in range(max_attempts):
+            if attempt:
+                sleep(backoff_delay(attempt))
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request_items = response.get('UnprocessedKeys') or None
+            if not request_items:
+                break
+
+        if request_items:
+            remaining = len(request_items[table_name]['Keys'])
+            raise UnprocessedKeysError(f"batch_get_item 미처리 키 {remaining}건 ({table_name}, 시도 {max_attempts}번)")
+
+    return items
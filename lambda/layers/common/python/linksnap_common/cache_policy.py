@@ -0,0 +1,72 @@
+"""
+링크별 리다이렉트 캐시 정책
+- urls 아이템 속성: redirectStatus (301/302/308), cacheMaxAge (초)
+- 301/308 + cacheMaxAge > 0: CDN/브라우저 캐시 허용, max-age는 expiresAt까지 남은 시간을 넘지 않음
+- 302: 항상 no-cache (클릭마다 origin 도달 → 클릭 단위 분석 보장)
+- 속성이 없는 기존 링크는 301 + no-cache (이전 동작 그대로)
+"""
+from datetime import datetime
+
+REDIRECT_STATUSES = (301, 302, 308)
+CACHEABLE_STATUSES = (301, 308)
+LEGACY_POLICY = {'redirectStatus': 301, 'cacheMaxAge': 0}
+NO_CACHE = 'no-cache'
+
+
+class InvalidCachePolicy(ValueError):
+    pass
+
+
+def build_cache_policy(redirect_status=None, cache_max_age=None,
+                       default_status=301, default_max_age=0, max_age_limit=31536000):
+    """생성 요청 값 → urls 아이템에 저장할 정책 속성 (값이 잘못되면 InvalidCachePolicy)"""
+    status = default_status if redirect_status is None else redirect_status
+    if isinstance(status, bool) or status not in REDIRECT_STATUSES:
+        raise InvalidCachePolicy('redirectStatus must be one of 301, 302, 308')
+
+    if status not in CACHEABLE_STATUSES:
+        if cache_max_age:
+            raise InvalidCachePolicy('cacheMaxAge is not allowed with redirectStatus 302')
+        return {'redirectStatus': status, 'cacheMaxAge': 0}
+
+    max_age = default_max_age if cache_max_age is None else cache_max_age
+    if isinstance(max_age, bool) or not isinstance(max_age, int) or max_age < 0:
+        raise InvalidCachePolicy('cacheMaxAge must be a non-negative integer (seconds)')
+    return {'redirectStatus': status, 'cacheMaxAge': min(max_age, max_age_limit)}
+
+
+def policy_of(item):
+    """urls 아이템(또는 캐시된 조회 결과)의 정책, 속성이 없으면 기존 동작"""
+    return {
+        'redirectStatus': int(item.get('redirectStatus', LEGACY_POLICY['redirectStatus'])),
+        'cacheMaxAge': int(item.get('cacheMaxAge', LEGACY_POLICY['cacheMaxAge']))
+    }
+
+
+def effective_max_age(cache_max_age, expires_at, now=None):
+    """expiresAt 이후까지 캐시되지 않도록 남은 시간으로 상한"""
+    if cache_max_age <= 0:
+        return 0
+    if not expires_at:
+        return cache_max_age
+    remaining = datetime.fromisoformat(expires_at) - (now or datetime.utcnow())
+    return max(0, min(cache_max_age, int(remaining.total_seconds())))
+
+
+def redirect_headers(item, location, now=None, shared_only=False):
+    """리다이렉트 응답 (statusCode, headers)
+    - shared_only: 브라우저는 매번 CDN에 다시 묻고(max-age=0) CDN만 캐시 → 엣지 로그로 클릭 집계할 때 사용
+    """
+    policy = policy_of(item)
+    status = policy['redirectStatus']
+    max_age = effective_max_age(policy['cacheMaxAge'], item.get('expiresAt'), now) \
+        if status in CACHEABLE_STATUSES else 0
+
+    if max_age <= 0:
+        cache_control = NO_CACHE
+    elif shared_only:
+        cache_control = f"public, max-age=0, s-maxage={max_age}"
+    else:
+        cache_control = f"public, max-age={max_age}"
+
+    return status, {'Location': location, 'Cache-Control': cache_control}
@@ -0,0 +1,104 @@
+"""
+클릭 분류 (디바이스 타입, OS, 인앱 브라우저, 봇, 유입 도메인)
+통계 집계/롤업 기록/클릭 기록(compact 스키마) 시 공통으로 사용
+
+- User-Agent 종류는 클릭 수보다 훨씬 적음 → 원문별 결과를 크기 제한 LRU(UA_CLASSIFY_CACHE_SIZE)로 memo
+- 분류마다 미리 컴파일한 정규식 하나 (키워드 alternation, 대소문자 무시) → 소문자 변환 + 키워드별 substring 검사 대신 1회 탐색
+- device: mobile / tablet / desktop (기존 값), 봇·링크 미리보기·모니터링 요청은 bot
+"""
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import urlparse
+
+UA_CLASSIFY_CACHE_SIZE = int(os.environ.get('UA_CLASSIFY_CACHE_SIZE', '4096'))
+REFERER_CACHE_SIZE = int(os.environ.get('REFERER_CACHE_SIZE', '4096'))
+
+# 링크 미리보기 크롤러, 검색 봇, 모니터링/헬스 체크, HTTP 라이브러리
+BOT_PATTERN = re.compile(
+    r'(?<!cu)bot\b|bot/|crawl|spider|slurp|facebookexternalhit|facebookcatalog|embedly|skypeuripreview'
+    r'|whatsapp/|preview|bitlybot|outbrain|pinterest/0|vkshare|w3c_validator|headless|lighthouse'
+    r'|uptime|pingdom|statuscake|site24x7|newrelicpinger|monitor|curl/|wget/|python-requests|python-urllib'
+    r'|aiohttp|go-http-client|okhttp/|java/|libwww|httpclient|axios/|node-fetch|postmanruntime'
+    r'|proofpoint|barracuda|mimecast|safelinks|scanner',
+    re.IGNORECASE
+)
+# 앱 내장 브라우저 (그룹 이름 = 앱)
+IN_APP_PATTERN = re.compile(
+    r'(?P<kakaotalk>kakaotalk)|(?P<naver>naver\(inapp)|(?P<line>\bline/)|(?P<instagram>instagram)'
+    r'|(?P<facebook>fban|fbav|fb_iab)|(?P<wechat>micromessenger)|(?P<tiktok>musical_ly|bytedancewebview|trill_)'
+    r'|(?P<snapchat>snapchat)|(?P<linkedin>linkedinapp)|(?P<twitter>twitter(?:android|iphone)?/)'
+    r'|(?P<daum>daumapps)|(?P<band>band/)',
+    re.IGNORECASE
+)
+TABLET_PATTERN = re.compile(r'ipad|tablet|kindle|silk/|playbook|sm-t\d', re.IGNORECASE)
+MOBILE_PATTERN = re.compile(r'mobile|android|iphone|ipod|windows phone|blackberry|opera mini', re.IGNORECASE)
+# 순서가 의미 있음 (Android UA에 Linux, iOS UA에 Mac OS X가 함께 들어 있음)
+OS_PATTERNS = (
+    ('ios', re.compile(r'iphone|ipad|ipod|cpu os \d|\bios\b', re.IGNORECASE)),
+    ('android', re.compile(r'android', re.IGNORECASE)),
+    ('windows', re.compile(r'windows', re.IGNORECASE)),
+    ('chromeos', re.compile(r'\bcros\b', re.IGNORECASE)),
+    ('macos', re.compile(r'mac os x|macintosh', re.IGNORECASE)),
+    ('linux', re.compile(r'linux|x11', re.IGNORECASE))
+)
+
+UserAgentClass = namedtuple('UserAgentClass', ['device', 'os', 'in_app', 'is_bot'])
+
+
+@lru_cache(maxsize=UA_CLASSIFY_CACHE_SIZE)
+def classify_user_agent(user_agent):
+    """User-Agent 원문 → UserAgentClass(device, os, in_app(앱 이름 또는 None), is_bot)"""
+    user_agent = user_agent or ''
+    os_name = next((name for name, pattern in OS_PATTERNS if pattern.search(user_agent)), 'other')
+
+    if BOT_PATTERN.search(user_agent):
+        return UserAgentClass('bot', os_name, None, True)
+
+    in_app = IN_APP_PATTERN.search(user_agent)
+    in_app = in_app.lastgroup if in_app else None
+
+    # 기존 분류와 같은 우선순위: mobile 키워드가 tablet 키워드보다 먼저 (iPad Safari UA의 'Mobile/...'도 mobile)
+    if MOBILE_PATTERN.search(user_agent):
+        device = 'mobile'
+    elif TABLET_PATTERN.search(user_agent):
+        device = 'tablet'
+    else:
+        device = 'desktop'
+    return UserAgentClass(device, os_name, in_app, False)
+
+
+def parse_user_agent(user_agent):
+    """User-Agent에서 디바이스 타입 추출 (mobile / tablet / desktop / bot)"""
+    return classify_user_agent(user_agent).device
+
+
+def is_bot(user_agent):
+    return classify_user_agent(user_agent).is_bot
+
+
+@lru_cache(maxsize=REFERER_CACHE_SIZE)
+def referer_domain(referer):
+    """referer URL에서 도메인 추출 (없거나 파싱 불가면 'direct')"""
+    if not referer or referer == 'direct':
+        return 'direct'
+    try:
+        return urlparse(referer).netloc or 'direct'
+    except ValueError:
+        return 'direct'
+
+
+def cache_stats():
+    """memo 적중률 확인용 {'userAgent': {...}, 'referer': {...}}"""
+    def info(function):
+        stats = function.cache_info()
+        lookups = stats.hits + stats.misses
+        return {
+            'hits': stats.hits,
+            'misses': stats.misses,
+            'size': stats.currsize,
+            'hitRate': round(stats.hits / lookups, 4) if lookups else 0.0
+        }
+
+    return {'userAgent': info(classify_user_agent), 'referer': info(referer_domain)}
@@ -0,0 +1,166 @@
+"""
+클릭 로그 테이블 (clicks) 레이아웃
+- PK: urlId / SK: clickKey = {ISO timestamp}#{고유 ID}
+  → URL별 Query + 기간(SK 범위) 조건으로 필요한 클릭만 읽음
+- ttl: epoch 초, 만료된 원시 클릭은 DynamoDB TTL로 자동 삭제
+
+아이템 형식 (CLICK_SCHEMA, 읽을 때는 v 속성으로 구분 → 두 형식이 섞여 있어도 read_click 하나로 처리)
+  full (v 없음)  timestamp(ISO), userAgent/referer 원문, country, ip
+  compact (v=2)  ts(epoch 초), dev(디바이스 분류), os, app(인앱 브라우저, 있을 때만), ref(referer 도메인), cty,
+                 iph(IP 해시, CLICK_IP_MODE=drop이면 없음)
+                 → 분류는 기록 시점에 한 번, 통계 조회는 분류 결과만 읽음 (아이템 크기/읽기 용량 감소)
+"""
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+
+from linksnap_common.classify import classify_user_agent, parse_user_agent, referer_domain
+
+CLICK_TTL_DAYS = int(os.environ.get('CLICK_TTL_DAYS', '90'))
+# full: 원문 그대로 (기존 형식) / compact: 기록 시점 분류 + 짧은 속성 이름
+CLICK_SCHEMA = os.environ.get('CLICK_SCHEMA', 'full')
+# compact 형식의 IP 처리 - hash: salt를 붙인 sha256 앞 16자리 (고유 방문자 추정용) / drop: 저장 안 함
+CLICK_IP_MODE = os.environ.get('CLICK_IP_MODE', 'hash')
+CLICK_IP_SALT = os.environ.get('CLICK_IP_SALT', '')
+
+COMPACT_VERSION = 2
+
+# read_click이 쓰는 필드 → (full 속성, compact 속성)
+READ_FIELDS = {
+    'timestamp': ('timestamp', 'ts'),
+    'device': ('userAgent', 'dev'),
+    'referer': ('referer', 'ref'),
+    'country': ('country', 'cty')
+}
+
+
+def click_key(timestamp, unique_id):
+    """정렬 키 (ISO 문자열이라 사전순 = 시간순)"""
+    return f"{timestamp.isoformat()}#{unique_id}"
+
+
+def click_ttl(timestamp, ttl_days=None):
+    """TTL 만료 시각 (epoch 초)"""
+    ttl_days = CLICK_TTL_DAYS if ttl_days is None else ttl_days
+    return int((timestamp + timedelta(days=ttl_days)).timestamp())
+
+
+def hash_ip(ip, salt=None):
+    salt = CLICK_IP_SALT if salt is None else salt
+    return hashlib.sha256(f"{salt}{ip}".encode()).hexdigest()[:16]
+
+
+def compact_unique_id(unique_id):
+    """UUID/messageId(36자) → 12자 (같은 입력이면 같은 값이라 SQS 재처리 시 중복 없음)"""
+    return hashlib.sha1(str(unique_id).encode()).hexdigest()[:12]
+
+
+def build_click_item(url_id, timestamp, unique_id, user_agent, referer, country, ip, schema=None):
+    """clicks 테이블 아이템 생성 (timestamp는 UTC naive datetime, schema 기본값은 CLICK_SCHEMA)"""
+    if (schema or CLICK_SCHEMA) == 'compact':
+        return build_compact_click_item(url_id, timestamp, unique_id, user_agent, referer, country, ip)
+
+    return {
+        'urlId': url_id,
+        'clickKey': click_key(timestamp, unique_id),
+        'timestamp': timestamp.isoformat(),
+        'userAgent': user_agent,
+        'referer': referer,
+        'country': country,
+        'ip': ip,
+        'ttl': click_ttl(timestamp)
+    }
+
+
+def build_compact_click_item(url_id, timestamp, unique_id, user_agent, referer, country, ip):
+    """compact 형식 (clickKey는 ISO 접두어 유지 → 기간 Query/필터 조건은 두 형식 공통)"""
+    ua_class = classify_user_agent(user_agent)
+    item = {
+        'urlId': url_id,
+        'clickKey': click_key(timestamp, compact_unique_id(unique_id)),
+        'v': COMPACT_VERSION,
+        'ts': int(timestamp.replace(tzinfo=timezone.utc).timestamp()),
+        'dev': ua_class.device,
+        'os': ua_class.os,
+        'ref': referer_domain(referer),
+        'cty': country or 'unknown',
+        'ttl': click_ttl(timestamp)
+    }
+    if ua_class.in_app:
+        item['app'] = ua_class.in_app
+    if CLICK_IP_MODE == 'hash' and ip and ip != 'unknown':
+        item['iph'] = hash_ip(ip)
+    return item
+
+
+def click_projection(*fields):
+    """read_click에 필요한 속성만 읽는 Query/Scan 인자 (두 형식의 속성 + 버전)
+    click_projection('timestamp') → {'ProjectionExpression': '#v, #a0, #a1', 'ExpressionAttributeNames': {...}}
+    (timestamp 등 예약어가 있어 모든 이름을 placeholder로)
+    """
+    names = {'#v': 'v'}
+    for field in fields or READ_FIELDS:
+        for attribute in READ_FIELDS[field]:
+            names[f"#a{len(names) - 1}"] = attribute
+    return {'ProjectionExpression': ', '.join(names), 'ExpressionAttributeNames': names}
+
+
+def read_click(item):
+    """버전별 아이템 → {'timestamp': UTC naive datetime 또는 None, 'device', 'referer'(도메인), 'country'}
+    프로젝션으로 일부 속성만 읽었으면 없는 필드는 기본값
+    """
+    if int(item.get('v', 1)) >= COMPACT_VERSION:
+        ts = item.get('ts')
+        return {
+            'timestamp': datetime.utcfromtimestamp(int(ts)) if ts is not None else None,
+            'device': item.get('dev', 'desktop'),
+            'referer': item.get('ref', 'direct'),
+            'country': item.get('cty', 'unknown')
+        }
+
+    try:
+        timestamp = datetime.fromisoformat(item.get('timestamp', ''))
+    except (ValueError, TypeError):
+        timestamp = None
+    return {
+        'timestamp': timestamp,
+        'device': parse_user_agent(item.get('userAgent', 'unknown')),
+        'referer': referer_domain(item.get('referer', 'direct')),
+        'country': item.get('country', 'unknown')
+    }
+
+
+def iter_url_clicks(table, url_id, since=None, until=None, **query_kwargs):
+    """URL 하나의 클릭을 페이지 단위로 Query (since/until: datetime, SK 범위 조건)"""
+    key_condition = 'urlId = :url'
+    values = {':url': url_id}
+
+    if since is not None and until is not None:
+        key_condition += ' AND clickKey BETWEEN :since AND :until'
+        values[':since'] = since.isoformat()
+        values[':until'] = until.isoformat()
+    elif since is not None:
+        key_condition += ' AND clickKey >= :since'
+        values[':since'] = since.isoformat()
+    elif until is not None:
+        key_condition += ' AND clickKey < :until'
+        values[':until'] = until.isoformat()
+
+    kwargs = dict(
+        KeyConditionExpression=key_condition,
+        ExpressionAttributeValues=values,
+        **query_kwargs
+    )
+
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def window_start(days, now=None):
+    """최근 N일 조회 시작 시각 (오늘 포함 N일, 자정 기준)"""
+    now = now or datetime.utcnow()
+    return datetime(now.year, now.month, now.day) - timedelta(days=days - 1)
@@ -0,0 +1,224 @@
+"""
+클릭 통계 컬럼 집계 (NumPy)
+- 클릭 아이템을 페이지(chunk) 단위로 열 배열에 적재: 시각은 epoch 초(int64), 디바이스/유입/국가는 범주 코드(int32)
+- 문자열 분류(parse_user_agent, referer_domain)는 행마다가 아니라 서로 다른 원문마다 한 번
+  (실제 트래픽의 User-Agent/referer 종류는 클릭 수보다 훨씬 적음)
+- ISO 시각 문자열은 chunk 단위로 datetime64 변환, 히스토그램은 bincount/unique로 한 번에 계산
+- full/compact 클릭 형식 모두 (linksnap_common.clicks.read_click과 같은 결과)
+- NumPy가 없으면 AVAILABLE=False → 호출 측은 행 단위 집계(get_url_stats.calculate_stats) 사용
+"""
+from datetime import datetime
+from itertools import islice
+
+from linksnap_common.classify import parse_user_agent, referer_domain
+from linksnap_common.clicks import COMPACT_VERSION
+
+try:
+    import numpy as np
+    AVAILABLE = True
+except ImportError:
+    np = None
+    AVAILABLE = False
+
+# 시각 없음/파싱 불가 (datetime64 NaT와 같은 값)
+MISSING = -(2 ** 63)
+SECONDS_PER_DAY = 86400
+
+
+class Categories:
+    """범주 원문 → 코드 (들어온 순서대로 0, 1, 2...), 코드별 분류 결과는 resolve(kind, value)로 한 번만 계산
+    kind: 원문 종류 (예: 'ua' = User-Agent 원문, 'dev' = 이미 분류된 디바이스), 종류마다 따로 조회
+    """
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+        self._codes = {}
+        self.keys = []
+
+    def coder(self, kind):
+        """value → 코드 함수 (행마다 부르므로 종류별 dict를 클로저에 묶어 둠)"""
+        codes = self._codes.setdefault(kind, {})
+        keys = self.keys
+
+        def code(value):
+            found = codes.get(value)
+            if found is None:
+                found = codes[value] = len(keys)
+                keys.append((kind, value))
+            return found
+
+        return code
+
+    def labels(self):
+        return [self._resolve(*key) for key in self.keys]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _resolve_device(kind, value):
+    return value if kind == 'dev' else parse_user_agent(value)
+
+
+def _resolve_referer(kind, value):
+    return value if kind == 'ref' else referer_domain(value)
+
+
+def _resolve_country(kind, value):
+    return value
+
+
+def parse_iso_seconds(values):
+    """ISO 시각 문자열 목록 → epoch 초 배열 (한 번에 변환, 형식이 어긋난 값이 있으면 그 chunk만 한 건씩)"""
+    try:
+        parsed = np.array(values, dtype='datetime64[us]')
+    except ValueError:
+        parsed = np.array([_parse_one(value) for value in values], dtype='datetime64[us]')
+
+    seconds = np.full(len(values), MISSING, dtype=np.int64)
+    valid = ~np.isnat(parsed)
+    seconds[valid] = parsed[valid].astype(np.int64) // 1_000_000
+    return seconds
+
+
+def _parse_one(value):
+    try:
+        return np.datetime64(datetime.fromisoformat(value), 'us')
+    except (ValueError, TypeError):
+        return np.datetime64('NaT', 'us')
+
+
+def _bincount_labels(codes, categories):
+    """코드 배열 → {분류 결과: 건수} (원문이 달라도 분류가 같으면 합침, 처음 나온 순서)"""
+    counts = np.bincount(codes, minlength=len(categories)) if len(codes) else np.zeros(len(categories), np.int64)
+    distribution = {}
+    for label, count in zip(categories.labels(), counts.tolist()):
+        if count:
+            distribution[label] = distribution.get(label, 0) + count
+    return distribution
+
+
+class ClickColumns:
+    """클릭 아이템 → 열 배열 (extend를 여러 번 불러 페이지 단위로 적재 가능)"""
+
+    def __init__(self, chunk_size=8192):
+        if not AVAILABLE:
+            raise RuntimeError('numpy가 설치되어 있지 않음 (linksnap_common.columnar)')
+        self.chunk_size = chunk_size
+        self.devices = Categories(_resolve_device)
+        self.referers = Categories(_resolve_referer)
+        self.countries = Categories(_resolve_country)
+        self._chunks = []
+        self._columns = None
+
+    @classmethod
+    def from_items(cls, items, chunk_size=8192):
+        columns = cls(chunk_size)
+        columns.extend(items)
+        return columns
+
+    def extend(self, items):
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, self.chunk_size))
+            if not chunk:
+                break
+            self._chunks.append(self._load(chunk))
+        self._columns = None
+        return self
+
+    def _load(self, items):
+        """chunk 하나 → (시각, 디바이스, 유입, 국가) 배열, 행마다는 속성 꺼내기 + 범주 코드 조회만"""
+        timestamps = [MISSING] * len(items)
+        iso_rows = []
+        iso_values = []
+        devices = []
+        referers = []
+        countries = []
+        device_class, user_agent = self.devices.coder('dev'), self.devices.coder('ua')
+        referer_domain_code, referer_url = self.referers.coder('ref'), self.referers.coder('url')
+        country_code = self.countries.coder('cty')
+
+        for row, item in enumerate(items):
+            if int(item.get('v', 1)) >= COMPACT_VERSION:
+                ts = item.get('ts')
+                if ts is not None:
+                    timestamps[row] = int(ts)
+                devices.append(device_class(item.get('dev', 'desktop')))
+                referers.append(referer_domain_code(item.get('ref', 'direct')))
+                countries.append(country_code(item.get('cty', 'unknown')))
+            else:
+                iso_rows.append(row)
+                iso_values.append(item.get('timestamp', ''))
+                devices.append(user_agent(item.get('userAgent', 'unknown')))
+                referers.append(referer_url(item.get('referer', 'direct')))
+                countries.append(country_code(item.get('country', 'unknown')))
+
+        timestamps = np.array(timestamps, dtype=np.int64)
+        if iso_rows:
+            timestamps[iso_rows] = parse_iso_seconds(iso_values)
+        return (
+            timestamps,
+            np.array(devices, dtype=np.int32),
+            np.array(referers, dtype=np.int32),
+            np.array(countries, dtype=np.int32)
+        )
+
+    def columns(self):
+        """(시각, 디바이스, 유입, 국가) 전체 배열 (chunk들을 한 번만 이어붙임)"""
+        if self._columns is None:
+            if self._chunks:
+                self._columns = tuple(np.concatenate(parts) for parts in zip(*self._chunks))
+                self._chunks = [self._columns]
+            else:
+                empty = np.zeros(0, dtype=np.int64)
+                self._columns = (empty, empty.astype(np.int32), empty.astype(np.int32), empty.astype(np.int32))
+        return self._columns
+
+    def __len__(self):
+        return sum(len(chunk[0]) for chunk in self._chunks)
+
+    def distribution(self, name):
+        """'device' / 'referer' / 'country' 분포"""
+        _, devices, referers, countries = self.columns()
+        codes, categories = {
+            'device': (devices, self.devices),
+            'referer': (referers, self.referers),
+            'country': (countries, self.countries)
+        }[name]
+        return _bincount_labels(codes, categories)
+
+    def to_stats(self, now=None, days=None):
+        """get_url_stats.calculate_stats와 같은 형태의 통계 (dailyClicks는 최근 days일, None이면 전부)"""
+        timestamps = self.columns()[0]
+        timestamps = timestamps[timestamps != MISSING]
+
+        now = now or datetime.utcnow()
+        today = (now - datetime(1970, 1, 1)).days
+
+        day_numbers = timestamps // SECONDS_PER_DAY
+        hours = (timestamps % SECONDS_PER_DAY) // 3600
+        hourly = np.bincount(hours, minlength=24) if len(hours) else np.zeros(24, np.int64)
+        day_values, day_counts = np.unique(day_numbers, return_counts=True)
+        day_totals = dict(zip(day_values.tolist(), day_counts.tolist()))
+
+        # 최근 날짜부터 days일
+        daily = [
+            {'date': str(np.datetime64(day, 'D')), 'clicks': clicks}
+            for day, clicks in zip(day_values[::-1][:days].tolist(), day_counts[::-1][:days].tolist())
+        ]
+
+        return {
+            'totalClicks': len(self),
+            'todayClicks': day_totals.get(today, 0),
+            'yesterdayClicks': day_totals.get(today - 1, 0),
+            'hourlyClicks': [{'hour': h, 'clicks': int(hourly[h])} for h in range(24)],
+            'dailyClicks': daily,
+            'deviceDistribution': self.distribution('device'),
+            'refererDistribution': self.distribution('referer')
+        }
+
+
+def calculate_stats(click_items, now=None, chunk_size=8192, days=None):
+    """클릭 iterable → 통계 (컬럼 적재 후 한 번에 집계)"""
+    return ClickColumns.from_items(click_items, chunk_size).to_stats(now, days)
@@ -0,0 +1,116 @@
+"""
+샤딩된 클릭 카운터
+- URL 하나의 클릭 증가를 N개 샤드 아이템(counterId = clicks#{urlId}#{shard})에 분산
+  → 인기 링크 하나가 단일 파티션 키에 몰려 스로틀링되는 문제 방지
+- flush_interval > 0 이면 컨테이너 메모리에서 합산 후 주기적으로 기록 (write-behind, 손실 허용 모드)
+  → flush는 increment/flush 호출 때만 일어나므로 마지막 구간과 실패해 이월된 증가분은 컨테이너 회수 시 유실
+  → 호출(배치)마다 flush()를 부르는 경로에서만 사용, 리다이렉트는 항상 즉시 기록
+- 읽기: 샤드 합계 + urls.clickCount(샤딩 이전 누적값)
+"""
+import random
+import time
+from collections import defaultdict
+
+from linksnap_common.aggregate import parallel_scan
+from linksnap_common.batch import batch_get_keys
+
+CLICK_COUNTER_PREFIX = 'clicks#'
+
+
+def shard_counter_id(url_id, shard):
+    return f"{CLICK_COUNTER_PREFIX}{url_id}#{shard}"
+
+
+class ShardedCounter:
+    """샤드 분산 + 선택적 write-behind 합산 카운터"""
+
+    def __init__(self, dynamodb, table_name, shard_count=10, flush_interval=0,
+                 max_pending=1000, clock=time.monotonic):
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.table = dynamodb.Table(table_name)
+        self.shard_count = max(1, shard_count)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._clock = clock
+        self._pending = defaultdict(int)
+        self._last_flush = clock()
+
+    def increment(self, url_id, amount=1):
+        """클릭 증가 (write-behind 모드면 메모리에 누적 후 조건 충족 시 flush)"""
+        if self.flush_interval <= 0:
+            self._write(url_id, amount)
+            return
+
+        self._pending[url_id] += amount
+        if (len(self._pending) >= self.max_pending
+                or self._clock() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """누적된 증가분을 샤드에 기록 (실패한 URL은 다음 flush로 이월, 다음 flush 전에 컨테이너가 회수되면 유실)"""
+        pending, self._pending = self._pending, defaultdict(int)
+        self._last_flush = self._clock()
+
+        for url_id, amount in pending.items():
+            try:
+                self._write(url_id, amount)
+            except Exception as e:
+                print(f"[WARN] 클릭 카운터 flush 실패 (urlId={url_id}): {e}")
+                self._pending[url_id] += amount
+
+    def _write(self, url_id, amount):
+        shard = random.randrange(self.shard_count)
+        self.table.update_item(
+            Key={'counterId': shard_counter_id(url_id, shard)},
+            UpdateExpression='SET urlId = :url ADD #count :inc',
+            ExpressionAttributeNames={'#count': 'count'},
+            ExpressionAttributeValues={':url': url_id, ':inc': amount}
+        )
+
+    def read(self, url_id):
+        """URL 하나의 샤드 합계"""
+        return self.read_many([url_id]).get(url_id, 0)
+
+    def read_many(self, url_ids):
+        """여러 URL의 샤드 합계 (batch_get_keys, 100개 키 단위 + 미처리 키 백오프 재시도)"""
+        keys = [
+            {'counterId': shard_counter_id(url_id, shard)}
+            for url_id in url_ids
+            for shard in range(self.shard_count)
+        ]
+        totals = defaultdict(int)
+
+        items = batch_get_keys(self.dynamodb, self.table_name, keys, projection='urlId, #count', names={'#count': 'count'})
+        for item in items:
+            totals[item['urlId']] += int(item.get('count', 0))
+
+        return dict(totals)
+
+    def read_all(self, segments=1):
+        """전체 URL의 샤드 합계 (counters 테이블 스캔, 사이트 통계용, segments > 1이면 병렬 스캔 후 병합)"""
+        def fold(items):
+            partial = defaultdict(int)
+            for item in items:
+                partial[item['urlId']] += int(item.get('count', 0))
+            return partial
+
+        totals = defaultdict(int)
+        for partial in parallel_scan(
+            self.table,
+            fold,
+            segments=segments,
+            FilterExpression='begins_with(counterId, :prefix)',
+            ExpressionAttributeValues={':prefix': CLICK_COUNTER_PREFIX},
+            ProjectionExpression='urlId, #count',
+            ExpressionAttributeNames={'#count': 'count'}
+        ):
+            for url_id, count in partial.items():
+                totals[url_id] += count
+
+        return dict(totals)
+
+
+def total_click_count(url_item, shard_totals):
+    """urls.clickCount(샤딩 이전 누적값) + 샤드 합계"""
+    return int(url_item.get('clickCount', 0)) + shard_totals.get(url_item.get('urlId'), 0)
@@ -0,0 +1,152 @@
+"""
+URL 생성 중복 제거 / 멱등성 테이블 (dedup)
+- PK: dedupKey
+  url#{sha256(정규화 URL)}  → 살아있는 단축 링크 (만료되면 TTL로 삭제, 그 전이라도 expiresAt 지나면 무시)
+  idem#{Idempotency-Key}     → 첫 요청의 응답 (pending → complete, 기본 24시간 보관)
+- 정규화: scheme/host 소문자, 기본 포트·fragment 제거, 빈 경로는 '/', 쿼리 파라미터 정렬
+"""
+import hashlib
+import json
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from linksnap_common.batch import batch_get_keys
+from linksnap_common.expiry import to_epoch
+
+URL_KEY_PREFIX = 'url#'
+IDEMPOTENCY_KEY_PREFIX = 'idem#'
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+LINK_FIELDS = ('urlId', 'shortUrl', 'originalUrl', 'createdAt', 'expiresAt', 'redirectStatus', 'cacheMaxAge')
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+        host = f"{userinfo}@{host}"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def url_dedup_key(url):
+    return URL_KEY_PREFIX + hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+def request_fingerprint(payload):
+    """같은 Idempotency-Key로 다른 요청을 보냈는지 확인용 해시"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _is_conditional_failure(error):
+    return getattr(error, 'response', {}).get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+class IdempotencyConflict(Exception):
+    """같은 키의 요청이 처리 중이거나, 다른 내용으로 재사용된 경우"""
+
+
+class DedupIndex:
+    def __init__(self, table, idempotency_ttl=86400, pending_timeout=60, clock=time.time):
+        self.table = table
+        self.idempotency_ttl = idempotency_ttl
+        self.pending_timeout = pending_timeout
+        self._clock = clock
+
+    # --- 정규화 URL → 살아있는 링크 ---
+
+    def find_live(self, original_url, now=None):
+        """정규화 URL이 같은 살아있는 링크 정보 (없거나 만료됐으면 None)"""
+        item = self.table.get_item(Key={'dedupKey': url_dedup_key(original_url)}).get('Item')
+        return self._live(item, now)
+
+    def find_live_many(self, dynamodb, original_urls, now=None):
+        """여러 URL 한 번에 조회 → {dedupKey: 링크 정보}"""
+        keys = list({url_dedup_key(url) for url in original_urls})
+        items = batch_get_keys(dynamodb, self.table.name, [{'dedupKey': key} for key in keys])
+        return {item['dedupKey']: link for item in items if (link := self._live(item, now))}
+
+    def _live(self, item, now=None):
+        if not item:
+            return None
+        now_iso = (now or datetime.utcnow()).isoformat()
+        if item.get('expiresAt') and item['expiresAt'] <= now_iso:
+            return None
+        return {field: item[field] for field in LINK_FIELDS if field in item}
+
+    def link_item(self, url_item):
+        return {
+            'dedupKey': url_dedup_key(url_item['originalUrl']),
+            **{field: url_item[field] for field in LINK_FIELDS if field in url_item},
+            'ttl': to_epoch(url_item['expiresAt'])
+        }
+
+    def claim(self, url_item, now=None):
+        """새 링크를 정규화 URL의 대표로 등록
+        - 다른 살아있는 링크가 먼저 등록돼 있으면 그 링크 정보를 반환 (동시 생성 경합), 등록 성공 시 None
+        """
+        now_iso = (now or datetime.utcnow()).isoformat()
+        try:
+            self.table.put_item(
+                Item=self.link_item(url_item),
+                ConditionExpression='attribute_not_exists(dedupKey) OR expiresAt <= :now',
+                ExpressionAttributeValues={':now': now_iso}
+            )
+            return None
+        except Exception as e:
+            if not _is_conditional_failure(e):
+                raise
+        return self.find_live(url_item['originalUrl'], now)
+
+    # --- Idempotency-Key ---
+
+    def _idem_key(self, key):
+        return {'dedupKey': IDEMPOTENCY_KEY_PREFIX + key}
+
+    def begin(self, key, fingerprint):
+        """요청 시작: 처음이면 None, 완료된 요청이면 저장된 응답 반환, 처리 중/내용 불일치면 IdempotencyConflict
+        - TTL이 지났지만 아직 삭제되지 않은 기록, pending_timeout 넘게 pending인 기록(처리 중 종료)은 새로 차지
+        """
+        now = int(self._clock())
+        try:
+            self.table.put_item(
+                Item={
+                    **self._idem_key(key),
+                    'state': 'pending',
+                    'fingerprint': fingerprint,
+                    'lockedUntil': now + self.pending_timeout,
+                    'ttl': now + self.idempotency_ttl
+                },
+                ConditionExpression='attribute_not_exists(dedupKey) OR #ttl < :now '
+                                    'OR (#state = :pending AND lockedUntil < :now)',
+                ExpressionAttributeNames={'#ttl': 'ttl', '#state': 'state'},
+                ExpressionAttributeValues={':now': now, ':pending': 'pending'}
+            )
+            return None
+        except Exception as e:
+            if not _is_conditional_failure(e):
+                raise
+
+        record = self.table.get_item(Key=self._idem_key(key), ConsistentRead=True).get('Item') or {}
+        if record.get('fingerprint') != fingerprint:
+            raise IdempotencyConflict('Idempotency-Key was used with a different request')
+        if record.get('state') != 'complete':
+            raise IdempotencyConflict('request with this Idempotency-Key is in progress')
+        return {'statusCode': int(record['statusCode']), 'body': record['body']}
+
+    def complete(self, key, status_code, body):
+        self.table.update_item(
+            Key=self._idem_key(key),
+            UpdateExpression='SET #state = :complete, statusCode = :status, #body = :body',
+            ExpressionAttributeNames={'#state': 'state', '#body': 'body'},
+            ExpressionAttributeValues={':complete': 'complete', ':status': status_code, ':body': body}
+        )
+
+    def abandon(self, key):
+        """처리 실패 시 pending 기록 삭제 → 같은 키로 재시도 가능"""
+        self.table.delete_item(Key=self._idem_key(key))
@@ -0,0 +1,212 @@
+"""
+경량 DynamoDB 접근 모듈 (cold start 단축)
+- boto3.resource 대신 botocore low-level client + 자체 타입 변환 → boto3 import, resource 모델 로딩/클래스 생성 비용 없음
+- 클라이언트는 linksnap_common.aws에서 처음 호출할 때 만들고 컨테이너 안에서 재사용 (import 시점 비용 없음)
+- Table / DynamoDB는 기존 코드가 쓰는 boto3 resource API 부분집합과 같은 모양
+  (get_item/put_item/update_item/delete_item/query/scan/batch_writer, batch_get_item/batch_write_item)
+  조건식은 문자열만 지원 (boto3.dynamodb.conditions 객체 미지원)
+- DYNAMODB_ACCESS=resource면 기존 boto3.resource 사용 (비교/롤백용)
+"""
+import os
+from decimal import Decimal
+
+from linksnap_common.aws import client_config, get_client, session
+
+DYNAMODB_ACCESS = os.environ.get('DYNAMODB_ACCESS', 'client')
+
+BATCH_WRITE_LIMIT = 25
+
+
+def serialize_value(value):
+    """파이썬 값 → DynamoDB AttributeValue (boto3 TypeSerializer와 같은 규칙, float은 Decimal로 넘겨야 함)"""
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, (int, Decimal)):
+        return {'N': str(value)}
+    if isinstance(value, float):
+        raise TypeError('Float types are not supported. Use Decimal types instead.')
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, (bytes, bytearray)):
+        return {'B': bytes(value)}
+    if isinstance(value, (set, frozenset)):
+        if all(isinstance(v, str) for v in value):
+            return {'SS': list(value)}
+        if all(isinstance(v, (bytes, bytearray)) for v in value):
+            return {'BS': [bytes(v) for v in value]}
+        return {'NS': [str(v) for v in value]}
+    if isinstance(value, (list, tuple)):
+        return {'L': [serialize_value(v) for v in value]}
+    if isinstance(value, dict):
+        return {'M': serialize(value)}
+    raise TypeError(f"Unsupported type \"{type(value)}\" for value \"{value}\"")
+
+
+def deserialize_value(attribute):
+    """AttributeValue → 파이썬 값 (숫자는 resource와 같이 Decimal)"""
+    (kind, value), = attribute.items()
+    if kind in ('S', 'B', 'BOOL'):
+        return value
+    if kind == 'N':
+        return Decimal(value)
+    if kind == 'NULL':
+        return None
+    if kind == 'M':
+        return deserialize(value)
+    if kind == 'L':
+        return [deserialize_value(v) for v in value]
+    if kind == 'NS':
+        return {Decimal(v) for v in value}
+    return set(value)
+
+
+def serialize(item):
+    return {key: serialize_value(value) for key, value in item.items()}
+
+
+def deserialize(item):
+    return {key: deserialize_value(value) for key, value in item.items()}
+
+
+_SERIALIZED_REQUEST_KEYS = ('Key', 'Item', 'ExclusiveStartKey', 'ExpressionAttributeValues')
+
+
+def _request(kwargs):
+    return {key: serialize(value) if key in _SERIALIZED_REQUEST_KEYS else value for key, value in kwargs.items()}
+
+
+def _response(response):
+    for key in ('Item', 'Attributes', 'LastEvaluatedKey'):
+        if key in response:
+            response[key] = deserialize(response[key])
+    if 'Items' in response:
+        response['Items'] = [deserialize(item) for item in response['Items']]
+    return response
+
+
+class Table:
+    """resource Table과 같은 호출 모양의 client 기반 테이블"""
+
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def client(self):
+        return get_client('dynamodb')
+
+    def _call(self, operation, kwargs):
+        return _response(getattr(self.client, operation)(TableName=self.name, **_request(kwargs)))
+
+    def get_item(self, **kwargs):
+        return self._call('get_item', kwargs)
+
+    def put_item(self, **kwargs):
+        return self._call('put_item', kwargs)
+
+    def update_item(self, **kwargs):
+        return self._call('update_item', kwargs)
+
+    def delete_item(self, **kwargs):
+        return self._call('delete_item', kwargs)
+
+    def query(self, **kwargs):
+        return self._call('query', kwargs)
+
+    def scan(self, **kwargs):
+        return self._call('scan', kwargs)
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return BatchWriter(self, overwrite_by_pkeys)
+
+
+class BatchWriter:
+    """25개 단위 batch_write_item, 미처리 항목은 다음 전송에 다시 포함 (resource batch_writer와 같은 동작)"""
+
+    def __init__(self, table, overwrite_by_pkeys=None):
+        self.table = table
+        self.overwrite_by_pkeys = overwrite_by_pkeys
+        self._requests = []
+
+    def put_item(self, Item):
+        self._add({'PutRequest': {'Item': Item}}, Item)
+
+    def delete_item(self, Key):
+        self._add({'DeleteRequest': {'Key': Key}}, Key)
+
+    def _add(self, request, item):
+        if self.overwrite_by_pkeys:
+            pkey = tuple(item.get(key) for key in self.overwrite_by_pkeys)
+            self._requests = [r for r in self._requests if self._pkey(r) != pkey]
+        self._requests.append(request)
+        if len(self._requests) >= BATCH_WRITE_LIMIT:
+            self._flush()
+
+    def _pkey(self, request):
+        item = request.get('PutRequest', {}).get('Item') or request['DeleteRequest']['Key']
+        return tuple(item.get(key) for key in self.overwrite_by_pkeys)
+
+    def _flush(self):
+        batch, self._requests = self._requests[:BATCH_WRITE_LIMIT], self._requests[BATCH_WRITE_LIMIT:]
+        response = DynamoDB().batch_write_item(RequestItems={self.table.name: batch})
+        self._requests.extend(response.get('UnprocessedItems', {}).get(self.table.name, []))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        while self._requests:
+            self._flush()
+
+
+def _write_request(request, convert):
+    if 'PutRequest' in request:
+        return {'PutRequest': {'Item': convert(request['PutRequest']['Item'])}}
+    return {'DeleteRequest': {'Key': convert(request['DeleteRequest']['Key'])}}
+
+
+def _keys_request(request, convert):
+    return {**request, 'Keys': [convert(key) for key in request['Keys']]}
+
+
+class DynamoDB:
+    """resource('dynamodb') 대체: Table 생성 + 배치 API (요청/응답 모두 파이썬 값)"""
+
+    def Table(self, name):
+        return Table(name)
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        response = get_client('dynamodb').batch_get_item(
+            RequestItems={name: _keys_request(request, serialize) for name, request in RequestItems.items()},
+            **kwargs
+        )
+        response['Responses'] = {
+            name: [deserialize(item) for item in items] for name, items in response.get('Responses', {}).items()
+        }
+        response['UnprocessedKeys'] = {
+            name: _keys_request(request, deserialize) for name, request in response.get('UnprocessedKeys', {}).items()
+        }
+        return response
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        response = get_client('dynamodb').batch_write_item(
+            RequestItems={
+                name: [_write_request(request, serialize) for request in requests]
+                for name, requests in RequestItems.items()
+            },
+            **kwargs
+        )
+        response['UnprocessedItems'] = {
+            name: [_write_request(request, deserialize) for request in requests]
+            for name, requests in response.get('UnprocessedItems', {}).items()
+        }
+        return response
+
+
+def dynamodb_resource():
+    """핸들러 공용 DynamoDB 진입점 (기본 client 기반, DYNAMODB_ACCESS=resource면 boto3.resource)"""
+    if DYNAMODB_ACCESS == 'resource':
+        import boto3
+        return boto3.session.Session(botocore_session=session()).resource('dynamodb', config=client_config())
+    return DynamoDB()
@@ -0,0 +1,95 @@
+"""
+링크 만료 (urls 테이블 DynamoDB TTL)
+- expiresAt(ISO, 응답/캐시 정책용)과 함께 epoch 초 속성 두 개를 저장
+  expiresAtEpoch  만료 시각 → 리다이렉트 410 판정, 목록/사이트 통계 서버 측 필터 (숫자 비교)
+  ttl             삭제 시각 = 만료 + URL_EXPIRED_RETENTION_DAYS → DynamoDB TTL이 아이템 삭제
+  (보관 기간 동안은 410 응답, 이후 삭제되면 404 + 스캔 대상에서 빠짐)
+- 삭제 시각이 지난 코드는 TTL 삭제(최대 수일 지연) 전이라도 새 링크가 덮어쓸 수 있음 (RECLAIM_CONDITION)
+  → 덮어쓴 경우 이전 링크의 샤드 카운터/URL별 롤업 버킷을 지움 (purge_url_state)
+- expiresAtEpoch가 없는 기존 아이템은 expiresAt 문자열 비교 (tools/backfill_url_ttl.py로 채움)
+"""
+import os
+import time
+from datetime import datetime, timezone
+
+from linksnap_common.counters import shard_counter_id
+
+EXPIRES_EPOCH_ATTR = 'expiresAtEpoch'
+URL_TTL_ATTR = 'ttl'
+URL_EXPIRED_RETENTION_DAYS = int(os.environ.get('URL_EXPIRED_RETENTION_DAYS', '7'))
+
+# 조건부 put: 없는 코드이거나 삭제 시각이 지난 코드 (':now'는 epoch 초)
+RECLAIM_CONDITION = 'attribute_not_exists(urlId) OR #ttl < :now'
+
+
+def to_epoch(iso_timestamp):
+    """UTC naive ISO 문자열 → epoch 초"""
+    return int(datetime.fromisoformat(iso_timestamp).replace(tzinfo=timezone.utc).timestamp())
+
+
+def expiry_attributes(expires_at, retention_days=None):
+    """urls 아이템에 함께 저장할 만료/TTL 속성"""
+    retention_days = URL_EXPIRED_RETENTION_DAYS if retention_days is None else retention_days
+    expires_epoch = to_epoch(expires_at)
+    return {
+        EXPIRES_EPOCH_ATTR: expires_epoch,
+        URL_TTL_ATTR: expires_epoch + retention_days * 86400
+    }
+
+
+def is_expired(item, now=None):
+    """만료 여부 (epoch 속성 우선, 없으면 expiresAt 문자열 비교, 만료 정보가 없으면 False)"""
+    now = time.time() if now is None else now
+    expires_epoch = item.get(EXPIRES_EPOCH_ATTR)
+    if expires_epoch is not None:
+        return now > int(expires_epoch)
+
+    expires_at = item.get('expiresAt', '')
+    if not expires_at:
+        return False
+    return datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat() > expires_at
+
+
+def is_reclaimable(item, now=None):
+    """삭제 시각(ttl)이 지나 새 링크가 코드를 가져갈 수 있는 아이템인지"""
+    ttl = item.get(URL_TTL_ATTR)
+    return ttl is not None and int(ttl) < (time.time() if now is None else now)
+
+
+def add_live_filter(kwargs, now=None):
+    """scan/query 인자에 만료되지 않은 아이템만 남기는 FilterExpression 추가 (기존 필터와 AND)
+    - expiresAtEpoch가 없는 아이템(백필 전)은 남김
+    """
+    live = '(attribute_not_exists(#expEpoch) OR #expEpoch > :nowEpoch)'
+    existing = kwargs.get('FilterExpression')
+    kwargs['FilterExpression'] = f"({existing}) AND {live}" if existing else live
+    kwargs['ExpressionAttributeNames'] = {**kwargs.get('ExpressionAttributeNames', {}), '#expEpoch': EXPIRES_EPOCH_ATTR}
+    kwargs['ExpressionAttributeValues'] = {
+        **kwargs.get('ExpressionAttributeValues', {}),
+        ':nowEpoch': int(time.time() if now is None else now)
+    }
+    return kwargs
+
+
+def purge_url_state(url_id, counters_table=None, shard_count=0, rollups_table=None):
+    """회수한 코드에 남은 이전 링크의 클릭 상태 삭제 (샤드 카운터, URL별 롤업 버킷)
+    - 원시 클릭은 clicks 테이블 TTL로 사라짐 (보관 기간 + 링크 수명이 CLICK_TTL_DAYS보다 짧으면 일부 남을 수 있음)
+    """
+    if counters_table is not None:
+        for shard in range(shard_count):
+            counters_table.delete_item(Key={'counterId': shard_counter_id(url_id, shard)})
+
+    if rollups_table is not None:
+        kwargs = {
+            'KeyConditionExpression': '#scope = :scope',
+            'ExpressionAttributeNames': {'#scope': 'scope', '#bucket': 'bucket'},
+            'ExpressionAttributeValues': {':scope': url_id},
+            'ProjectionExpression': '#scope, #bucket'
+        }
+        while True:
+            response = rollups_table.query(**kwargs)
+            for item in response.get('Items', []):
+                rollups_table.delete_item(Key={'scope': item['scope'], 'bucket': item['bucket']})
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
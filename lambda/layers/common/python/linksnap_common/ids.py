@@ -0,0 +1,163 @@
+"""
+단축 코드(urlId) 할당기
+- base62 (0-9A-Za-z), 길이 설정 가능 (기본 7자리 = 62^7 ≈ 3.5조 개)
+- random: 무작위 코드 + 조건부 put(attribute_not_exists) 충돌 시 재시도
+- block:  counters 테이블의 할당 카운터(alloc#urls)에서 컨테이너마다 N개 범위를 임대
+          → 범위를 다 쓸 때까지는 DynamoDB 조율 없이 발급, 순번은 Feistel 치환으로 섞어서 노출
+- 어느 방식이든 put은 조건부로 실행 → 기존 링크(구 6자리 hex 코드 포함)를 덮어쓰지 않음
+  (reclaim_expired면 삭제 시각(ttl)이 지난 만료 링크는 TTL 삭제 전이라도 덮어씀, linksnap_common.expiry)
+"""
+import secrets
+import time
+
+from linksnap_common.expiry import RECLAIM_CONDITION, URL_TTL_ATTR
+
+BASE62_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+DEFAULT_ID_LENGTH = 7
+ALLOC_COUNTER_ID = 'alloc#urls'
+
+# 순번 섞기용 Feistel 라운드 키 (고정값, 바꾸면 이미 임대한 범위와 코드가 겹칠 수 있음)
+SCRAMBLE_ROUND_KEYS = (0x5bd1e995, 0x27d4eb2f, 0x165667b1, 0x85ebca6b)
+
+
+class IdAllocationError(RuntimeError):
+    pass
+
+
+def encode_base62(number, length=DEFAULT_ID_LENGTH):
+    """정수 → 고정 길이 base62 문자열 (앞자리는 '0'으로 채움)"""
+    chars = []
+    while number:
+        number, rem = divmod(number, 62)
+        chars.append(BASE62_ALPHABET[rem])
+    if len(chars) > length:
+        raise IdAllocationError(f"{length}자리 base62 범위를 넘는 값")
+    return ''.join(reversed(chars)).rjust(length, BASE62_ALPHABET[0])
+
+
+def decode_base62(code):
+    number = 0
+    for char in code:
+        number = number * 62 + BASE62_ALPHABET.index(char)
+    return number
+
+
+def scramble(number, length=DEFAULT_ID_LENGTH):
+    """순번 → [0, 62^L) 안의 다른 값 (전단사, 연속 발급 코드가 이웃하지 않도록, 암호학적 보호는 아님)
+    - 2^(2h) 비트 공간에서 Feistel 치환 후 범위를 벗어나면 다시 치환 (cycle walking)
+    """
+    space = 62 ** length
+    half = ((space - 1).bit_length() + 1) // 2
+    mask = (1 << half) - 1
+
+    value = number
+    while True:
+        left, right = value >> half, value & mask
+        for key in SCRAMBLE_ROUND_KEYS:
+            mixed = ((right ^ key) * 0x9E3779B97F4A7C15) >> 17
+            left, right = right, left ^ (mixed & mask)
+        value = (left << half) | right
+        if value < space:
+            return value
+
+
+class RandomIdAllocator:
+    """무작위 base62 코드 (충돌은 조건부 put 재시도로 처리)"""
+
+    def __init__(self, length=DEFAULT_ID_LENGTH, randbelow=secrets.randbelow):
+        self.length = length
+        self._space = 62 ** length
+        self._randbelow = randbelow
+
+    def next_id(self):
+        return encode_base62(self._randbelow(self._space), self.length)
+
+
+class BlockIdAllocator:
+    """할당 카운터에서 block_size개씩 범위를 임대해 순서대로 발급"""
+
+    def __init__(self, table, block_size=1000, length=DEFAULT_ID_LENGTH,
+                 counter_id=ALLOC_COUNTER_ID, scrambled=True):
+        self.table = table
+        self.block_size = max(1, block_size)
+        self.length = length
+        self.counter_id = counter_id
+        self.scrambled = scrambled
+        self._space = 62 ** length
+        self._next = 0
+        self._end = 0
+        self.leases = 0
+
+    def _lease(self):
+        response = self.table.update_item(
+            Key={'counterId': self.counter_id},
+            UpdateExpression='ADD #next :block',
+            ExpressionAttributeNames={'#next': 'next'},
+            ExpressionAttributeValues={':block': self.block_size},
+            ReturnValues='UPDATED_NEW'
+        )
+        self._end = int(response['Attributes']['next'])
+        self._next = self._end - self.block_size
+        self.leases += 1
+
+    def next_id(self):
+        if self._next >= self._end:
+            self._lease()
+
+        number = self._next
+        self._next += 1
+        if number >= self._space:
+            raise IdAllocationError(f"{self.length}자리 코드 공간 소진 (URL_ID_LENGTH 증가 필요)")
+
+        return encode_base62(scramble(number, self.length) if self.scrambled else number, self.length)
+
+
+def _is_conditional_failure(error):
+    return getattr(error, 'response', {}).get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+def try_put_new_item(table, item, reclaim_expired=False):
+    """코드가 비어 있을 때만 아이템 저장 (reclaim_expired면 삭제 시각 지난 만료 링크도 덮어씀)
+    - (저장 여부, 덮어쓴 이전 아이템 또는 None) 반환, 조건 실패 외의 오류는 그대로 raise
+    """
+    try:
+        if reclaim_expired:
+            response = table.put_item(
+                Item=item,
+                ConditionExpression=RECLAIM_CONDITION,
+                ExpressionAttributeNames={'#ttl': URL_TTL_ATTR},
+                ExpressionAttributeValues={':now': int(time.time())},
+                ReturnValues='ALL_OLD'
+            )
+            return True, (response or {}).get('Attributes') or None
+        table.put_item(Item=item, ConditionExpression='attribute_not_exists(urlId)')
+        return True, None
+    except Exception as e:
+        if not _is_conditional_failure(e):
+            raise
+        return False, None
+
+
+def put_with_new_id(table, allocator, build_item, max_attempts=5, reclaim_expired=False, on_reclaim=None):
+    """새 코드로 아이템 조건부 저장 (이미 있는 코드면 다른 코드로 재시도), 저장한 아이템 반환
+    - reclaim_expired: 삭제 시각이 지난 만료 링크의 코드도 사용, 덮어쓴 이전 아이템은 on_reclaim(old_item)으로 전달
+    """
+    for _ in range(max_attempts):
+        item = build_item(allocator.next_id())
+        stored, old_item = try_put_new_item(table, item, reclaim_expired)
+        if stored:
+            if old_item and on_reclaim is not None:
+                on_reclaim(old_item)
+            return item
+        print(f"[WARN] 단축 코드 충돌, 재시도 (urlId={item['urlId']})")
+
+    raise IdAllocationError(f"{max_attempts}회 연속 코드 충돌")
+
+
+def create_allocator(kind, counters_table=None, length=DEFAULT_ID_LENGTH, block_size=1000):
+    """URL_ID_ALLOCATOR 설정값으로 할당기 생성"""
+    if kind == 'block':
+        return BlockIdAllocator(counters_table, block_size=block_size, length=length)
+    if kind == 'random':
+        return RandomIdAllocator(length=length)
+    raise ValueError(f"unknown URL_ID_ALLOCATOR: {kind}")
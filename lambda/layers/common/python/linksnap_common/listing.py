@@ -0,0 +1,206 @@
+"""
+URL 목록 조회용 urls 테이블 GSI
+- listKey: URL마다 url#{crc32(urlId) % LIST_KEY_SHARDS} → 샤드마다 정렬 키 순서로 Query 후 병합
+  (GSI 파티션 하나의 쓰기 한도 ~1000 WCU/s에 생성/listClicks 갱신이 모두 몰리지 않도록 분산,
+   LIST_KEY_SHARDS=1이면 모든 URL이 'url' 파티션 하나 → 한도가 곧 사이트 전체 생성+갱신 한도)
+- byCreatedAt: listKey + createdAt / byClicks: listKey + listClicks(클릭 수 스냅샷)
+- listClicks는 click-consumer가 배치마다 URL별 최신 합계로 갱신 (샤드 카운터 합산값, 리다이렉트는 갱신 안 함)
+- 커서: 샤드별 다음 시작 키(소진된 샤드는 null)를 base64(JSON)로 감싼 불투명 문자열
+- exclude_expired: 만료된 링크(expiresAtEpoch 경과)는 Query 필터로 제외 (GSI 프로젝션에 expiresAtEpoch 포함)
+"""
+import base64
+import heapq
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from linksnap_common.expiry import add_live_filter
+
+LIST_KEY_ATTR = 'listKey'
+LIST_KEY_VALUE = 'url'
+LIST_CLICKS_ATTR = 'listClicks'
+# 생성/목록/백필이 모두 같은 값을 써야 함 (바꾸면 backfill_url_listing.py로 listKey 재배치)
+LIST_KEY_SHARDS = int(os.environ.get('LIST_KEY_SHARDS', '1'))
+
+SORT_INDEXES = {
+    'createdAt': 'byCreatedAt',
+    'clicks': 'byClicks'
+}
+SORT_ATTRS = {
+    'createdAt': 'createdAt',
+    'clicks': LIST_CLICKS_ATTR
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+MAX_QUERY_CALLS = 5
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def list_key(url_id, shards=None):
+    """URL의 목록 GSI 파티션 값 (샤드 1개면 기존 'url')"""
+    shards = LIST_KEY_SHARDS if shards is None else shards
+    if shards <= 1:
+        return LIST_KEY_VALUE
+    return f"{LIST_KEY_VALUE}#{zlib.crc32(url_id.encode()) % shards}"
+
+
+def list_keys(shards=None):
+    """Query할 전체 파티션 값"""
+    shards = LIST_KEY_SHARDS if shards is None else shards
+    if shards <= 1:
+        return [LIST_KEY_VALUE]
+    return [f"{LIST_KEY_VALUE}#{shard}" for shard in range(shards)]
+
+
+def listing_attributes(url_id, click_count=0):
+    """URL 생성 시 함께 저장할 GSI 속성"""
+    return {LIST_KEY_ATTR: list_key(url_id), LIST_CLICKS_ATTR: click_count}
+
+
+def set_listing_clicks(table, entries):
+    """URL별 listClicks를 최신 합계로 갱신 (더 작은 값으로 되돌리지 않음, 삭제된 URL은 건너뜀)"""
+    for entry in entries:
+        try:
+            table.update_item(
+                Key={'urlId': entry['urlId']},
+                UpdateExpression='SET #clicks = :clicks',
+                ConditionExpression='attribute_exists(urlId) AND '
+                                    '(attribute_not_exists(#clicks) OR #clicks < :clicks)',
+                ExpressionAttributeNames={'#clicks': LIST_CLICKS_ATTR},
+                ExpressionAttributeValues={':clicks': entry['clickCount']}
+            )
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+
+
+def _plain(value):
+    return int(value) if isinstance(value, Decimal) else value
+
+
+def encode_cursor(sort, positions):
+    """positions: 파티션 값 → 다음 ExclusiveStartKey ({}면 처음부터, None이면 소진)"""
+    payload = {
+        's': sort,
+        'p': {
+            key: None if start is None else {name: _plain(value) for name, value in start.items()}
+            for key, start in positions.items()
+        }
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(sort, cursor):
+    """커서 → 파티션별 시작 위치 (다른 정렬 기준으로 만든 커서면 InvalidCursor)
+    - 샤딩 전 커서({'k': LastEvaluatedKey})도 받음, 커서에 없는 파티션은 처음부터
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if 'k' in payload:
+            positions = {payload['k'][LIST_KEY_ATTR]: payload['k']}
+        else:
+            positions = payload['p']
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise InvalidCursor('invalid cursor') from e
+
+    if payload.get('s') != sort or not isinstance(positions, dict) \
+            or not all(start is None or isinstance(start, dict) for start in positions.values()):
+        raise InvalidCursor('cursor does not match sort')
+    return positions
+
+
+def _query_partition(table, kwargs, key, start, limit):
+    """파티션 하나에서 필터 통과 아이템 최대 limit개, (items, LastEvaluatedKey) 반환
+    - prefix/exclude_expired는 FilterExpression이라 limit을 채우려고 최대 MAX_QUERY_CALLS번 Query
+    """
+    kwargs = {**kwargs, 'ExpressionAttributeValues': {**kwargs['ExpressionAttributeValues'], ':list': key}}
+    if start:
+        kwargs['ExclusiveStartKey'] = start
+
+    items = []
+    last_key = None
+    for _ in range(MAX_QUERY_CALLS):
+        # Limit은 필터 전 평가 개수 기준 → 남은 칸만큼만 요청해서 페이지를 넘치지 않게 함
+        response = table.query(Limit=limit - len(items), **kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key or len(items) >= limit:
+            break
+        kwargs['ExclusiveStartKey'] = last_key
+    return items, last_key
+
+
+def query_urls(table, sort='createdAt', limit=DEFAULT_PAGE_SIZE, cursor=None, prefix=None, ascending=False,
+               exclude_expired=False):
+    """정렬 GSI로 URL 한 페이지 조회, (items, next_cursor) 반환
+    - 파티션(listKey 샤드)마다 최대 limit개씩 동시에 Query → 정렬 키 기준 병합 후 앞에서 limit개
+    - 아직 남은 파티션의 마지막 평가 위치보다 뒤에 오는 아이템은 이번 페이지에 넣지 않음
+      (그 파티션의 다음 아이템이 더 앞에 올 수 있음) → 페이지가 limit보다 짧을 수 있음
+    """
+    sort_attr = SORT_ATTRS[sort]
+    kwargs = {
+        'IndexName': SORT_INDEXES[sort],
+        'KeyConditionExpression': '#list = :list',
+        'ExpressionAttributeNames': {'#list': LIST_KEY_ATTR},
+        'ExpressionAttributeValues': {},
+        'ScanIndexForward': ascending
+    }
+    if prefix:
+        kwargs['FilterExpression'] = 'begins_with(urlId, :prefix)'
+        kwargs['ExpressionAttributeValues'][':prefix'] = prefix
+    if exclude_expired:
+        add_live_filter(kwargs)
+
+    positions = decode_cursor(sort, cursor) if cursor else {}
+    active = [key for key in list_keys() if positions.get(key, {}) is not None]
+    if not active:
+        return [], None
+
+    def query(key):
+        return _query_partition(table, kwargs, key, positions.get(key), limit)
+
+    if len(active) == 1:
+        results = [query(active[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(active)) as executor:
+            results = list(executor.map(query, active))
+
+    def beyond(value, bound):
+        return value > bound if ascending else value < bound
+
+    # 아직 남은 파티션 중 가장 앞선 마지막 평가 위치까지만 안전하게 내보낼 수 있음
+    frontier = None
+    for _, last_key in results:
+        if last_key and (frontier is None or beyond(frontier, last_key[sort_attr])):
+            frontier = last_key[sort_attr]
+
+    merged = heapq.merge(
+        *[[(key, item) for item in items] for key, (items, _) in zip(active, results)],
+        key=lambda entry: entry[1][sort_attr],
+        reverse=not ascending
+    )
+    page = []
+    consumed = dict.fromkeys(active, 0)
+    for key, item in merged:
+        if len(page) >= limit or (frontier is not None and beyond(item[sort_attr], frontier)):
+            break
+        page.append(item)
+        consumed[key] += 1
+
+    next_positions = {key: positions.get(key, {}) for key in list_keys()}
+    for key, (items, last_key) in zip(active, results):
+        if consumed[key] == len(items):
+            next_positions[key] = last_key
+        elif consumed[key]:
+            last = items[consumed[key] - 1]
+            next_positions[key] = {'urlId': last['urlId'], LIST_KEY_ATTR: key, sort_attr: last[sort_attr]}
+
+    if all(start is None for start in next_positions.values()):
+        return page, None
+    return page, encode_cursor(sort, next_positions)
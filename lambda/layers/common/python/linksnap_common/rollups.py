@@ -0,0 +1,215 @@
+"""
+클릭 롤업 (사전 집계) 테이블
+- PK: scope (urlId 또는 사이트 전체 '__site__') / SK: bucket / count
+  (scope, bucket, count 모두 DynamoDB 예약어 → 표현식에서는 #이름 사용)
+- 클릭 수집 시점에 버킷 카운터를 증가시켜 두고, 통계 API는 원시 클릭 대신 버킷 몇십 개만 읽음
+
+bucket 종류
+  hod#{HH}            시간대별 (0-23시, 전체 기간)
+  dev#{device}        디바이스별
+  ref#{domain}        유입 도메인별
+  cty#{country}       국가별
+  flt#{reason}        클릭으로 세지 않은 요청 (head / prefetch / bot, BOT_FILTER_MODE=tally, consumer 배치에서 합산)
+  t#{YYYY-MM-DD}      일별 (사전순으로 가장 뒤 → 차원 버킷과 일별 버킷을 범위 Query 2번으로 분리)
+
+scope '__compaction__' / bucket fold#{YYYY-MM-DD}: 보관 작업이 그날 차원 버킷을 합산했다는 표시 (fold_day)
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from linksnap_common.clicks import read_click
+
+SITE_SCOPE = '__site__'
+FOLD_MARKER_SCOPE = '__compaction__'
+
+HOUR_PREFIX = 'hod#'
+DEVICE_PREFIX = 'dev#'
+REFERER_PREFIX = 'ref#'
+COUNTRY_PREFIX = 'cty#'
+FILTERED_PREFIX = 'flt#'
+DAY_PREFIX = 't#'
+
+
+def day_bucket(day):
+    return f"{DAY_PREFIX}{day.isoformat()}"
+
+
+def click_buckets(timestamp, device, referer, country):
+    """클릭 하나가 증가시킬 버킷 목록"""
+    return [
+        f"{HOUR_PREFIX}{timestamp.hour:02d}",
+        day_bucket(timestamp.date()),
+        f"{DEVICE_PREFIX}{device}",
+        f"{REFERER_PREFIX}{referer}",
+        f"{COUNTRY_PREFIX}{country or 'unknown'}"
+    ]
+
+
+def dimension_buckets(timestamp, device, referer, country):
+    """일별 버킷을 뺀 차원 버킷 (전체 기간 누적)"""
+    day = day_bucket(timestamp.date())
+    return [bucket for bucket in click_buckets(timestamp, device, referer, country) if bucket != day]
+
+
+def _is_conditional_failure(error):
+    return getattr(error, 'response', {}).get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+class RollupWriter:
+    """URL별 + 사이트 전체 버킷 증가분을 모아서 ADD 업데이트"""
+
+    def __init__(self, table):
+        self.table = table
+        self._pending = defaultdict(int)
+
+    def add_bucket(self, url_id, bucket, count=1):
+        """URL 버킷과 사이트 전체 버킷에 함께 더함"""
+        self._pending[(url_id, bucket)] += count
+        self._pending[(SITE_SCOPE, bucket)] += count
+
+    def add(self, url_id, timestamp, device, referer, country, count=1):
+        for bucket in click_buckets(timestamp, device, referer, country):
+            self.add_bucket(url_id, bucket, count)
+
+    def add_filtered(self, url_id, reason, count=1):
+        """걸러낸 요청 (봇/미리보기 등) 사유별 합산"""
+        self.add_bucket(url_id, f"{FILTERED_PREFIX}{reason}", count)
+
+    def add_click_item(self, item):
+        """clicks 테이블 아이템 기준으로 추가 (full/compact 형식 모두)"""
+        click = read_click(item)
+        if click['timestamp'] is None:
+            raise ValueError(f"timestamp 없는 클릭 아이템: {item.get('clickKey')}")
+        self.add(item['urlId'], click['timestamp'], click['device'], click['referer'], click['country'])
+
+    def flush(self):
+        """누적 증가분 기록 (실패한 버킷은 다음 flush로 이월), 기록한 버킷 수 반환"""
+        pending, self._pending = self._pending, defaultdict(int)
+        written = 0
+
+        for (scope, bucket), count in pending.items():
+            try:
+                self.table.update_item(
+                    Key={'scope': scope, 'bucket': bucket},
+                    UpdateExpression='ADD #count :inc',
+                    ExpressionAttributeNames={'#count': 'count'},
+                    ExpressionAttributeValues={':inc': count}
+                )
+                written += 1
+            except Exception as e:
+                print(f"[WARN] 롤업 기록 실패 ({scope}/{bucket}): {e}")
+                self._pending[(scope, bucket)] += count
+
+        return written
+
+
+def fold_day(table, day, url_clicks, dimension_counts):
+    """보관한 하루치 클릭을 롤업에 반영 (수집 시점 롤업 ROLLUPS_ENABLED를 쓰지 않는 배포용), 차원 버킷을 더했으면 True
+    - 일별 버킷 t#{날짜}: URL별 합계 url_clicks로 SET → 같은 날짜를 다시 돌려도 같은 값
+    - 차원 버킷 (시간대/디바이스/유입/국가): 전체 기간 누적이라 ADD
+      → fold#{날짜} 표시 아이템을 조건부로 먼저 기록하고, 이미 있으면 건너뜀 (중간 실패 시 두 번 더하는 대신 덜 더함)
+    - dimension_counts: {(urlId, bucket): 클릭 수}
+    """
+    bucket = day_bucket(day)
+    totals = dict(url_clicks)
+    totals[SITE_SCOPE] = sum(url_clicks.values())
+    for scope, count in totals.items():
+        table.update_item(
+            Key={'scope': scope, 'bucket': bucket},
+            UpdateExpression='SET #count = :count',
+            ExpressionAttributeNames={'#count': 'count'},
+            ExpressionAttributeValues={':count': count}
+        )
+
+    try:
+        table.put_item(
+            Item={'scope': FOLD_MARKER_SCOPE, 'bucket': f"fold#{day.isoformat()}"},
+            ConditionExpression='attribute_not_exists(#scope)',
+            ExpressionAttributeNames={'#scope': 'scope'}
+        )
+    except Exception as e:
+        if _is_conditional_failure(e):
+            return False
+        raise
+
+    writer = RollupWriter(table)
+    for (url_id, dimension), count in dimension_counts.items():
+        writer.add_bucket(url_id, dimension, count)
+    writer.flush()
+    return True
+
+
+def _query_buckets(table, key_condition, values):
+    kwargs = {
+        'KeyConditionExpression': key_condition,
+        'ExpressionAttributeValues': values,
+        'ProjectionExpression': '#bucket, #count',
+        'ExpressionAttributeNames': {'#scope': 'scope', '#bucket': 'bucket', '#count': 'count'}
+    }
+    while True:
+        response = table.query(**kwargs)
+        for item in response.get('Items', []):
+            yield item['bucket'], int(item.get('count', 0))
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def read_dimensions(table, scope):
+    """시간대/디바이스/유입/국가/걸러낸 요청 버킷 (일별 버킷 제외)"""
+    return dict(_query_buckets(
+        table,
+        '#scope = :scope AND #bucket < :day',
+        {':scope': scope, ':day': DAY_PREFIX}
+    ))
+
+
+def read_daily(table, scope, since, until):
+    """기간 내 일별 버킷 {YYYY-MM-DD: count}"""
+    buckets = _query_buckets(
+        table,
+        '#scope = :scope AND #bucket BETWEEN :since AND :until',
+        {':scope': scope, ':since': day_bucket(since), ':until': day_bucket(until)}
+    )
+    return {bucket[len(DAY_PREFIX):]: count for bucket, count in buckets}
+
+
+def _strip(buckets, prefix):
+    return {bucket[len(prefix):]: count for bucket, count in buckets.items() if bucket.startswith(prefix)}
+
+
+def read_stats(table, scope, days=30, now=None):
+    """롤업으로 calculate_stats와 같은 형태의 통계 생성
+    - 일별/오늘/어제는 최근 N일, 시간대/디바이스/유입 분포는 전체 기간 기준
+    - totalClicks는 카운터 기준으로 호출 측에서 덮어씀
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+    yesterday = today - timedelta(days=1)
+
+    dimensions = read_dimensions(table, scope)
+    daily = read_daily(table, scope, today - timedelta(days=days - 1), today)
+    hourly = _strip(dimensions, HOUR_PREFIX)
+
+    return {
+        'totalClicks': sum(daily.values()),
+        'todayClicks': daily.get(today.isoformat(), 0),
+        'yesterdayClicks': daily.get(yesterday.isoformat(), 0),
+        'hourlyClicks': [{'hour': h, 'clicks': hourly.get(f"{h:02d}", 0)} for h in range(24)],
+        'dailyClicks': sorted(
+            [{'date': d, 'clicks': c} for d, c in daily.items()],
+            key=lambda x: x['date'],
+            reverse=True
+        )[:days],
+        'deviceDistribution': _strip(dimensions, DEVICE_PREFIX),
+        'refererDistribution': _strip(dimensions, REFERER_PREFIX),
+        'filteredClicks': _strip(dimensions, FILTERED_PREFIX)
+    }
+
+
+def read_day_counts(table, scope, days):
+    """특정 날짜들의 일별 클릭 수 (오늘/어제 등)"""
+    if not days:
+        return {}
+    daily = read_daily(table, scope, min(days), max(days))
+    return {day: daily.get(day.isoformat(), 0) for day in days}
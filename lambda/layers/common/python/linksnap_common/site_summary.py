@@ -0,0 +1,163 @@
+"""
+사이트 요약 문서 (GET /stats 용 materialized view)
+- rollups 테이블의 아이템 하나 (scope='__summary__', bucket='site')
+- 카운터(totalUrls, totalClicks, 일별 클릭)는 ADD로 원자적 증가
+- 인기 URL / 최근 URL 목록은 version 조건부 업데이트(낙관적 잠금)로 갱신
+- 주기적 재계산(reconcile_site_summary)이 전체 스캔으로 누적 오차를 바로잡음
+"""
+import heapq
+from datetime import datetime, timedelta
+
+from linksnap_common.batch import batch_get_keys
+
+SUMMARY_KEY = {'scope': '__summary__', 'bucket': 'site'}
+DAY_ATTR_PREFIX = 'clicks#'
+SUMMARY_LIST_SIZE = 10
+KEEP_DAYS = 7
+MAX_RETRIES = 5
+
+URL_ENTRY_FIELDS = ('urlId', 'shortUrl', 'originalUrl', 'clickCount', 'createdAt')
+
+
+def url_entry(url_item, click_count=None):
+    """요약 문서에 저장할 URL 정보"""
+    return {
+        'urlId': url_item.get('urlId'),
+        'shortUrl': url_item.get('shortUrl'),
+        'originalUrl': url_item.get('originalUrl'),
+        'clickCount': int(url_item.get('clickCount', 0) if click_count is None else click_count),
+        'createdAt': url_item.get('createdAt')
+    }
+
+
+def read_url_items(dynamodb, table_name, url_ids):
+    """요약에 필요한 속성만 urls 테이블에서 batch_get_item"""
+    return batch_get_keys(
+        dynamodb, table_name, [{'urlId': url_id} for url_id in url_ids], ', '.join(URL_ENTRY_FIELDS)
+    )
+
+
+def top_by_clicks(entries, limit=SUMMARY_LIST_SIZE):
+    return heapq.nlargest(limit, entries, key=lambda u: int(u.get('clickCount', 0)))
+
+
+def most_recent(entries, limit=SUMMARY_LIST_SIZE):
+    return heapq.nlargest(limit, entries, key=lambda u: u.get('createdAt') or '')
+
+
+def _is_conditional_failure(error):
+    return getattr(error, 'response', {}).get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+class SiteSummary:
+    def __init__(self, table, list_size=SUMMARY_LIST_SIZE):
+        self.table = table
+        self.list_size = list_size
+
+    def read(self):
+        return self.table.get_item(Key=SUMMARY_KEY).get('Item')
+
+    def add_counts(self, urls=0, clicks=0, day_clicks=None):
+        """totalUrls/totalClicks/일별 클릭 원자적 증가"""
+        names = {'#urls': 'totalUrls', '#clicks': 'totalClicks'}
+        values = {':urls': urls, ':clicks': clicks}
+        clauses = ['#urls :urls', '#clicks :clicks']
+
+        for i, (day, count) in enumerate(sorted((day_clicks or {}).items())):
+            names[f"#d{i}"] = f"{DAY_ATTR_PREFIX}{day}"
+            values[f":d{i}"] = count
+            clauses.append(f"#d{i} :d{i}")
+
+        self.table.update_item(
+            Key=SUMMARY_KEY,
+            UpdateExpression='ADD ' + ', '.join(clauses),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+
+    def _update_lists(self, mutate):
+        """인기/최근 목록 read-modify-write (version 충돌 시 재시도)"""
+        for _ in range(MAX_RETRIES):
+            item = self.read() or {}
+            version = int(item.get('version', 0))
+            top_urls, recent_urls = mutate(item.get('topUrls', []), item.get('recentUrls', []))
+
+            try:
+                self.table.update_item(
+                    Key=SUMMARY_KEY,
+                    UpdateExpression='SET topUrls = :top, recentUrls = :recent, #version = :next',
+                    ConditionExpression='attribute_not_exists(#version) OR #version = :version',
+                    ExpressionAttributeNames={'#version': 'version'},
+                    ExpressionAttributeValues={
+                        ':top': top_urls,
+                        ':recent': recent_urls,
+                        ':version': version,
+                        ':next': version + 1
+                    }
+                )
+                return True
+            except Exception as e:
+                if not _is_conditional_failure(e):
+                    raise
+
+        print("[WARN] 사이트 요약 목록 갱신 충돌 (재시도 초과, 다음 reconcile에서 반영)")
+        return False
+
+    def record_url_created(self, url_item):
+        """URL 생성 이벤트: totalUrls +1, 최근 목록 앞에 추가"""
+        return self.record_urls_created([url_item])
+
+    def record_urls_created(self, url_items):
+        """URL 여러 개 생성 (일괄 생성 API): totalUrls +N, 최근 목록 갱신은 한 번만"""
+        if not url_items:
+            return True
+        self.add_counts(urls=len(url_items))
+        entries = {item['urlId']: url_entry(item, 0) for item in url_items}
+
+        def mutate(top_urls, recent_urls):
+            recent = [u for u in recent_urls if u.get('urlId') not in entries] + list(entries.values())
+            return top_urls, most_recent(recent, self.list_size)
+
+        return self._update_lists(mutate)
+
+    def record_clicks(self, day_clicks, url_entries):
+        """클릭 배치 이벤트: totalClicks/일별 증가 + 인기 목록에 최신 클릭 수 반영"""
+        self.add_counts(clicks=sum(day_clicks.values()), day_clicks=day_clicks)
+        fresh = {entry['urlId']: entry for entry in url_entries}
+        if not fresh:
+            return True
+
+        def mutate(top_urls, recent_urls):
+            merged = {u['urlId']: u for u in top_urls}
+            merged.update(fresh)
+            recent = [dict(u, clickCount=fresh[u['urlId']]['clickCount']) if u.get('urlId') in fresh else u
+                      for u in recent_urls]
+            return top_by_clicks(merged.values(), self.list_size), recent
+
+        return self._update_lists(mutate)
+
+    def rebuild(self, total_urls, total_clicks, top_urls, recent_urls, day_clicks):
+        """전체 재계산 결과로 요약 문서 교체 (reconcile 작업용)"""
+        item = self.read() or {}
+        item = {
+            **SUMMARY_KEY,
+            'totalUrls': total_urls,
+            'totalClicks': total_clicks,
+            'topUrls': top_urls,
+            'recentUrls': recent_urls,
+            'version': int(item.get('version', 0)) + 1,
+            'reconciledAt': datetime.utcnow().isoformat()
+        }
+        for day, count in day_clicks.items():
+            item[f"{DAY_ATTR_PREFIX}{day}"] = count
+        self.table.put_item(Item=item)
+        return item
+
+
+def day_clicks(summary, day):
+    return int(summary.get(f"{DAY_ATTR_PREFIX}{day.isoformat()}", 0))
+
+
+def recent_days(now=None, days=KEEP_DAYS):
+    today = (now or datetime.utcnow()).date()
+    return [today - timedelta(days=i) for i in range(days)]
@@ -0,0 +1,80 @@
+"""
+clicks 테이블 원시 클릭 → rollups 테이블 백필
+롤업 기록(ROLLUPS_ENABLED)을 켜기 전에 쌓인 클릭을 버킷에 반영할 때 사용
+
+- --until 에는 롤업 기록을 켠 시각을 지정 (그 이후 클릭은 이미 수집 시점에 반영됨 → 중복 방지)
+- ADD 업데이트라 같은 범위를 두 번 실행하면 두 번 더해지므로 한 번만 실행
+
+사용법:
+  python lambda/tools/backfill_rollups.py --until 2026-10-17T00:00:00
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'layers', 'common', 'python'))
+
+import boto3  # noqa: E402
+
+from linksnap_common.rollups import RollupWriter  # noqa: E402
+
+
+def backfill(clicks_table, rollups_table, until, segment=None, total_segments=None, flush_every=5000):
+    """until 이전 클릭을 롤업에 반영, 처리한 클릭 수 반환"""
+    writer = RollupWriter(rollups_table)
+    processed = 0
+    flushed_at = 0
+
+    scan_kwargs = {
+        'FilterExpression': 'clickKey < :until',
+        'ExpressionAttributeValues': {':until': until}
+    }
+    if total_segments:
+        scan_kwargs.update(Segment=segment, TotalSegments=total_segments)
+
+    while True:
+        response = clicks_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            try:
+                writer.add_click_item(item)
+            except (KeyError, ValueError) as e:
+                print(f"[WARN] 클릭 변환 실패 ({item.get('urlId')}/{item.get('clickKey')}): {e}")
+                continue
+            processed += 1
+
+        # 메모리 사용량을 제한하기 위해 일정 건수마다 기록
+        if processed - flushed_at >= flush_every:
+            writer.flush()
+            flushed_at = processed
+            print(f"[backfill] {processed}건 처리")
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    writer.flush()
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='clicks 테이블을 rollups 테이블로 백필')
+    parser.add_argument('--until', required=True, help='이 시각(ISO, UTC) 이전 클릭만 반영')
+    parser.add_argument('--clicks-table', default=os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev'))
+    parser.add_argument('--rollups-table', default=os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev'))
+    parser.add_argument('--segment', type=int, default=0)
+    parser.add_argument('--total-segments', type=int, default=0, help='병렬 스캔 세그먼트 수 (0이면 단일 스캔)')
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource('dynamodb')
+    processed = backfill(
+        dynamodb.Table(args.clicks_table),
+        dynamodb.Table(args.rollups_table),
+        args.until,
+        segment=args.segment,
+        total_segments=args.total_segments
+    )
+    print(f"완료: {processed}건")
+
+
+if __name__ == '__main__':
+    main()
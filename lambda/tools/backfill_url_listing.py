@@ -0,0 +1,91 @@
+"""
+기존 urls 아이템에 목록 GSI 속성(listKey, listClicks) 백필 / listKey 샤드 재배치
+GSI 추가 전에 생성된 URL은 listKey가 없어 GET /urls에 나오지 않으므로 한 번 실행,
+LIST_KEY_SHARDS를 바꾼 뒤에도 한 번 실행 (이전 파티션 값의 URL은 목록 Query에 나오지 않음)
+
+- listClicks는 urls.clickCount + 샤드 합계(--counters-table 지정 시)로 채움 (listKey만 옮기는 아이템은 그대로)
+- 이미 올바른 listKey가 있는 아이템은 건너뜀 → 여러 번 실행해도 안전
+
+사용법:
+  python lambda/tools/backfill_url_listing.py --counters-table url-shortener-counters-dev --shards 10 --list-key-shards 8
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'layers', 'common', 'python'))
+
+import boto3  # noqa: E402
+
+from linksnap_common.counters import ShardedCounter, total_click_count  # noqa: E402
+from linksnap_common.listing import LIST_CLICKS_ATTR, LIST_KEY_ATTR, LIST_KEY_SHARDS, list_key  # noqa: E402
+
+
+def backfill(urls_table, shard_totals, list_key_shards=LIST_KEY_SHARDS, dry_run=False):
+    """listKey가 없거나 다른 파티션 값인 URL에 GSI 속성 기록, 처리 건수 반환"""
+    counts = {'scanned': 0, 'written': 0, 'moved': 0}
+    scan_kwargs = {
+        'ProjectionExpression': 'urlId, clickCount, #list',
+        'ExpressionAttributeNames': {'#list': LIST_KEY_ATTR}
+    }
+
+    while True:
+        response = urls_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            counts['scanned'] += 1
+            target = list_key(item['urlId'], list_key_shards)
+            if item.get(LIST_KEY_ATTR) == target:
+                continue
+
+            if LIST_KEY_ATTR in item:
+                counts['moved'] += 1
+                if not dry_run:
+                    urls_table.update_item(
+                        Key={'urlId': item['urlId']},
+                        UpdateExpression='SET #list = :list',
+                        ExpressionAttributeNames={'#list': LIST_KEY_ATTR},
+                        ExpressionAttributeValues={':list': target}
+                    )
+                continue
+
+            if not dry_run:
+                urls_table.update_item(
+                    Key={'urlId': item['urlId']},
+                    UpdateExpression='SET #list = :list, #clicks = :clicks',
+                    ExpressionAttributeNames={'#list': LIST_KEY_ATTR, '#clicks': LIST_CLICKS_ATTR},
+                    ExpressionAttributeValues={
+                        ':list': target,
+                        ':clicks': total_click_count(item, shard_totals)
+                    }
+                )
+            counts['written'] += 1
+
+        print(f"[backfill] {counts}")
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='urls 테이블에 목록 GSI 속성 백필')
+    parser.add_argument('--urls-table', default=os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
+    parser.add_argument('--counters-table', default=None, help='샤딩 카운터 테이블 (지정하지 않으면 clickCount만 사용)')
+    parser.add_argument('--shards', type=int, default=10)
+    parser.add_argument('--list-key-shards', type=int, default=LIST_KEY_SHARDS,
+                        help='목록 GSI 파티션 수 (create/list Lambda의 LIST_KEY_SHARDS와 같게)')
+    parser.add_argument('--dry-run', action='store_true', help='기록하지 않고 건수만 확인')
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource('dynamodb')
+    shard_totals = {}
+    if args.counters_table:
+        shard_totals = ShardedCounter(dynamodb, args.counters_table, shard_count=args.shards).read_all()
+
+    counts = backfill(dynamodb.Table(args.urls_table), shard_totals, args.list_key_shards, dry_run=args.dry_run)
+    print(f"완료: {counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+기존 urls 아이템에 만료 epoch/TTL 속성(expiresAtEpoch, ttl) 백필
+TTL 도입 전에 생성된 URL은 expiresAt 문자열만 있어 DynamoDB TTL로 삭제되지 않고,
+목록/사이트 통계의 만료 필터(attribute_not_exists)도 통과하므로 한 번 실행
+
+- 값은 expiresAt + --retention-days (기본 URL_EXPIRED_RETENTION_DAYS)
+- 이미 expiresAtEpoch가 있거나 expiresAt이 없는 아이템은 건너뜀 → 여러 번 실행해도 안전
+
+사용법:
+  python lambda/tools/backfill_url_ttl.py --urls-table url-shortener-urls-dev --retention-days 7
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'layers', 'common', 'python'))
+
+import boto3  # noqa: E402
+
+from linksnap_common.expiry import (  # noqa: E402
+    EXPIRES_EPOCH_ATTR, URL_EXPIRED_RETENTION_DAYS, URL_TTL_ATTR, expiry_attributes
+)
+
+
+def backfill(urls_table, retention_days, dry_run=False):
+    """expiresAtEpoch가 없는 URL에 만료/TTL 속성 추가, 처리 건수 반환"""
+    counts = {'scanned': 0, 'written': 0, 'skipped': 0}
+    scan_kwargs = {
+        'FilterExpression': 'attribute_not_exists(#exp) AND attribute_exists(expiresAt)',
+        'ExpressionAttributeNames': {'#exp': EXPIRES_EPOCH_ATTR},
+        'ProjectionExpression': 'urlId, expiresAt'
+    }
+
+    while True:
+        response = urls_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            counts['scanned'] += 1
+            try:
+                attributes = expiry_attributes(item['expiresAt'], retention_days)
+            except (TypeError, ValueError):
+                print(f"[WARN] expiresAt 파싱 실패, 건너뜀 (urlId={item['urlId']}): {item.get('expiresAt')!r}")
+                counts['skipped'] += 1
+                continue
+
+            if not dry_run:
+                urls_table.update_item(
+                    Key={'urlId': item['urlId']},
+                    UpdateExpression='SET #exp = :exp, #ttl = :ttl',
+                    ExpressionAttributeNames={'#exp': EXPIRES_EPOCH_ATTR, '#ttl': URL_TTL_ATTR},
+                    ExpressionAttributeValues={
+                        ':exp': attributes[EXPIRES_EPOCH_ATTR],
+                        ':ttl': attributes[URL_TTL_ATTR]
+                    }
+                )
+            counts['written'] += 1
+
+        print(f"[backfill] {counts}")
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='urls 테이블에 만료 epoch/TTL 속성 백필')
+    parser.add_argument('--urls-table', default=os.environ.get('URLS_TABLE', 'url-shortener-urls-dev'))
+    parser.add_argument('--retention-days', type=int, default=URL_EXPIRED_RETENTION_DAYS,
+                        help='만료 후 삭제까지 보관 일수 (그동안 410 응답)')
+    parser.add_argument('--dry-run', action='store_true', help='기록하지 않고 건수만 확인')
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource('dynamodb')
+    counts = backfill(dynamodb.Table(args.urls_table), args.retention_days, dry_run=args.dry_run)
+    print(f"완료: {counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+stats 테이블(statsId = {urlId}#{uuid}) → clicks 테이블(urlId + clickKey) 백필
+- 세그먼트 단위 병렬 스캔 지원 (--segment / --total-segments 로 여러 프로세스 실행)
+- 이미 TTL 기간이 지난 클릭은 기본적으로 건너뜀 (--include-expired 로 포함)
+- 같은 원본 행은 항상 같은 clickKey로 변환되므로 여러 번 실행해도 중복 없음
+
+사용법:
+  python lambda/tools/migrate_stats_to_clicks.py \\
+      --stats-table url-shortener-stats-dev --clicks-table url-shortener-clicks-dev
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'layers', 'common', 'python'))
+
+import boto3  # noqa: E402
+
+from linksnap_common.clicks import build_click_item  # noqa: E402
+
+
+def convert_stats_item(item):
+    """stats 테이블 행 → clicks 테이블 아이템 (변환 불가면 None)"""
+    stats_id = item.get('statsId', '')
+    if '#' not in stats_id:
+        return None
+
+    url_id, unique_id = stats_id.split('#', 1)
+    try:
+        timestamp = datetime.fromisoformat(item.get('timestamp', ''))
+    except (TypeError, ValueError):
+        return None
+
+    return build_click_item(
+        url_id,
+        timestamp.replace(tzinfo=None),
+        unique_id,
+        item.get('userAgent', 'unknown'),
+        item.get('referer', 'direct'),
+        item.get('country', 'unknown'),
+        item.get('ip', 'unknown')
+    )
+
+
+def migrate(stats_table, clicks_table, segment=None, total_segments=None,
+            include_expired=False, dry_run=False):
+    """stats → clicks 변환 기록, 처리 건수 반환"""
+    counts = {'scanned': 0, 'written': 0, 'skipped': 0, 'expired': 0}
+    now = int(time.time())
+
+    scan_kwargs = {}
+    if total_segments:
+        scan_kwargs.update(Segment=segment, TotalSegments=total_segments)
+
+    with clicks_table.batch_writer(overwrite_by_pkeys=['urlId', 'clickKey']) as batch:
+        while True:
+            response = stats_table.scan(**scan_kwargs)
+
+            for item in response.get('Items', []):
+                counts['scanned'] += 1
+                click_item = convert_stats_item(item)
+
+                if click_item is None:
+                    counts['skipped'] += 1
+                    continue
+                if click_item['ttl'] <= now and not include_expired:
+                    counts['expired'] += 1
+                    continue
+
+                counts['written'] += 1
+                if not dry_run:
+                    batch.put_item(Item=click_item)
+
+            print(f"[migrate] {counts}")
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='stats 테이블을 clicks 테이블 레이아웃으로 백필')
+    parser.add_argument('--stats-table', default=os.environ.get('STATS_TABLE', 'url-shortener-stats-dev'))
+    parser.add_argument('--clicks-table', default=os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev'))
+    parser.add_argument('--segment', type=int, default=0)
+    parser.add_argument('--total-segments', type=int, default=0, help='병렬 스캔 세그먼트 수 (0이면 단일 스캔)')
+    parser.add_argument('--include-expired', action='store_true', help='TTL이 이미 지난 클릭도 기록')
+    parser.add_argument('--dry-run', action='store_true', help='기록하지 않고 건수만 확인')
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource('dynamodb')
+    counts = migrate(
+        dynamodb.Table(args.stats_table),
+        dynamodb.Table(args.clicks_table),
+        segment=args.segment,
+        total_segments=args.total_segments,
+        include_expired=args.include_expired,
+        dry_run=args.dry_run
+    )
+    print(f"완료: {counts}")
+
+
+if __name__ == '__main__':
+    main()
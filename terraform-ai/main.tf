@@ -24,8 +24,14 @@ data "aws_dynamodb_table" "urls" {
   name = "url-shortener-urls-${var.environment}"
 }
 
-data "aws_dynamodb_table" "stats" {
-  name = "url-shortener-stats-${var.environment}"
+# 클릭 로그 (urlId + clickKey 레이아웃의 clicks 테이블)
+data "aws_dynamodb_table" "clicks" {
+  name = "url-shortener-clicks-${var.environment}"
+}
+
+# 사전 집계 (사이트 롤업 버킷 + 사이트 요약 문서)
+data "aws_dynamodb_table" "rollups" {
+  name = "url-shortener-rollups-${var.environment}"
 }
 
 # S3 버킷 (데이터 저장용)
@@ -35,25 +41,36 @@ module "s3" {
   environment  = var.environment
 }
 
+# AI 인사이트 응답 캐시 테이블
+module "dynamodb" {
+  source       = "./modules/dynamodb"
+  project_name = var.project_name
+  environment  = var.environment
+}
+
 # IAM (Bedrock + DynamoDB 권한)
 module "iam" {
-  source          = "./modules/iam"
-  project_name    = var.project_name
-  environment     = var.environment
-  s3_bucket_arn   = module.s3.bucket_arn
-  urls_table_arn  = data.aws_dynamodb_table.urls.arn
-  stats_table_arn = data.aws_dynamodb_table.stats.arn
+  source            = "./modules/iam"
+  project_name      = var.project_name
+  environment       = var.environment
+  s3_bucket_arn     = module.s3.bucket_arn
+  urls_table_arn    = data.aws_dynamodb_table.urls.arn
+  clicks_table_arn  = data.aws_dynamodb_table.clicks.arn
+  rollups_table_arn = data.aws_dynamodb_table.rollups.arn
+  cache_table_arn   = module.dynamodb.insights_cache_table_arn
 }
 
 # Bedrock Lambda (AI 인사이트 API)
 module "bedrock_lambda" {
-  source              = "./modules/bedrock_lambda"
-  project_name        = var.project_name
-  environment         = var.environment
-  lambda_role_arn     = module.iam.lambda_role_arn
-  s3_bucket_name      = module.s3.bucket_name
-  urls_table_name     = data.aws_dynamodb_table.urls.name
-  stats_table_name    = data.aws_dynamodb_table.stats.name
+  source             = "./modules/bedrock_lambda"
+  project_name       = var.project_name
+  environment        = var.environment
+  lambda_role_arn    = module.iam.lambda_role_arn
+  s3_bucket_name     = module.s3.bucket_name
+  urls_table_name    = data.aws_dynamodb_table.urls.name
+  clicks_table_name  = data.aws_dynamodb_table.clicks.name
+  rollups_table_name = data.aws_dynamodb_table.rollups.name
+  cache_table_name   = module.dynamodb.insights_cache_table_name
 }
 
 # API Gateway (AI API 엔드포인트)
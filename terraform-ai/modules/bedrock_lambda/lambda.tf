@@ -1,8 +1,30 @@
 # Lambda 함수 코드 압축
+# src/ + 메인 스택 공통 레이어의 linksnap_common 모듈 (AI 스택은 레이어를 배포하지 않으므로 원본 파일을 그대로 번들, 사본 없음)
+locals {
+  common_module_dir = "${path.module}/../../../lambda/layers/common/python/linksnap_common"
+  common_modules    = ["__init__.py", "aggregate.py", "aws.py", "classify.py", "dynamo.py"]
+}
+
 data "archive_file" "lambda" {
-  type        = "zip"
-  source_dir  = "${path.module}/src"
-  output_path = "${path.module}/builds/ai_insights.zip"
+  type             = "zip"
+  output_path      = "${path.module}/builds/ai_insights.zip"
+  output_file_mode = "0755" # run.sh (Web Adapter 진입점) 실행 권한
+
+  dynamic "source" {
+    for_each = fileset("${path.module}/src", "*.{py,sh}")
+    content {
+      content  = file("${path.module}/src/${source.value}")
+      filename = source.value
+    }
+  }
+
+  dynamic "source" {
+    for_each = local.common_modules
+    content {
+      content  = file("${local.common_module_dir}/${source.value}")
+      filename = "linksnap_common/${source.value}"
+    }
+  }
 }
 
 # Lambda 함수
@@ -18,9 +40,20 @@ resource "aws_lambda_function" "ai_insights" {
 
   environment {
     variables = {
-      BEDROCK_MODEL = "anthropic.claude-3-haiku-20240307-v1:0"
-      URLS_TABLE    = var.urls_table_name
-      STATS_TABLE   = var.stats_table_name
+      BEDROCK_MODEL   = "anthropic.claude-3-haiku-20240307-v1:0"
+      URLS_TABLE      = var.urls_table_name
+      CLICKS_TABLE    = var.clicks_table_name
+      ROLLUPS_TABLE   = var.rollups_table_name
+      AI_STATS_SOURCE = "rollups"
+      SCAN_SEGMENTS   = "4"
+
+      INSIGHT_CACHE_BACKEND     = "dynamodb"
+      INSIGHT_CACHE_TABLE       = var.cache_table_name
+      INSIGHT_CACHE_TTL_SECONDS = var.insight_cache_ttl_seconds
+      INSIGHT_CACHE_PRECISION   = "2"
+
+      INSIGHT_SERVE_PRECOMPUTED = "true"
+      PRECOMPUTE_TTL_SECONDS    = var.precompute_ttl_seconds
     }
   }
 
@@ -34,3 +67,96 @@ resource "aws_cloudwatch_log_group" "lambda" {
   name              = "/aws/lambda/${aws_lambda_function.ai_insights.function_name}"
   retention_in_days = 7  # 비용 절감
 }
+
+# 인사이트 사전 계산 스케줄 (full / traffic / conversion 동시 생성 → 요청 시 최근 결과 즉시 응답)
+resource "aws_cloudwatch_event_rule" "precompute_insights" {
+  name                = "${var.project_name}-precompute-insights-${var.environment}"
+  schedule_expression = var.precompute_schedule
+}
+
+resource "aws_cloudwatch_event_target" "precompute_insights" {
+  rule  = aws_cloudwatch_event_rule.precompute_insights.name
+  arn   = aws_lambda_function.ai_insights.arn
+  input = jsonencode({ precompute = true })
+}
+
+resource "aws_lambda_permission" "precompute_insights" {
+  statement_id  = "AllowEventBridgePrecompute"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.ai_insights.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.precompute_insights.arn
+}
+
+# 스트리밍 인사이트 (SSE) - 같은 코드, Lambda Web Adapter가 함수 URL 요청을 stream_server.py로 전달
+# (Python 런타임은 응답 스트리밍 미지원 → 어댑터 레이어 + RESPONSE_STREAM 함수 URL)
+resource "aws_lambda_function" "ai_insights_stream" {
+  count = var.enable_streaming ? 1 : 0
+
+  filename         = data.archive_file.lambda.output_path
+  function_name    = "${var.project_name}-ai-insights-stream-${var.environment}"
+  role             = var.lambda_role_arn
+  handler          = "run.sh"
+  source_code_hash = data.archive_file.lambda.output_base64sha256
+  runtime          = "python3.11"
+  timeout          = 120
+  memory_size      = 256
+  layers           = [var.web_adapter_layer_arn]
+
+  environment {
+    variables = {
+      AWS_LAMBDA_EXEC_WRAPPER      = "/opt/bootstrap"
+      AWS_LWA_INVOKE_MODE          = "response_stream"
+      AWS_LWA_PORT                 = "8080"
+      AWS_LWA_READINESS_CHECK_PATH = "/health"
+      BEDROCK_MODEL                = "anthropic.claude-3-haiku-20240307-v1:0"
+      URLS_TABLE                   = var.urls_table_name
+      CLICKS_TABLE                 = var.clicks_table_name
+      ROLLUPS_TABLE                = var.rollups_table_name
+      AI_STATS_SOURCE              = "rollups"
+      SCAN_SEGMENTS                = "4"
+      INSIGHT_CACHE_BACKEND        = "dynamodb"
+      INSIGHT_CACHE_TABLE          = var.cache_table_name
+      INSIGHT_CACHE_TTL_SECONDS    = var.insight_cache_ttl_seconds
+      INSIGHT_CACHE_PRECISION      = "2"
+      INSIGHT_SERVE_PRECOMPUTED    = "true"
+      PRECOMPUTE_TTL_SECONDS       = var.precompute_ttl_seconds
+    }
+  }
+
+  tags = {
+    Name = "${var.project_name}-ai-insights-stream-${var.environment}"
+  }
+}
+
+resource "aws_lambda_function_url" "ai_insights_stream" {
+  count = var.enable_streaming ? 1 : 0
+
+  function_name      = aws_lambda_function.ai_insights_stream[0].function_name
+  authorization_type = "NONE"
+  invoke_mode        = "RESPONSE_STREAM"
+
+  cors {
+    allow_origins = ["*"]
+    allow_methods = ["GET", "POST"]
+    allow_headers = ["content-type"]
+    max_age       = 3600
+  }
+}
+
+resource "aws_lambda_permission" "ai_insights_stream_url" {
+  count = var.enable_streaming ? 1 : 0
+
+  statement_id           = "AllowPublicFunctionUrl"
+  action                 = "lambda:InvokeFunctionUrl"
+  function_name          = aws_lambda_function.ai_insights_stream[0].function_name
+  principal              = "*"
+  function_url_auth_type = "NONE"
+}
+
+resource "aws_cloudwatch_log_group" "stream" {
+  count = var.enable_streaming ? 1 : 0
+
+  name              = "/aws/lambda/${aws_lambda_function.ai_insights_stream[0].function_name}"
+  retention_in_days = 7
+}
@@ -12,3 +12,8 @@ output "lambda_arn" {
   description = "Lambda ARN"
   value       = aws_lambda_function.ai_insights.arn
 }
+
+output "stream_function_url" {
+  description = "SSE 스트리밍 인사이트 함수 URL (비활성화 시 빈 값)"
+  value       = var.enable_streaming ? aws_lambda_function_url.ai_insights_stream[0].function_url : ""
+}
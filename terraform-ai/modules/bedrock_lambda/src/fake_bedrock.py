@@ -0,0 +1,68 @@
+"""
+로컬 가짜 Bedrock Runtime (BEDROCK_FAKE=true, 네트워크/비용 없이 응답 경로 확인용)
+- invoke_model: 고정 텍스트를 Anthropic Messages 응답 형태로 반환
+- invoke_model_with_response_stream: 같은 텍스트를 조각내서 실제 스트림과 같은 이벤트 순서로 반환
+  (message_start → content_block_start → content_block_delta... → content_block_stop → message_delta → message_stop)
+- 첫 조각 지연(first_token_delay)과 조각 간격(chunk_delay)으로 생성 속도 흉내
+"""
+import io
+import json
+import os
+import time
+
+DEFAULT_TEXT = (
+    "### 1. 현재 성과 요약\n"
+    "로컬 가짜 Bedrock 응답입니다. 실제 모델을 호출하지 않았습니다.\n\n"
+    "### 2. 핵심 인사이트\n"
+    "1. 스트리밍 응답은 첫 조각이 도착하는 즉시 화면에 표시됩니다.\n"
+    "2. 캐시 적중 시에는 저장된 결과가 한 번에 전송됩니다.\n"
+    "3. 이 텍스트는 chunk_size 글자 단위로 나뉘어 전송됩니다.\n"
+)
+
+
+def _event(payload):
+    return {'chunk': {'bytes': json.dumps(payload, ensure_ascii=False).encode()}}
+
+
+class FakeBedrockRuntime:
+    def __init__(self, text=DEFAULT_TEXT, chunk_size=12,
+                 first_token_delay=float(os.environ.get('BEDROCK_FAKE_FIRST_TOKEN_DELAY', '0.3')),
+                 chunk_delay=float(os.environ.get('BEDROCK_FAKE_CHUNK_DELAY', '0.05')),
+                 sleep=time.sleep):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self._sleep = sleep
+        self.calls = []
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.calls.append(('invoke_model', modelId, json.loads(body)))
+        self._sleep(self.first_token_delay + self.chunk_delay * len(self._chunks()))
+        result = {
+            'type': 'message',
+            'role': 'assistant',
+            'model': modelId,
+            'content': [{'type': 'text', 'text': self.text}],
+            'stop_reason': 'end_turn'
+        }
+        return {'body': io.BytesIO(json.dumps(result, ensure_ascii=False).encode())}
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        self.calls.append(('invoke_model_with_response_stream', modelId, json.loads(body)))
+        return {'body': self._stream(modelId)}
+
+    def _chunks(self):
+        return [self.text[i:i + self.chunk_size] for i in range(0, len(self.text), self.chunk_size)]
+
+    def _stream(self, model_id):
+        yield _event({'type': 'message_start', 'message': {'role': 'assistant', 'model': model_id, 'content': []}})
+        yield _event({'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}})
+        self._sleep(self.first_token_delay)
+        for i, piece in enumerate(self._chunks()):
+            if i:
+                self._sleep(self.chunk_delay)
+            yield _event({'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': piece}})
+        yield _event({'type': 'content_block_stop', 'index': 0})
+        yield _event({'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'}})
+        yield _event({'type': 'message_stop'})
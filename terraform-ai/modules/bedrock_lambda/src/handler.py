@@ -1,23 +1,81 @@
 """
 AI 마케팅 인사이트 Lambda 함수
-- DynamoDB에서 실시간 통계 수집
+- DynamoDB에서 실시간 통계 수집 (롤업/사이트 요약 문서, 없으면 전체 스캔 집계)
 - Bedrock(Claude)으로 마케팅 제안 생성
+- 스트리밍 응답(SSE)은 stream_server.py (같은 함수 코드, Lambda Web Adapter + 함수 URL)
 """
 
 import json
 import boto3
+import heapq
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
 
-# AWS 클라이언트
-bedrock = boto3.client('bedrock-runtime', region_name='ap-northeast-2')
-dynamodb = boto3.resource('dynamodb')
+from insight_cache import DynamoDBBackend, InsightCache, LatestInsights, MemoryBackend
+from linksnap_common.aggregate import iter_query, parallel_scan
+from linksnap_common.classify import parse_user_agent, referer_domain
+from linksnap_common.dynamo import dynamodb_resource
+
+# AWS 클라이언트 (BEDROCK_FAKE=true면 로컬 가짜 Bedrock, 네트워크 호출 없음)
+if os.environ.get('BEDROCK_FAKE') == 'true':
+    from fake_bedrock import FakeBedrockRuntime
+    bedrock = FakeBedrockRuntime()
+else:
+    bedrock = boto3.client('bedrock-runtime', region_name='ap-northeast-2')
+# client 기반 Table (linksnap_common.dynamo) → parallel_scan 스레드 간 공유 가능
+dynamodb = dynamodb_resource()
 
 # 환경 변수
 BEDROCK_MODEL = os.environ.get('BEDROCK_MODEL', 'anthropic.claude-3-haiku-20240307-v1:0')
 URLS_TABLE = os.environ.get('URLS_TABLE', 'url-shortener-urls-dev')
-STATS_TABLE = os.environ.get('STATS_TABLE', 'url-shortener-stats-dev')
+CLICKS_TABLE = os.environ.get('CLICKS_TABLE', 'url-shortener-clicks-dev')
+ROLLUPS_TABLE = os.environ.get('ROLLUPS_TABLE', 'url-shortener-rollups-dev')
+# rollups: 사이트 롤업 버킷 + 요약 문서 (읽기 몇 번, 전체 기간) / scan: urls + 클릭 테이블 전체 스캔 집계
+AI_STATS_SOURCE = os.environ.get('AI_STATS_SOURCE', 'scan')
+# 전체 스캔을 나눌 segment 수 (segment마다 스레드 1개, 1이면 순차 스캔)
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '1'))
+
+# none: 매 요청 Bedrock 호출 / memory: 컨테이너 단위 캐시 / dynamodb: INSIGHT_CACHE_TABLE 공유 캐시
+INSIGHT_CACHE_BACKEND = os.environ.get('INSIGHT_CACHE_BACKEND', 'none')
+INSIGHT_CACHE_TABLE = os.environ.get('INSIGHT_CACHE_TABLE', 'linksnap-ai-insights-cache-dev')
+INSIGHT_CACHE_TTL_SECONDS = int(os.environ.get('INSIGHT_CACHE_TTL_SECONDS', '3600'))
+# 캐시 키에 쓰는 통계 반올림 정도 (유효 숫자 자리수, 작을수록 통계가 조금 바뀌어도 같은 키)
+INSIGHT_CACHE_PRECISION = int(os.environ.get('INSIGHT_CACHE_PRECISION', '2'))
+INSIGHT_CACHE_MAXSIZE = int(os.environ.get('INSIGHT_CACHE_MAXSIZE', '64'))
+# true면 요청 시 분석 타입별 최근(사전 계산) 결과를 바로 반환 (refresh=true면 새로 생성), 캐시 백엔드 필요
+INSIGHT_SERVE_PRECOMPUTED = os.environ.get('INSIGHT_SERVE_PRECOMPUTED', 'false') == 'true'
+# 최근 결과 보관 시간 (스케줄이 멈추면 이후 요청은 다시 실시간 생성)
+PRECOMPUTE_TTL_SECONDS = int(os.environ.get('PRECOMPUTE_TTL_SECONDS', '86400'))
+
+ANALYSIS_TYPES = ('full', 'traffic', 'conversion')
+
+# rollups 테이블 레이아웃 (lambda/layers/common의 rollups / site_summary와 동일)
+SITE_SCOPE = '__site__'
+SUMMARY_KEY = {'scope': '__summary__', 'bucket': 'site'}
+DAY_PREFIX = 't#'
+DIMENSION_KEYS = {
+    'hod#': 'hourly_distribution',
+    'dev#': 'device_distribution',
+    'ref#': 'referer_distribution',
+    'cty#': 'country_distribution'
+}
+
+
+def build_cache_backend():
+    if INSIGHT_CACHE_BACKEND == 'dynamodb':
+        return DynamoDBBackend(dynamodb.Table(INSIGHT_CACHE_TABLE))
+    elif INSIGHT_CACHE_BACKEND == 'memory':
+        return MemoryBackend(maxsize=INSIGHT_CACHE_MAXSIZE)
+    return None
+
+
+cache_backend = build_cache_backend()
+insight_cache = InsightCache(
+    cache_backend, ttl=INSIGHT_CACHE_TTL_SECONDS, precision=INSIGHT_CACHE_PRECISION
+) if cache_backend is not None else None
+latest_insights = LatestInsights(cache_backend, ttl=PRECOMPUTE_TTL_SECONDS) if cache_backend is not None else None
 
 
 def decimal_to_float(obj):
@@ -31,66 +89,169 @@ def decimal_to_float(obj):
     return obj
 
 
+def add_count(counts, key, count=1):
+    counts[key] = counts.get(key, 0) + count
+
+
+def fold_click_stats(stats):
+    """클릭 스캔 결과(segment 하나) → 분포 카운트"""
+    partial = {
+        'total_clicks': 0,
+        'url_clicks': {},
+        'referer_distribution': {},
+        'device_distribution': {},
+        'country_distribution': {},
+        'hourly_distribution': {str(h): 0 for h in range(24)}
+    }
+    
+    for stat in stats:
+        partial['total_clicks'] += 1
+        add_count(partial['url_clicks'], stat.get('urlId'))
+
+        # compact 형식(v=2, lambda/layers/common clicks.py): 기록 시점에 분류된 값 그대로
+        if int(stat.get('v', 1)) >= 2:
+            add_count(partial['referer_distribution'], stat.get('ref', 'direct'))
+            add_count(partial['device_distribution'], stat.get('dev', 'desktop'))
+            add_count(partial['country_distribution'], stat.get('cty', 'unknown'))
+            if stat.get('ts') is not None:
+                add_count(partial['hourly_distribution'], str(datetime.utcfromtimestamp(int(stat['ts'])).hour))
+            continue
+        
+        add_count(partial['referer_distribution'], referer_domain(stat.get('referer', 'direct')))
+        add_count(partial['device_distribution'], parse_user_agent(stat.get('userAgent', '')))
+        add_count(partial['country_distribution'], stat.get('country', 'unknown'))
+
+        timestamp = stat.get('timestamp', '')
+        if timestamp:
+            try:
+                add_count(partial['hourly_distribution'], str(datetime.fromisoformat(timestamp).hour))
+            except (ValueError, TypeError):
+                pass
+    
+    return partial
+
+
+def url_click_count(item, url_clicks):
+    """urls.clickCount와 클릭 스캔의 urlId별 합계 중 큰 값 (sharded 카운터면 clickCount는 0으로 남음)"""
+    return max(int(item.get('clickCount', 0)), url_clicks.get(item.get('urlId'), 0))
+
+
+def fold_url_stats(urls, url_clicks):
+    """URL 스캔 결과(segment 하나) → URL 수 + 클릭 상위 5개 (url_clicks: 클릭 스캔의 urlId별 클릭 수)"""
+    partial = {'total_urls': 0}
+
+    def counted(items):
+        for item in items:
+            partial['total_urls'] += 1
+            yield item
+
+    top_urls = heapq.nlargest(5, counted(urls), key=lambda x: url_click_count(x, url_clicks))
+    partial['top_urls'] = [{**url, 'clickCount': url_click_count(url, url_clicks)} for url in top_urls]
+    return partial
+
+
+def merge_stats(url_partials, click_partials):
+    """segment별 부분 집계 병합"""
+    merged = {
+        'total_urls': sum(p['total_urls'] for p in url_partials),
+        'total_clicks': 0,
+        'referer_distribution': {},
+        'device_distribution': {},
+        'country_distribution': {},
+        'hourly_distribution': {str(h): 0 for h in range(24)},
+        'top_urls': heapq.nlargest(
+            5,
+            [url for p in url_partials for url in p['top_urls']],
+            key=lambda x: x.get('clickCount', 0)
+        )
+    }
+    for partial in click_partials:
+        merged['total_clicks'] += partial['total_clicks']
+        for key in ('referer_distribution', 'device_distribution', 'country_distribution', 'hourly_distribution'):
+            for name, count in partial[key].items():
+                add_count(merged[key], name, count)
+    return merged
+
+
+def get_stats_from_rollups():
+    """사이트 요약 문서(URL/클릭 합계, 인기 URL) + 사이트 롤업 차원 버킷으로 통계 구성
+    - 읽기 비용은 테이블 크기가 아니라 버킷 수에 비례, 요약 문서가 없으면 None
+    """
+    table = dynamodb.Table(ROLLUPS_TABLE)
+    summary = table.get_item(Key=SUMMARY_KEY).get('Item')
+    if not summary:
+        return None
+
+    stats = {
+        'total_urls': int(summary.get('totalUrls', 0)),
+        'total_clicks': int(summary.get('totalClicks', 0)),
+        'referer_distribution': {},
+        'device_distribution': {},
+        'country_distribution': {},
+        'hourly_distribution': {str(h): 0 for h in range(24)},
+        'top_urls': summary.get('topUrls', [])[:5]
+    }
+
+    # 일별 버킷(t#...)은 사전순으로 가장 뒤 → 그 앞 범위만 읽으면 시간대/디바이스/유입/국가 버킷
+    buckets = iter_query(
+        table,
+        KeyConditionExpression='#scope = :scope AND #bucket < :day',
+        ExpressionAttributeNames={'#scope': 'scope', '#bucket': 'bucket', '#count': 'count'},
+        ExpressionAttributeValues={':scope': SITE_SCOPE, ':day': DAY_PREFIX},
+        ProjectionExpression='#bucket, #count'
+    )
+    for item in buckets:
+        prefix, _, name = item['bucket'].partition('#')
+        key = DIMENSION_KEYS.get(f"{prefix}#")
+        if key is None:
+            continue
+        if key == 'hourly_distribution':
+            name = str(int(name))
+        stats[key][name] = int(item.get('count', 0))
+
+    return stats
+
+
+def scan_realtime_stats():
+    """urls + 클릭 테이블 전체 스캔 집계 (SCAN_SEGMENTS > 1이면 병렬 스캔 후 병합)
+    - 클릭 테이블을 먼저 스캔해 urlId별 클릭 수로 인기 URL 순위 (sharded 카운터면 urls.clickCount가 0)
+    """
+    click_partials = parallel_scan(
+        dynamodb.Table(CLICKS_TABLE),
+        fold_click_stats,
+        segments=SCAN_SEGMENTS,
+        ProjectionExpression='urlId, #v, referer, userAgent, country, #ts, #cts, dev, #ref, cty',
+        ExpressionAttributeNames={'#v': 'v', '#ts': 'timestamp', '#cts': 'ts', '#ref': 'ref'}
+    )
+    url_clicks = {}
+    for partial in click_partials:
+        for url_id, count in partial['url_clicks'].items():
+            add_count(url_clicks, url_id, count)
+
+    url_partials = parallel_scan(
+        dynamodb.Table(URLS_TABLE),
+        lambda urls: fold_url_stats(urls, url_clicks),
+        segments=SCAN_SEGMENTS
+    )
+    return merge_stats(url_partials, click_partials)
+
+
 def get_realtime_stats_from_dynamodb():
-    """DynamoDB에서 실시간 통계 가져오기"""
+    """DynamoDB에서 실시간 통계 가져오기 (AI_STATS_SOURCE=rollups면 사전 집계, 없으면 전체 스캔)"""
     try:
-        urls_table = dynamodb.Table(URLS_TABLE)
-        stats_table = dynamodb.Table(STATS_TABLE)
-        
-        urls_response = urls_table.scan()
-        urls = urls_response.get('Items', [])
-        
-        stats_response = stats_table.scan()
-        stats = stats_response.get('Items', [])
-        
-        referer_counts = {}
-        device_counts = {}
-        country_counts = {}
-        hourly_counts = {str(h): 0 for h in range(24)}
-        
-        for stat in stats:
-            referer = stat.get('referer', 'direct')
-            if referer in ['direct', 'unknown', '']:
-                referer = 'direct'
-            referer_counts[referer] = referer_counts.get(referer, 0) + 1
-            
-            ua = stat.get('userAgent', '').lower()
-            if 'mobile' in ua or 'android' in ua or 'iphone' in ua:
-                device = 'mobile'
-            elif 'tablet' in ua or 'ipad' in ua:
-                device = 'tablet'
-            else:
-                device = 'desktop'
-            device_counts[device] = device_counts.get(device, 0) + 1
-            
-            country = stat.get('country', 'unknown')
-            country_counts[country] = country_counts.get(country, 0) + 1
-
-            timestamp = stat.get('timestamp', '')
-            if timestamp:
-                try:
-                    hour = datetime.fromisoformat(timestamp).hour
-                    hourly_counts[str(hour)] = hourly_counts.get(str(hour), 0) + 1
-                except:
-                    pass
-        
-        return decimal_to_float({
-            'total_urls': len(urls),
-            'total_clicks': len(stats),
-            'referer_distribution': referer_counts,
-            'device_distribution': device_counts,
-            'country_distribution': country_counts,
-            'hourly_distribution': hourly_counts,
-            'top_urls': sorted(urls, key=lambda x: x.get('clickCount', 0), reverse=True)[:5]
-        })
+        if AI_STATS_SOURCE == 'rollups':
+            stats = get_stats_from_rollups()
+            if stats is not None:
+                return decimal_to_float({**stats, 'source': 'rollups'})
+            print("[WARN] 사이트 요약 문서 없음 → 전체 스캔으로 집계")
+        return decimal_to_float({**scan_realtime_stats(), 'source': 'scan'})
     except Exception as e:
         print(f"DynamoDB 데이터 로드 실패: {e}")
         return None
 
 
-def invoke_bedrock(prompt):
-    """Bedrock Claude 모델 호출"""
-    body = json.dumps({
+def bedrock_request_body(prompt):
+    return json.dumps({
         "anthropic_version": "bedrock-2023-05-31",
         "max_tokens": 2048,
         "messages": [
@@ -100,10 +261,13 @@ def invoke_bedrock(prompt):
             }
         ]
     })
-    
+
+
+def invoke_bedrock(prompt):
+    """Bedrock Claude 모델 호출"""
     response = bedrock.invoke_model(
         modelId=BEDROCK_MODEL,
-        body=body,
+        body=bedrock_request_body(prompt),
         contentType='application/json',
         accept='application/json'
     )
@@ -112,6 +276,24 @@ def invoke_bedrock(prompt):
     return result['content'][0]['text']
 
 
+def stream_bedrock(prompt):
+    """Bedrock Claude 스트리밍 호출: 생성되는 텍스트 조각을 도착하는 대로 yield"""
+    response = bedrock.invoke_model_with_response_stream(
+        modelId=BEDROCK_MODEL,
+        body=bedrock_request_body(prompt),
+        contentType='application/json',
+        accept='application/json'
+    )
+    
+    for event in response['body']:
+        chunk = event.get('chunk')
+        if not chunk:
+            continue
+        payload = json.loads(chunk['bytes'])
+        if payload.get('type') == 'content_block_delta' and payload['delta'].get('type') == 'text_delta':
+            yield payload['delta']['text']
+
+
 # ============================================================
 # 프롬프트 빌더
 # ============================================================
@@ -249,43 +431,163 @@ def build_conversion_prompt(realtime_data):
 # 메인 핸들러
 # ============================================================
 
+def parse_body(event):
+    body = event.get('body', '{}')
+    if isinstance(body, str):
+        body = json.loads(body) if body else {}
+    return body
+
+
+def build_prompt(analysis_type, realtime_data):
+    """분석 타입별 프롬프트 생성"""
+    if analysis_type == 'traffic':
+        return build_traffic_prompt(realtime_data)
+    elif analysis_type == 'conversion':
+        return build_conversion_prompt(realtime_data)
+    else:  # full
+        return build_full_prompt(realtime_data)
+
+
+def is_refresh(event, body):
+    """refresh=true (body 또는 쿼리 문자열): 사전 계산/캐시 결과 대신 새로 생성"""
+    query = event.get('queryStringParameters') or {}
+    return str(body.get('refresh', query.get('refresh', 'false'))).lower() == 'true'
+
+
+def collect_realtime_data():
+    return get_realtime_stats_from_dynamodb() or {
+        'total_urls': 0, 'total_clicks': 0,
+        'referer_distribution': {}, 'device_distribution': {},
+        'country_distribution': {}, 'hourly_distribution': {}
+    }
+
+
+def new_insight(analysis_type, realtime_data):
+    return {
+        'analysis_type': analysis_type,
+        'realtime_data': realtime_data,
+        'prompt': build_prompt(analysis_type, realtime_data),
+        'cache_key': None,
+        'cached': None,
+        'precomputed': False
+    }
+
+
+def prepare_insight(analysis_type, function_name='local', refresh=False):
+    """(사전 계산 결과) → 통계 수집 → 프롬프트 → 캐시 조회 (일반/스트리밍 응답 공통)"""
+    # 분석 타입별 최근 결과가 있으면 통계 수집/Bedrock 호출 없이 바로 사용
+    if INSIGHT_SERVE_PRECOMPUTED and not refresh and latest_insights is not None:
+        latest = latest_insights.get(analysis_type)
+        if latest is not None:
+            return {
+                'analysis_type': analysis_type,
+                'realtime_data': latest['realtime_data'],
+                'prompt': None,
+                'cache_key': None,
+                'cached': latest,
+                'precomputed': True
+            }
+    
+    insight = new_insight(analysis_type, collect_realtime_data())
+    
+    # 같은 분석 타입/모델/반올림 통계의 저장된 결과가 있으면 Bedrock 호출 생략
+    if insight_cache is not None:
+        stats_for_key = {k: v for k, v in insight['realtime_data'].items() if k != 'source'}
+        insight['cache_key'] = insight_cache.key(analysis_type, BEDROCK_MODEL, stats_for_key)
+        if not refresh:
+            insight['cached'] = insight_cache.get(insight['cache_key'])
+            insight_cache.emit_metric(insight['cached'] is not None, 'LinkSnap/AI', function_name)
+    
+    return insight
+
+
+def store_insight(insight, ai_response):
+    """새로 생성한 인사이트를 캐시/최근 결과에 저장하고 생성 시각 반환"""
+    generated_at = datetime.utcnow().isoformat()
+    if insight_cache is not None:
+        insight_cache.put(insight['cache_key'], {'ai_insights': ai_response, 'generated_at': generated_at})
+    if latest_insights is not None:
+        latest_insights.put(insight['analysis_type'], {
+            'ai_insights': ai_response,
+            'generated_at': generated_at,
+            'realtime_data': insight['realtime_data']
+        })
+    return generated_at
+
+
+def precompute_insights(analysis_types=ANALYSIS_TYPES):
+    """스케줄 실행: 통계는 한 번만 수집하고 분석 타입별 Bedrock 호출은 동시에 → 결과를 생성 시각과 함께 저장"""
+    realtime_data = collect_realtime_data()
+    insights = [new_insight(analysis_type, realtime_data) for analysis_type in analysis_types]
+    if insight_cache is not None:
+        stats_for_key = {k: v for k, v in realtime_data.items() if k != 'source'}
+        for insight in insights:
+            insight['cache_key'] = insight_cache.key(insight['analysis_type'], BEDROCK_MODEL, stats_for_key)
+
+    def generate(insight):
+        try:
+            return invoke_bedrock(insight['prompt']), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=len(insights)) as executor:
+        responses = list(executor.map(generate, insights))
+
+    # 저장은 메인 스레드에서
+    results = {}
+    for insight, (ai_response, error) in zip(insights, responses):
+        if error is not None:
+            print(f"[WARN] 인사이트 사전 계산 실패 ({insight['analysis_type']}): {error}")
+            results[insight['analysis_type']] = {'error': str(error)}
+            continue
+        results[insight['analysis_type']] = {'generated_at': store_insight(insight, ai_response)}
+    return results
+
+
+def data_summary(realtime_data):
+    return {
+        'total_urls': realtime_data.get('total_urls', 0),
+        'total_clicks': realtime_data.get('total_clicks', 0),
+        'top_referers': list(realtime_data.get('referer_distribution', {}).keys())[:5],
+        'top_devices': list(realtime_data.get('device_distribution', {}).keys()),
+        'countries': list(realtime_data.get('country_distribution', {}).keys())[:10],
+    }
+
+
+def cache_info(insight):
+    if insight_cache is None:
+        return None
+    return {'hit': insight['cached'] is not None, 'precomputed': insight['precomputed'], **insight_cache.stats()}
+
+
 def handler(event, context):
+    # EventBridge 스케줄: 3가지 분석 타입 사전 계산
+    if event.get('precompute'):
+        results = precompute_insights(event.get('types') or ANALYSIS_TYPES)
+        print(json.dumps({'precomputed': results}, ensure_ascii=False))
+        return results
+
     try:
         # 1. 요청 파싱
-        body = event.get('body', '{}')
-        if isinstance(body, str):
-            body = json.loads(body) if body else {}
-        
+        body = parse_body(event)
         analysis_type = body.get('type', 'full')
 
-        # 2. DynamoDB에서 실시간 데이터 수집
-        realtime_data = get_realtime_stats_from_dynamodb() or {
-            'total_urls': 0, 'total_clicks': 0,
-            'referer_distribution': {}, 'device_distribution': {},
-            'country_distribution': {}, 'hourly_distribution': {}
-        }
-        
-        # 3. 분석 타입별 프롬프트 생성
-        if analysis_type == 'traffic':
-            prompt = build_traffic_prompt(realtime_data)
-        elif analysis_type == 'conversion':
-            prompt = build_conversion_prompt(realtime_data)
-        else:  # full
-            prompt = build_full_prompt(realtime_data)
+        # 2~3. (사전 계산 결과 또는) DynamoDB에서 실시간 데이터 수집 → 분석 타입별 프롬프트 생성 (+ 캐시 조회)
+        insight = prepare_insight(analysis_type, getattr(context, 'function_name', 'local'), is_refresh(event, body))
+        realtime_data = insight['realtime_data']
         
-        # 4. Bedrock 호출
-        ai_response = invoke_bedrock(prompt)
+        # 4. Bedrock 호출 (캐시 적중이면 저장된 결과 재사용)
+        if insight['cached'] is not None:
+            ai_response = insight['cached']['ai_insights']
+            generated_at = insight['cached']['generated_at']
+        else:
+            ai_response = invoke_bedrock(insight['prompt'])
+            generated_at = store_insight(insight, ai_response)
         
         # 5. 응답 반환
         response_body = {
             'analysis_type': analysis_type,
-            'data_summary': {
-                'total_urls': realtime_data.get('total_urls', 0),
-                'total_clicks': realtime_data.get('total_clicks', 0),
-                'top_referers': list(realtime_data.get('referer_distribution', {}).keys())[:5],
-                'top_devices': list(realtime_data.get('device_distribution', {}).keys()),
-                'countries': list(realtime_data.get('country_distribution', {}).keys())[:10],
-            },
+            'data_summary': data_summary(realtime_data),
             'model_info': {
                 'loaded': False,
                 'type': 'bedrock-claude',
@@ -298,8 +600,10 @@ def handler(event, context):
             'segmentation_summary': None,
             'product_summary': None,
             'ai_insights': ai_response,
-            'generated_at': datetime.utcnow().isoformat(),
-            'data_source': 'realtime'
+            'generated_at': generated_at,
+            'data_source': 'realtime',
+            'stats_source': realtime_data.get('source'),
+            'cache': cache_info(insight)
         }
 
         return {
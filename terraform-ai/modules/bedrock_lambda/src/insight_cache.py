@@ -0,0 +1,171 @@
+"""
+AI 인사이트 응답 캐시
+- 키: (analysis_type, 모델, 집계 통계를 유효 숫자 N자리로 반올림한 값의 해시)
+  → 통계가 거의 그대로면 같은 키 → Bedrock 호출 없이 저장된 인사이트 반환
+- 백엔드 교체 가능: MemoryBackend(컨테이너 단위) / DynamoDBBackend(컨테이너 간 공유, TTL 속성으로 만료)
+- 적중률은 컨테이너 카운터 + CloudWatch Embedded Metric Format 로그로 보고
+- LatestInsights: 분석 타입별 가장 최근 생성 결과 (주기적 사전 계산 결과를 즉시 응답할 때 사용)
+"""
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+
+
+def bucket_value(value, precision):
+    """숫자를 유효 숫자 precision자리로 반올림 (dict/list는 재귀, 그 외 값은 그대로)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        if value == 0 or precision <= 0:
+            return value
+        digits = int(math.floor(math.log10(abs(value)))) + 1
+        rounded = round(value, precision - digits)
+        return int(rounded) if float(rounded).is_integer() else rounded
+    if isinstance(value, dict):
+        return {key: bucket_value(v, precision) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [bucket_value(v, precision) for v in value]
+    return value
+
+
+def fingerprint(stats, precision):
+    """반올림한 통계의 sha256 (키 순서와 무관)"""
+    canonical = json.dumps(bucket_value(stats, precision), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class MemoryBackend:
+    """컨테이너 메모리 LRU + TTL (cold start마다 비어 있음)"""
+
+    def __init__(self, maxsize=64, clock=time.time):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if self._clock() >= expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, ttl):
+        self._entries[key] = (value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class DynamoDBBackend:
+    """DynamoDB 테이블 (PK cacheKey, ttl = 만료 epoch 초)
+    TTL 삭제는 지연될 수 있으므로 읽을 때도 만료 여부 확인
+    """
+
+    def __init__(self, table, clock=time.time):
+        self.table = table
+        self._clock = clock
+
+    def get(self, key):
+        item = self.table.get_item(Key={'cacheKey': key}).get('Item')
+        if not item or int(item.get('ttl', 0)) <= self._clock():
+            return None
+        return json.loads(item['value'])
+
+    def put(self, key, value, ttl):
+        self.table.put_item(Item={
+            'cacheKey': key,
+            'value': json.dumps(value, ensure_ascii=False),
+            'ttl': int(self._clock() + ttl)
+        })
+
+
+class InsightCache:
+    def __init__(self, backend, ttl=3600, precision=2):
+        self.backend = backend
+        self.ttl = ttl
+        self.precision = precision
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def key(self, analysis_type, model, stats):
+        return f"{analysis_type}#{model}#{fingerprint(stats, self.precision)}"
+
+    def get(self, key):
+        """저장된 응답 (없거나 만료·백엔드 오류면 None → 호출 측이 새로 생성)"""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"[WARN] 인사이트 캐시 조회 실패: {e}")
+            self.errors += 1
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        try:
+            self.backend.put(key, value, self.ttl)
+        except Exception as e:
+            print(f"[WARN] 인사이트 캐시 저장 실패: {e}")
+            self.errors += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def emit_metric(self, hit, namespace, function_name):
+        """요청 1건의 적중 여부를 CloudWatch Embedded Metric Format 로그로 출력 (HitRate = 평균(Hit))"""
+        print(json.dumps({
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': namespace,
+                    'Dimensions': [['FunctionName']],
+                    'Metrics': [{'Name': 'InsightCacheHit', 'Unit': 'Count'}]
+                }]
+            },
+            'FunctionName': function_name,
+            'InsightCacheHit': 1 if hit else 0,
+            'insightCache': self.stats()
+        }))
+
+
+class LatestInsights:
+    """분석 타입별 최근 결과 (같은 백엔드, 키 latest#{analysis_type}, 새로 생성할 때마다 교체)"""
+
+    KEY_PREFIX = 'latest#'
+
+    def __init__(self, backend, ttl=86400):
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, analysis_type):
+        try:
+            return self.backend.get(f"{self.KEY_PREFIX}{analysis_type}")
+        except Exception as e:
+            print(f"[WARN] 최근 인사이트 조회 실패 ({analysis_type}): {e}")
+            return None
+
+    def put(self, analysis_type, value):
+        try:
+            self.backend.put(f"{self.KEY_PREFIX}{analysis_type}", value, self.ttl)
+        except Exception as e:
+            print(f"[WARN] 최근 인사이트 저장 실패 ({analysis_type}): {e}")
@@ -0,0 +1,3 @@
+#!/bin/sh
+# Lambda Web Adapter 진입점: SSE 스트리밍 서버 실행 (stream_server.py)
+exec python3 stream_server.py
@@ -0,0 +1,115 @@
+"""
+AI 인사이트 스트리밍 응답 서버 (Server-Sent Events)
+- Python Lambda 런타임은 응답 스트리밍을 직접 지원하지 않음
+  → Lambda Web Adapter 레이어(AWS_LWA_INVOKE_MODE=response_stream)가 함수 URL(RESPONSE_STREAM) 요청을
+    이 HTTP 서버로 전달하고, 서버가 쓰는 청크를 그대로 클라이언트에 흘려보냄
+- 로컬: BEDROCK_FAKE=true python stream_server.py → curl -N -X POST localhost:8080/insights/stream -d '{"type":"traffic"}'
+
+이벤트 순서
+  event: meta   분석 타입, 데이터 요약, 캐시 적중 여부
+  event: delta  {"text": "..."} 생성되는 텍스트 조각 (캐시 적중이면 전체 텍스트 1번)
+  event: done   {"generated_at": "...", "cache": {...}}
+  event: error  {"error": "..."} (스트림 도중 실패)
+"""
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import handler as insights
+
+PORT = int(os.environ.get('AWS_LWA_PORT', os.environ.get('PORT', '8080')))
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+def stream_insight(analysis_type, function_name='local', refresh=False):
+    """SSE 이벤트(bytes)를 순서대로 yield"""
+    insight = insights.prepare_insight(analysis_type, function_name, refresh)
+    realtime_data = insight['realtime_data']
+    yield sse('meta', {
+        'analysis_type': analysis_type,
+        'data_summary': insights.data_summary(realtime_data),
+        'stats_source': realtime_data.get('source'),
+        'cached': insight['cached'] is not None,
+        'precomputed': insight['precomputed']
+    })
+
+    if insight['cached'] is not None:
+        yield sse('delta', {'text': insight['cached']['ai_insights']})
+        generated_at = insight['cached']['generated_at']
+    else:
+        pieces = []
+        for text in insights.stream_bedrock(insight['prompt']):
+            pieces.append(text)
+            yield sse('delta', {'text': text})
+        generated_at = insights.store_insight(insight, ''.join(pieces))
+
+    yield sse('done', {'generated_at': generated_at, 'cache': insights.cache_info(insight)})
+
+
+class InsightStreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _params(self):
+        """(분석 타입, refresh) - 쿼리 문자열 또는 JSON body"""
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}') if length else {}
+        analysis_type = body.get('type', query.get('type')) or 'full'
+        return analysis_type, insights.is_refresh({'queryStringParameters': query}, body)
+
+    def _stream(self):
+        try:
+            analysis_type, refresh = self._params()
+        except ValueError:
+            self.send_error(400, 'invalid JSON body')
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'local')
+        try:
+            for event in stream_insight(analysis_type, function_name, refresh):
+                self._write_chunk(event)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 먼저 끊음 (생성 중단, 캐시에는 저장 안 됨)
+            return
+        except Exception as e:
+            print(f"[WARN] 인사이트 스트리밍 실패: {e}")
+            self._write_chunk(sse('error', {'error': str(e)}))
+        self._write_chunk(b'')
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            body = b'{"status": "ok"}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self._stream()
+
+    def do_POST(self):
+        self._stream()
+
+
+def main():
+    server = ThreadingHTTPServer(('0.0.0.0', PORT), InsightStreamHandler)
+    print(f"insights stream server listening on :{PORT}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -24,8 +24,49 @@ variable "urls_table_name" {
   default     = ""
 }
 
-variable "stats_table_name" {
-  description = "Stats DynamoDB 테이블 이름"
+variable "clicks_table_name" {
+  description = "Clicks DynamoDB 테이블 이름 (클릭 로그)"
   type        = string
   default     = ""
 }
+
+variable "rollups_table_name" {
+  description = "Rollups DynamoDB 테이블 이름 (사이트 롤업 버킷 + 요약 문서)"
+  type        = string
+  default     = ""
+}
+
+variable "cache_table_name" {
+  description = "AI 인사이트 캐시 DynamoDB 테이블 이름"
+  type        = string
+}
+
+variable "insight_cache_ttl_seconds" {
+  description = "AI 인사이트 캐시 유지 시간 (초), 0이면 저장 안 함"
+  type        = number
+  default     = 3600
+}
+
+variable "enable_streaming" {
+  description = "SSE 스트리밍 인사이트 함수 + 함수 URL 생성 여부"
+  type        = bool
+  default     = true
+}
+
+variable "web_adapter_layer_arn" {
+  description = "Lambda Web Adapter 레이어 ARN (리전/아키텍처별, x86_64)"
+  type        = string
+  default     = "arn:aws:lambda:ap-northeast-2:753240598075:layer:LambdaAdapterLayerX86:24"
+}
+
+variable "precompute_schedule" {
+  description = "AI 인사이트 사전 계산 주기 (EventBridge schedule expression)"
+  type        = string
+  default     = "rate(1 hour)"
+}
+
+variable "precompute_ttl_seconds" {
+  description = "사전 계산 결과 보관 시간 (초), 지나면 요청 시 실시간 생성"
+  type        = number
+  default     = 86400
+}
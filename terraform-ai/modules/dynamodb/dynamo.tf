@@ -0,0 +1,20 @@
+# AI 인사이트 응답 캐시 (cacheKey = {analysis_type}#{model}#{통계 해시}, ttl = 만료 epoch 초)
+resource "aws_dynamodb_table" "insights_cache" {
+  name         = "${var.project_name}-insights-cache-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "cacheKey"
+
+  attribute {
+    name = "cacheKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${var.project_name}-insights-cache-${var.environment}"
+  }
+}
@@ -0,0 +1,9 @@
+output "insights_cache_table_name" {
+  description = "AI 인사이트 캐시 테이블 이름"
+  value       = aws_dynamodb_table.insights_cache.name
+}
+
+output "insights_cache_table_arn" {
+  description = "AI 인사이트 캐시 테이블 ARN"
+  value       = aws_dynamodb_table.insights_cache.arn
+}
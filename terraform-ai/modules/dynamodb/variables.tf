@@ -0,0 +1,9 @@
+variable "project_name" {
+  description = "프로젝트 이름"
+  type        = string
+}
+
+variable "environment" {
+  description = "환경 (dev, prod)"
+  type        = string
+}
@@ -70,7 +70,18 @@ resource "aws_iam_role_policy" "lambda_dynamodb" {
         ]
         Resource = [
           var.urls_table_arn,
-          var.stats_table_arn
+          var.clicks_table_arn,
+          var.rollups_table_arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem"
+        ]
+        Resource = [
+          var.cache_table_arn
         ]
       }
     ]
@@ -18,7 +18,17 @@ variable "urls_table_arn" {
   type        = string
 }
 
-variable "stats_table_arn" {
-  description = "Stats DynamoDB 테이블 ARN"
+variable "clicks_table_arn" {
+  description = "Clicks DynamoDB 테이블 ARN (클릭 로그)"
+  type        = string
+}
+
+variable "rollups_table_arn" {
+  description = "Rollups DynamoDB 테이블 ARN (사이트 롤업 버킷 + 요약 문서)"
+  type        = string
+}
+
+variable "cache_table_arn" {
+  description = "AI 인사이트 캐시 DynamoDB 테이블 ARN"
   type        = string
 }
@@ -8,6 +8,11 @@ output "ai_api_endpoint" {
   value       = module.apigateway.api_endpoint
 }
 
+output "ai_stream_url" {
+  description = "AI 인사이트 SSE 스트리밍 함수 URL"
+  value       = module.bedrock_lambda.stream_function_url
+}
+
 output "lambda_function_name" {
   description = "Bedrock Lambda 함수 이름"
   value       = module.bedrock_lambda.lambda_function_name
@@ -27,6 +32,11 @@ output "next_steps" {
       -H "Content-Type: application/json" \
       -d '{"type": "full"}'
 
+    스트리밍 (SSE):
+    curl -N -X POST ${module.bedrock_lambda.stream_function_url} \
+      -H "Content-Type: application/json" \
+      -d '{"type": "traffic"}'
+
     분석 타입:
     - full: 종합 분석
     - traffic: 트래픽 패턴 분석
@@ -6,6 +6,7 @@ import json
 import os
 import uuid
 import hashlib
+import heapq
 import time
 import urllib.request
 from datetime import datetime, timedelta
@@ -100,18 +101,14 @@ def redirect(short_code: str, request: Request):
 # ── GET /stats ──
 @app.get("/stats")
 def get_site_stats():
-    all_urls = _scan_table(urls_table)
-    all_clicks = _scan_table(stats_table)
-
-    total_clicks = sum(int(u.get("clickCount", 0)) for u in all_urls)
-
     now = datetime.utcnow()
     today = now.date()
     yesterday = today - timedelta(days=1)
     today_clicks = 0
     yesterday_clicks = 0
 
-    for click in all_clicks:
+    # 클릭은 페이지 단위로 흘려보내며 날짜만 센다 (전체 목록을 메모리에 두지 않음)
+    for click in _iter_scan(stats_table, ProjectionExpression="#ts", ExpressionAttributeNames={"#ts": "timestamp"}):
         try:
             click_date = datetime.fromisoformat(click.get("timestamp", "")).date()
             if click_date == today:
@@ -130,17 +127,26 @@ def get_site_stats():
             "createdAt": url.get("createdAt"),
         }
 
-    sorted_by_clicks = sorted(all_urls, key=lambda x: int(x.get("clickCount", 0)), reverse=True)
-    sorted_by_date = sorted(all_urls, key=lambda x: x.get("createdAt", ""), reverse=True)
+    # URL은 요약 필드만 남기고 누적 (allUrls 응답에 필요한 만큼만 유지)
+    total_urls = 0
+    total_clicks = 0
+    summaries = []
+    for url in _iter_scan(urls_table):
+        summary = _url_summary(url)
+        total_urls += 1
+        total_clicks += summary["clickCount"]
+        summaries.append(summary)
+
+    sorted_by_clicks = sorted(summaries, key=lambda x: x["clickCount"], reverse=True)
 
     return {
-        "totalUrls": len(all_urls),
+        "totalUrls": total_urls,
         "totalClicks": total_clicks,
         "todayClicks": today_clicks,
         "yesterdayClicks": yesterday_clicks,
-        "popularUrls": [_url_summary(u) for u in sorted_by_clicks[:10]],
-        "recentUrls": [_url_summary(u) for u in sorted_by_date[:10]],
-        "allUrls": [_url_summary(u) for u in sorted_by_clicks],
+        "popularUrls": sorted_by_clicks[:10],
+        "recentUrls": heapq.nlargest(10, summaries, key=lambda x: x.get("createdAt") or ""),
+        "allUrls": sorted_by_clicks,
     }
 
 
@@ -205,26 +211,24 @@ def _record_click(short_code: str, request: Request):
         print(f"[WARN] stats record failed (shortCode={short_code}): {e}")
 
 
-def _scan_table(table):
-    response = table.scan()
-    items = response.get("Items", [])
-    while "LastEvaluatedKey" in response:
-        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-        items.extend(response.get("Items", []))
-    return items
+def _iter_scan(table, **scan_kwargs):
+    """스캔 결과를 아이템 단위로 (메모리에는 한 페이지만)"""
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
 
 def _get_click_stats(url_id: str):
     from boto3.dynamodb.conditions import Key
-    response = stats_table.scan(FilterExpression=Key("statsId").begins_with(f"{url_id}#"))
-    items = response.get("Items", [])
-    while "LastEvaluatedKey" in response:
-        response = stats_table.scan(
-            FilterExpression=Key("statsId").begins_with(f"{url_id}#"),
-            ExclusiveStartKey=response["LastEvaluatedKey"],
-        )
-        items.extend(response.get("Items", []))
-    return items
+    return _iter_scan(
+        stats_table,
+        FilterExpression=Key("statsId").begins_with(f"{url_id}#"),
+        ProjectionExpression="#ts, userAgent, referer",
+        ExpressionAttributeNames={"#ts": "timestamp"},
+    )
 
 
 def _parse_user_agent(user_agent: str) -> str:
@@ -245,10 +249,12 @@ def _calculate_stats(click_items):
     daily = defaultdict(int)
     devices = defaultdict(int)
     referers = defaultdict(int)
+    total_clicks = 0
     today_clicks = 0
     yesterday_clicks = 0
 
     for item in click_items:
+        total_clicks += 1
         try:
             ts = datetime.fromisoformat(item.get("timestamp", ""))
             hourly[ts.hour] += 1
@@ -272,7 +278,7 @@ def _calculate_stats(click_items):
             referers["direct"] += 1
 
     return {
-        "totalClicks": len(click_items),
+        "totalClicks": total_clicks,
         "todayClicks": today_clicks,
         "yesterdayClicks": yesterday_clicks,
         "hourlyClicks": [{"hour": h, "clicks": hourly[h]} for h in range(24)],
@@ -32,23 +32,66 @@ module "apigateway" {
 
   create_short_url_invoke_arn    = module.lambda.create_short_url_invoke_arn
   create_short_url_function_name = module.lambda.create_short_url_function_name
+  shorten_batch_invoke_arn       = module.lambda.shorten_batch_invoke_arn
+  shorten_batch_function_name    = module.lambda.shorten_batch_function_name
   redirect_invoke_arn            = module.lambda.redirect_invoke_arn
   redirect_function_name         = module.lambda.redirect_function_name
   get_url_stats_invoke_arn       = module.lambda.get_url_stats_invoke_arn
   get_url_stats_function_name    = module.lambda.get_url_stats_function_name
   get_site_stats_invoke_arn      = module.lambda.get_site_stats_invoke_arn
   get_site_stats_function_name   = module.lambda.get_site_stats_function_name
+  list_urls_invoke_arn           = module.lambda.list_urls_invoke_arn
+  list_urls_function_name        = module.lambda.list_urls_function_name
 }
 
 
 # Lambda 모듈
 module "lambda" {
-  source           = "./modules/lambda"
+  source              = "./modules/lambda"
+  project_name        = var.project_name
+  environment         = var.environment
+  lambda_role_arn     = module.iam.lambda_role_arn
+  urls_table_name     = module.dynamodb.urls_table_name
+  counters_table_name = module.dynamodb.counters_table_name
+  clicks_table_name   = module.dynamodb.clicks_table_name
+  rollups_table_name  = module.dynamodb.rollups_table_name
+  dedup_table_name    = module.dynamodb.dedup_table_name
+  click_queue_url     = module.sqs.click_queue_url
+  click_queue_arn     = module.sqs.click_queue_arn
+  archive_url         = "s3://${module.archive.bucket_name}"
+
+  # CDN을 켜면 리다이렉트는 엣지 캐시 허용(s-maxage) + 클릭은 엣지 로그에서 집계
+  click_source             = var.enable_cdn ? "edge" : "origin"
+  redirect_default_max_age = var.enable_cdn ? var.redirect_default_max_age : 0
+}
+
+# CloudFront CDN 모듈 (리다이렉트 엣지 캐시 + 액세스 로그 → 클릭 집계)
+module "cdn" {
+  count  = var.enable_cdn ? 1 : 0
+  source = "./modules/cdn"
+
+  project_name                    = var.project_name
+  environment                     = var.environment
+  aws_region                      = var.aws_region
+  api_id                          = module.apigateway.api_id
+  lambda_role_name                = module.iam.lambda_role_name
+  edge_log_consumer_arn           = module.lambda.edge_log_consumer_arn
+  edge_log_consumer_function_name = module.lambda.edge_log_consumer_function_name
+}
+
+# 원시 클릭 보관 모듈 (clicks 테이블 TTL 전에 S3로 보관)
+module "archive" {
+  source           = "./modules/archive"
   project_name     = var.project_name
   environment      = var.environment
-  lambda_role_arn  = module.iam.lambda_role_arn
-  urls_table_name  = module.dynamodb.urls_table_name
-  stats_table_name = module.dynamodb.stats_table_name
+  lambda_role_name = module.iam.lambda_role_name
+}
+
+# SQS 모듈 (클릭 이벤트 큐)
+module "sqs" {
+  source       = "./modules/sqs"
+  project_name = var.project_name
+  environment  = var.environment
 }
 
 # DynamoDB 모듈
@@ -60,11 +103,16 @@ module "dynamodb" {
 
 # IAM 모듈
 module "iam" {
-  source          = "./modules/iam"
-  project_name    = var.project_name
-  environment     = var.environment
-  urls_table_arn  = module.dynamodb.urls_table_arn
-  stats_table_arn = module.dynamodb.stats_table_arn
+  source             = "./modules/iam"
+  project_name       = var.project_name
+  environment        = var.environment
+  urls_table_arn     = module.dynamodb.urls_table_arn
+  stats_table_arn    = module.dynamodb.stats_table_arn
+  counters_table_arn = module.dynamodb.counters_table_arn
+  clicks_table_arn   = module.dynamodb.clicks_table_arn
+  rollups_table_arn  = module.dynamodb.rollups_table_arn
+  dedup_table_arn    = module.dynamodb.dedup_table_arn
+  click_queue_arn    = module.sqs.click_queue_arn
 }
 
 # Route 53 + 커스텀 도메인 모듈
@@ -89,9 +137,15 @@ module "cloudwatch" {
   # 모니터링할 Lambda 함수 목록
   lambda_function_names = [
     module.lambda.create_short_url_function_name,
+    module.lambda.shorten_batch_function_name,
     module.lambda.redirect_function_name,
+    module.lambda.click_consumer_function_name,
+    module.lambda.edge_log_consumer_function_name,
     module.lambda.get_url_stats_function_name,
-    module.lambda.get_site_stats_function_name
+    module.lambda.get_site_stats_function_name,
+    module.lambda.list_urls_function_name,
+    module.lambda.reconcile_site_summary_function_name,
+    module.lambda.compact_clicks_function_name
   ]
 
   # Discord Webhook URL
@@ -6,7 +6,7 @@ resource "aws_apigatewayv2_api" "main" {
   cors_configuration {
     allow_origins = ["*"]
     allow_methods = ["GET", "POST", "OPTIONS"]
-    allow_headers = ["Content-Type"]
+    allow_headers = ["Content-Type", "Idempotency-Key"]
   }
 }
 
@@ -31,6 +31,20 @@ resource "aws_apigatewayv2_route" "create_short_url" {
   target    = "integrations/${aws_apigatewayv2_integration.create_short_url.id}"
 }
 
+# Lambda 연결 1-1: POST /shorten/batch (일괄 단축)
+resource "aws_apigatewayv2_integration" "shorten_batch" {
+  api_id                 = aws_apigatewayv2_api.main.id
+  integration_type       = "AWS_PROXY"
+  integration_uri        = var.shorten_batch_invoke_arn
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "shorten_batch" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /shorten/batch"
+  target    = "integrations/${aws_apigatewayv2_integration.shorten_batch.id}"
+}
+
 # Lambda 연결 2: GET /{shortCode} (리다이렉트)
 resource "aws_apigatewayv2_integration" "redirect" {
   api_id                 = aws_apigatewayv2_api.main.id
@@ -45,6 +59,13 @@ resource "aws_apigatewayv2_route" "redirect" {
   target    = "integrations/${aws_apigatewayv2_integration.redirect.id}"
 }
 
+# HEAD /{shortCode}: 링크 확인/메일 스캐너 요청도 같은 리다이렉트 응답 (클릭으로는 세지 않음, BOT_FILTER_MODE)
+resource "aws_apigatewayv2_route" "redirect_head" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "HEAD /{shortCode}"
+  target    = "integrations/${aws_apigatewayv2_integration.redirect.id}"
+}
+
 # Lambda 연결 3: GET /stats/{shortCode} (URL별 통계)
 resource "aws_apigatewayv2_integration" "get_url_stats" {
   api_id                 = aws_apigatewayv2_api.main.id
@@ -73,6 +94,20 @@ resource "aws_apigatewayv2_route" "get_site_stats" {
   target    = "integrations/${aws_apigatewayv2_integration.get_site_stats.id}"
 }
 
+# Lambda 연결 5: GET /urls (URL 목록 페이지 조회)
+resource "aws_apigatewayv2_integration" "list_urls" {
+  api_id                 = aws_apigatewayv2_api.main.id
+  integration_type       = "AWS_PROXY"
+  integration_uri        = var.list_urls_invoke_arn
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "list_urls" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "GET /urls"
+  target    = "integrations/${aws_apigatewayv2_integration.list_urls.id}"
+}
+
 # Lambda 호출 권한
 resource "aws_lambda_permission" "create_short_url" {
   action        = "lambda:InvokeFunction"
@@ -81,6 +116,13 @@ resource "aws_lambda_permission" "create_short_url" {
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "shorten_batch" {
+  action        = "lambda:InvokeFunction"
+  function_name = var.shorten_batch_function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
+
 resource "aws_lambda_permission" "redirect" {
   action        = "lambda:InvokeFunction"
   function_name = var.redirect_function_name
@@ -100,4 +142,11 @@ resource "aws_lambda_permission" "get_site_stats" {
   function_name = var.get_site_stats_function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
-}
\ No newline at end of file
+}
+
+resource "aws_lambda_permission" "list_urls" {
+  action        = "lambda:InvokeFunction"
+  function_name = var.list_urls_function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
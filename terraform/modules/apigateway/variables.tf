@@ -47,3 +47,23 @@ variable "get_site_stats_function_name" {
   description = "get site stats lambda function name"
   type        = string
 }
+
+variable "list_urls_invoke_arn" {
+  description = "list urls lambda function invoke ARN"
+  type        = string
+}
+
+variable "list_urls_function_name" {
+  description = "list urls lambda function name"
+  type        = string
+}
+
+variable "shorten_batch_invoke_arn" {
+  description = "shorten batch lambda function invoke ARN"
+  type        = string
+}
+
+variable "shorten_batch_function_name" {
+  description = "shorten batch lambda function name"
+  type        = string
+}
@@ -0,0 +1,70 @@
+# 원시 클릭 보관 버킷 (compact_clicks가 clicks 테이블 TTL 전에 날짜별 파일로 기록)
+# - clicks/dt=YYYY-MM-DD/ 파티션 → Athena/Glue에서 바로 조회
+# - 오래된 보관 파일은 저빈도 스토리지 클래스로 이동, archive_retention_days > 0이면 만료
+
+data "aws_caller_identity" "current" {}
+
+resource "aws_s3_bucket" "click_archive" {
+  bucket = "${var.project_name}-click-archive-${var.environment}-${data.aws_caller_identity.current.account_id}"
+}
+
+resource "aws_s3_bucket_public_access_block" "click_archive" {
+  bucket = aws_s3_bucket.click_archive.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "click_archive" {
+  bucket = aws_s3_bucket.click_archive.id
+
+  rule {
+    id     = "tier-click-archive"
+    status = "Enabled"
+
+    filter {
+      prefix = "clicks/"
+    }
+
+    transition {
+      days          = var.archive_transition_days
+      storage_class = var.archive_storage_class
+    }
+
+    # compact_clicks가 중간에 종료돼 남은 멀티파트 업로드 조각 정리
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+
+    dynamic "expiration" {
+      for_each = var.archive_retention_days > 0 ? [var.archive_retention_days] : []
+      content {
+        days = expiration.value
+      }
+    }
+  }
+}
+
+resource "aws_iam_role_policy" "click_archive_write" {
+  name = "${var.project_name}-click-archive-write-${var.environment}"
+  role = var.lambda_role_name
+
+  policy = jsonencode({
+    Version   = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["s3:PutObject", "s3:GetObject", "s3:AbortMultipartUpload"]
+        Resource = "${aws_s3_bucket.click_archive.arn}/clicks/*"
+      },
+      {
+        # manifest가 없을 때 HeadObject가 403 대신 404를 받으려면 ListBucket 필요
+        Effect   = "Allow"
+        Action   = ["s3:ListBucket"]
+        Resource = aws_s3_bucket.click_archive.arn
+      }
+    ]
+  })
+}
@@ -0,0 +1,9 @@
+output "bucket_name" {
+  description = "click archive bucket name"
+  value       = aws_s3_bucket.click_archive.bucket
+}
+
+output "bucket_arn" {
+  description = "click archive bucket ARN"
+  value       = aws_s3_bucket.click_archive.arn
+}
@@ -0,0 +1,32 @@
+variable "project_name" {
+  description = "project name"
+  type        = string
+}
+
+variable "environment" {
+  description = "environment (dev, prod)"
+  type        = string
+}
+
+variable "lambda_role_name" {
+  description = "Lambda IAM role name (compaction job writes archive files)"
+  type        = string
+}
+
+variable "archive_transition_days" {
+  description = "days before archived click files move to archive_storage_class"
+  type        = number
+  default     = 30
+}
+
+variable "archive_storage_class" {
+  description = "S3 storage class for older archived click files"
+  type        = string
+  default     = "GLACIER_IR"
+}
+
+variable "archive_retention_days" {
+  description = "days to keep archived click files, 0 = keep forever"
+  type        = number
+  default     = 0
+}
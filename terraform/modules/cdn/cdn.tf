@@ -0,0 +1,154 @@
+# CDN 앞단 (CloudFront → API Gateway)
+# - 리다이렉트 응답의 Cache-Control(링크별 정책)을 그대로 따름: no-cache면 매번 origin, s-maxage면 엣지에서 응답
+# - POST/통계 API는 Cache-Control이 없어 캐시되지 않음 (default_ttl 0)
+# - 액세스 로그는 S3에 쌓이고 edge_log_consumer가 클릭으로 집계 (CLICK_SOURCE=edge)
+
+data "aws_caller_identity" "current" {}
+
+# AllViewerExceptHostHeader: API Gateway는 자기 Host 헤더가 필요하므로 Host만 빼고 전달 (UA/Referer 등은 origin까지 전달)
+data "aws_cloudfront_origin_request_policy" "all_viewer_except_host" {
+  name = "Managed-AllViewerExceptHostHeader"
+}
+
+resource "aws_cloudfront_cache_policy" "redirects" {
+  name        = "${var.project_name}-redirects-${var.environment}"
+  comment     = "origin Cache-Control 기준 캐시, 캐시 키는 경로만"
+  min_ttl     = 0
+  default_ttl = 0
+  max_ttl     = 31536000
+
+  parameters_in_cache_key_and_forwarded_to_origin {
+    enable_accept_encoding_gzip   = false
+    enable_accept_encoding_brotli = false
+
+    cookies_config {
+      cookie_behavior = "none"
+    }
+    headers_config {
+      header_behavior = "none"
+    }
+    query_strings_config {
+      query_string_behavior = "all"
+    }
+  }
+}
+
+resource "aws_cloudfront_distribution" "main" {
+  enabled     = true
+  comment     = "${var.project_name}-${var.environment}"
+  price_class = "PriceClass_200"
+
+  origin {
+    domain_name = "${var.api_id}.execute-api.${var.aws_region}.amazonaws.com"
+    origin_id   = "apigateway"
+    origin_path = "/${var.environment}"
+
+    custom_origin_config {
+      http_port              = 80
+      https_port             = 443
+      origin_protocol_policy = "https-only"
+      origin_ssl_protocols   = ["TLSv1.2"]
+    }
+  }
+
+  default_cache_behavior {
+    target_origin_id         = "apigateway"
+    viewer_protocol_policy   = "redirect-to-https"
+    allowed_methods          = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+    cached_methods           = ["GET", "HEAD"]
+    cache_policy_id          = aws_cloudfront_cache_policy.redirects.id
+    origin_request_policy_id = data.aws_cloudfront_origin_request_policy.all_viewer_except_host.id
+  }
+
+  logging_config {
+    bucket          = aws_s3_bucket.edge_logs.bucket_domain_name
+    prefix          = "cloudfront/"
+    include_cookies = false
+  }
+
+  restrictions {
+    geo_restriction {
+      restriction_type = "none"
+    }
+  }
+
+  viewer_certificate {
+    cloudfront_default_certificate = true
+  }
+
+  depends_on = [aws_s3_bucket_acl.edge_logs]
+}
+
+# 액세스 로그 버킷 (CloudFront 표준 로그는 ACL 기반 전달이 필요)
+resource "aws_s3_bucket" "edge_logs" {
+  bucket = "${var.project_name}-edge-logs-${var.environment}-${data.aws_caller_identity.current.account_id}"
+}
+
+resource "aws_s3_bucket_ownership_controls" "edge_logs" {
+  bucket = aws_s3_bucket.edge_logs.id
+
+  rule {
+    object_ownership = "BucketOwnerPreferred"
+  }
+}
+
+resource "aws_s3_bucket_acl" "edge_logs" {
+  bucket     = aws_s3_bucket.edge_logs.id
+  acl        = "log-delivery-write"
+  depends_on = [aws_s3_bucket_ownership_controls.edge_logs]
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "edge_logs" {
+  bucket = aws_s3_bucket.edge_logs.id
+
+  rule {
+    id     = "expire-raw-logs"
+    status = "Enabled"
+
+    filter {
+      prefix = "cloudfront/"
+    }
+
+    expiration {
+      days = var.log_retention_days
+    }
+  }
+}
+
+# 로그 파일 생성 → edge_log_consumer 호출
+resource "aws_lambda_permission" "edge_logs" {
+  statement_id  = "AllowS3Invoke"
+  action        = "lambda:InvokeFunction"
+  function_name = var.edge_log_consumer_function_name
+  principal     = "s3.amazonaws.com"
+  source_arn    = aws_s3_bucket.edge_logs.arn
+}
+
+resource "aws_s3_bucket_notification" "edge_logs" {
+  bucket = aws_s3_bucket.edge_logs.id
+
+  lambda_function {
+    lambda_function_arn = var.edge_log_consumer_arn
+    events              = ["s3:ObjectCreated:*"]
+    filter_prefix       = "cloudfront/"
+    filter_suffix       = ".gz"
+  }
+
+  depends_on = [aws_lambda_permission.edge_logs]
+}
+
+resource "aws_iam_role_policy" "edge_logs_read" {
+  name = "${var.project_name}-edge-logs-read-${var.environment}"
+  role = var.lambda_role_name
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["s3:GetObject"]
+        Resource = "${aws_s3_bucket.edge_logs.arn}/cloudfront/*"
+      }
+    ]
+  })
+}
@@ -0,0 +1,14 @@
+output "distribution_domain_name" {
+  description = "CloudFront distribution domain name"
+  value       = aws_cloudfront_distribution.main.domain_name
+}
+
+output "distribution_id" {
+  description = "CloudFront distribution ID"
+  value       = aws_cloudfront_distribution.main.id
+}
+
+output "log_bucket_name" {
+  description = "CDN access log bucket name"
+  value       = aws_s3_bucket.edge_logs.bucket
+}
@@ -0,0 +1,40 @@
+variable "project_name" {
+  description = "project name"
+  type        = string
+}
+
+variable "environment" {
+  description = "environment (dev, prod)"
+  type        = string
+}
+
+variable "aws_region" {
+  description = "AWS region of the API Gateway origin"
+  type        = string
+}
+
+variable "api_id" {
+  description = "API Gateway ID (origin)"
+  type        = string
+}
+
+variable "lambda_role_name" {
+  description = "Lambda IAM role name (edge log consumer needs read access to the log bucket)"
+  type        = string
+}
+
+variable "edge_log_consumer_arn" {
+  description = "edge log consumer Lambda function ARN"
+  type        = string
+}
+
+variable "edge_log_consumer_function_name" {
+  description = "edge log consumer Lambda function name"
+  type        = string
+}
+
+variable "log_retention_days" {
+  description = "days to keep raw CDN access logs in S3"
+  type        = number
+  default     = 7
+}
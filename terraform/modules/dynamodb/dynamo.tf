@@ -7,6 +7,44 @@ resource "aws_dynamodb_table" "urls" {
     name = "urlId"
     type = "S" # String
   }
+
+  # 목록 조회용 GSI (listKey = url#{crc32(urlId) % LIST_KEY_SHARDS} → 샤드별 정렬 키 순서로 조회 후 병합)
+  attribute {
+    name = "listKey"
+    type = "S"
+  }
+
+  attribute {
+    name = "createdAt"
+    type = "S"
+  }
+
+  attribute {
+    name = "listClicks"
+    type = "N"
+  }
+
+  global_secondary_index {
+    name               = "byCreatedAt"
+    hash_key           = "listKey"
+    range_key          = "createdAt"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["shortUrl", "originalUrl", "clickCount", "listClicks", "expiresAt", "expiresAtEpoch"]
+  }
+
+  global_secondary_index {
+    name               = "byClicks"
+    hash_key           = "listKey"
+    range_key          = "listClicks"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["shortUrl", "originalUrl", "clickCount", "createdAt", "expiresAt", "expiresAtEpoch"]
+  }
+
+  # 만료 링크 자동 삭제 (ttl = 만료 + url_expired_retention_days, 그동안은 410 응답)
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
 }
 
 # 클릭 통계 테이블
@@ -19,4 +57,76 @@ resource "aws_dynamodb_table" "stats" {
     name = "statsId"
     type = "S"
   }
-}
\ No newline at end of file
+}
+
+# 샤딩 클릭 카운터 테이블 (counterId = clicks#{urlId}#{shard})
+resource "aws_dynamodb_table" "counters" {
+  name         = "${var.project_name}-counters-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "counterId"
+
+  attribute {
+    name = "counterId"
+    type = "S"
+  }
+}
+
+
+# 클릭 로그 테이블 (URL별 Query + 기간 조건, TTL 자동 만료)
+resource "aws_dynamodb_table" "clicks" {
+  name         = "${var.project_name}-clicks-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "urlId"
+  range_key    = "clickKey" # {ISO timestamp}#{id}
+
+  attribute {
+    name = "urlId"
+    type = "S"
+  }
+
+  attribute {
+    name = "clickKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+}
+
+
+# 클릭 롤업 테이블 (scope = urlId | __site__, bucket = hod#/dev#/ref#/cty#/t#)
+resource "aws_dynamodb_table" "rollups" {
+  name         = "${var.project_name}-rollups-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "scope"
+  range_key    = "bucket"
+
+  attribute {
+    name = "scope"
+    type = "S"
+  }
+
+  attribute {
+    name = "bucket"
+    type = "S"
+  }
+}
+
+# URL 생성 중복 제거 / 멱등성 테이블 (dedupKey = url#{hash} | idem#{Idempotency-Key})
+resource "aws_dynamodb_table" "dedup" {
+  name         = "${var.project_name}-dedup-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "dedupKey"
+
+  attribute {
+    name = "dedupKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+}
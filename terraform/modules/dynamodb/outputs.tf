@@ -17,3 +17,43 @@ output "stats_table_arn" {
   description = "DynamoDB stats table ARN"
   value       = aws_dynamodb_table.stats.arn
 }
+
+output "counters_table_name" {
+  description = "DynamoDB counters table name"
+  value       = aws_dynamodb_table.counters.name
+}
+
+output "counters_table_arn" {
+  description = "DynamoDB counters table ARN"
+  value       = aws_dynamodb_table.counters.arn
+}
+
+output "clicks_table_name" {
+  description = "DynamoDB clicks table name"
+  value       = aws_dynamodb_table.clicks.name
+}
+
+output "clicks_table_arn" {
+  description = "DynamoDB clicks table ARN"
+  value       = aws_dynamodb_table.clicks.arn
+}
+
+output "rollups_table_name" {
+  description = "DynamoDB rollups table name"
+  value       = aws_dynamodb_table.rollups.name
+}
+
+output "rollups_table_arn" {
+  description = "DynamoDB rollups table ARN"
+  value       = aws_dynamodb_table.rollups.arn
+}
+
+output "dedup_table_name" {
+  description = "DynamoDB dedup table name"
+  value       = aws_dynamodb_table.dedup.name
+}
+
+output "dedup_table_arn" {
+  description = "DynamoDB dedup table ARN"
+  value       = aws_dynamodb_table.dedup.arn
+}
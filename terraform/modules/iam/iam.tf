@@ -26,19 +26,47 @@ resource "aws_iam_role_policy" "lambda_dynamodb" {
       Effect = "Allow"
       Action = [
         "dynamodb:GetItem",
+        "dynamodb:BatchGetItem",
         "dynamodb:PutItem",
         "dynamodb:UpdateItem",
+        "dynamodb:DeleteItem",
+        "dynamodb:BatchWriteItem",
         "dynamodb:Query",
         "dynamodb:Scan"
       ]
       Resource = [
         var.urls_table_arn,
-        var.stats_table_arn
+        "${var.urls_table_arn}/index/*",
+        var.stats_table_arn,
+        var.counters_table_arn,
+        var.clicks_table_arn,
+        var.rollups_table_arn,
+        var.dedup_table_arn
       ]
     }]
   })
 }
 
+# SQS 권한 (클릭 이벤트 큐 송신/수신)
+resource "aws_iam_role_policy" "lambda_sqs" {
+  name = "lambda-sqs"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Action = [
+        "sqs:SendMessage",
+        "sqs:ReceiveMessage",
+        "sqs:DeleteMessage",
+        "sqs:GetQueueAttributes"
+      ]
+      Resource = var.click_queue_arn
+    }]
+  })
+}
+
 # CloudWatch Logs 권한
 resource "aws_iam_role_policy" "lambda_cloudwatch_logs" {
   name = "lambda-cloudwatch-logs"
@@ -17,3 +17,28 @@ variable "stats_table_arn" {
   description = "DynamoDB stats table ARN"
   type        = string
 }
+
+variable "click_queue_arn" {
+  description = "click events SQS queue ARN"
+  type        = string
+}
+
+variable "counters_table_arn" {
+  description = "DynamoDB counters table ARN"
+  type        = string
+}
+
+variable "clicks_table_arn" {
+  description = "DynamoDB clicks table ARN"
+  type        = string
+}
+
+variable "rollups_table_arn" {
+  description = "DynamoDB rollups table ARN"
+  type        = string
+}
+
+variable "dedup_table_arn" {
+  description = "DynamoDB dedup table ARN"
+  type        = string
+}
@@ -1,9 +1,24 @@
+# 공통 레이어 (linksnap_common: 샤딩 카운터 등 함수 패키지 간 공유 모듈)
+data "archive_file" "common_layer" {
+  type        = "zip"
+  source_dir  = "${path.root}/../lambda/layers/common"
+  output_path = "${path.module}/builds/common_layer.zip"
+}
+
+resource "aws_lambda_layer_version" "common" {
+  layer_name          = "${var.project_name}-common-${var.environment}"
+  filename            = data.archive_file.common_layer.output_path
+  source_code_hash    = data.archive_file.common_layer.output_base64sha256
+  compatible_runtimes = ["python3.10"]
+}
+
 resource "aws_lambda_function" "create_short_url" {
   function_name = "${var.project_name}-create-short-url-${var.environment}"
 
   runtime = "python3.10"
   handler = "shorten_url.handler"
   role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
   timeout = 10
 
   filename         = "${path.module}/builds/create_url.zip"
@@ -11,8 +26,57 @@ resource "aws_lambda_function" "create_short_url" {
 
   environment {
     variables = {
-      URLS_TABLE  = var.urls_table_name
-      STATS_TABLE = var.stats_table_name
+      URLS_TABLE                 = var.urls_table_name
+      COUNTERS_TABLE             = var.counters_table_name
+      ROLLUPS_TABLE              = var.rollups_table_name
+      SITE_SUMMARY_ENABLED       = "true"
+      URL_ID_ALLOCATOR           = "block"
+      URL_ID_LENGTH              = var.url_id_length
+      DEDUP_TABLE                = var.dedup_table_name
+      URL_DEDUP_ENABLED          = "true"
+      IDEMPOTENCY_ENABLED        = "true"
+      REDIRECT_DEFAULT_STATUS    = var.redirect_default_status
+      REDIRECT_DEFAULT_MAX_AGE   = var.redirect_default_max_age
+      URL_ID_RECLAIM_EXPIRED     = "true"
+      URL_EXPIRED_RETENTION_DAYS = var.url_expired_retention_days
+      CLICK_COUNTER_SHARDS       = var.click_counter_shards
+      LIST_KEY_SHARDS            = var.url_list_key_shards
+    }
+  }
+}
+
+# URL 일괄 단축 (create_url.zip 공유, POST /shorten/batch)
+resource "aws_lambda_function" "shorten_batch" {
+  function_name = "${var.project_name}-shorten-batch-${var.environment}"
+
+  runtime     = "python3.10"
+  handler     = "shorten_batch.handler"
+  role        = var.lambda_role_arn
+  layers      = [aws_lambda_layer_version.common.arn]
+  timeout     = 60
+  memory_size = 512
+
+  filename         = "${path.module}/builds/create_url.zip"
+  source_code_hash = filebase64sha256("${path.module}/builds/create_url.zip")
+
+  environment {
+    variables = {
+      URLS_TABLE                      = var.urls_table_name
+      COUNTERS_TABLE                  = var.counters_table_name
+      ROLLUPS_TABLE                   = var.rollups_table_name
+      SITE_SUMMARY_ENABLED            = "true"
+      URL_ID_ALLOCATOR                = "block"
+      URL_ID_LENGTH                   = var.url_id_length
+      SHORTEN_BATCH_MAX_ITEMS         = "5000"
+      SHORTEN_BATCH_WRITE_CONCURRENCY = "16"
+      DEDUP_TABLE                     = var.dedup_table_name
+      URL_DEDUP_ENABLED               = "true"
+      REDIRECT_DEFAULT_STATUS         = var.redirect_default_status
+      REDIRECT_DEFAULT_MAX_AGE        = var.redirect_default_max_age
+      URL_ID_RECLAIM_EXPIRED          = "true"
+      URL_EXPIRED_RETENTION_DAYS      = var.url_expired_retention_days
+      CLICK_COUNTER_SHARDS            = var.click_counter_shards
+      LIST_KEY_SHARDS                 = var.url_list_key_shards
     }
   }
 }
@@ -23,6 +87,7 @@ resource "aws_lambda_function" "redirect" {
   runtime = "python3.10"
   handler = "redirect.handler"
   role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
   timeout = 10
 
   filename         = "${path.module}/builds/redirect.zip"
@@ -30,8 +95,97 @@ resource "aws_lambda_function" "redirect" {
 
   environment {
     variables = {
-      URLS_TABLE  = var.urls_table_name
-      STATS_TABLE = var.stats_table_name
+      URLS_TABLE            = var.urls_table_name
+      CLICKS_TABLE          = var.clicks_table_name
+      CLICK_TTL_DAYS        = var.click_ttl_days
+      CLICK_SCHEMA          = var.click_schema
+      CLICK_IP_MODE         = var.click_ip_mode
+      CLICK_IP_SALT         = var.click_ip_salt
+      COUNTERS_TABLE        = var.counters_table_name
+      CLICK_RECORDING_MODE  = "async"
+      CLICK_QUEUE_URL       = var.click_queue_url
+      CLICK_COUNTER_MODE    = "sharded"
+      CLICK_COUNTER_SHARDS  = var.click_counter_shards
+      ROLLUPS_TABLE         = var.rollups_table_name
+      URL_CACHE_SIZE        = "4096"
+      URL_CACHE_TTL_SECONDS = "300"
+      CLICK_SOURCE          = var.click_source
+      BOT_FILTER_MODE       = var.bot_filter_mode
+      AWS_PRELOAD_CLIENTS   = "dynamodb,sqs"
+    }
+  }
+}
+
+# 클릭 이벤트 Consumer (redirect.zip 공유, SQS 배치 → stats/urls 기록)
+resource "aws_lambda_function" "click_consumer" {
+  function_name = "${var.project_name}-click-consumer-${var.environment}"
+
+  runtime = "python3.10"
+  handler = "click_consumer.handler"
+  role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
+  timeout = 30
+
+  filename         = "${path.module}/builds/redirect.zip"
+  source_code_hash = filebase64sha256("${path.module}/builds/redirect.zip")
+
+  environment {
+    variables = {
+      URLS_TABLE           = var.urls_table_name
+      CLICKS_TABLE         = var.clicks_table_name
+      CLICK_TTL_DAYS       = var.click_ttl_days
+      CLICK_SCHEMA         = var.click_schema
+      CLICK_IP_MODE        = var.click_ip_mode
+      CLICK_IP_SALT        = var.click_ip_salt
+      COUNTERS_TABLE       = var.counters_table_name
+      CLICK_COUNTER_MODE   = "sharded"
+      CLICK_COUNTER_SHARDS = var.click_counter_shards
+      ROLLUPS_TABLE        = var.rollups_table_name
+      ROLLUPS_ENABLED      = var.rollups_enabled
+      SITE_SUMMARY_ENABLED = "true"
+      URL_LISTING_ENABLED  = "true"
+    }
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "click_consumer" {
+  event_source_arn                   = var.click_queue_arn
+  function_name                      = aws_lambda_function.click_consumer.arn
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 5
+  function_response_types            = ["ReportBatchItemFailures"]
+}
+
+# CDN 엣지 로그 Consumer (redirect.zip 공유, S3 로그 파일 → 클릭 배치 기록, CLICK_SOURCE=edge)
+resource "aws_lambda_function" "edge_log_consumer" {
+  function_name = "${var.project_name}-edge-log-consumer-${var.environment}"
+
+  runtime     = "python3.10"
+  handler     = "edge_log_consumer.handler"
+  role        = var.lambda_role_arn
+  layers      = [aws_lambda_layer_version.common.arn]
+  timeout     = 300
+  memory_size = 512
+
+  filename         = "${path.module}/builds/redirect.zip"
+  source_code_hash = filebase64sha256("${path.module}/builds/redirect.zip")
+
+  environment {
+    variables = {
+      URLS_TABLE           = var.urls_table_name
+      CLICKS_TABLE         = var.clicks_table_name
+      CLICK_TTL_DAYS       = var.click_ttl_days
+      CLICK_SCHEMA         = var.click_schema
+      CLICK_IP_MODE        = var.click_ip_mode
+      CLICK_IP_SALT        = var.click_ip_salt
+      COUNTERS_TABLE       = var.counters_table_name
+      CLICK_COUNTER_MODE   = "sharded"
+      CLICK_COUNTER_SHARDS = var.click_counter_shards
+      ROLLUPS_TABLE        = var.rollups_table_name
+      ROLLUPS_ENABLED      = var.rollups_enabled
+      SITE_SUMMARY_ENABLED = "true"
+      URL_LISTING_ENABLED  = "true"
+      BOT_FILTER_MODE      = var.bot_filter_mode
     }
   }
 }
@@ -43,6 +197,7 @@ resource "aws_lambda_function" "get_url_stats" {
   runtime = "python3.10"
   handler = "get_url_stats.handler"
   role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
   timeout = 30
 
   filename         = "${path.module}/builds/stats.zip"
@@ -50,8 +205,14 @@ resource "aws_lambda_function" "get_url_stats" {
 
   environment {
     variables = {
-      URLS_TABLE  = var.urls_table_name
-      STATS_TABLE = var.stats_table_name
+      URLS_TABLE           = var.urls_table_name
+      CLICKS_TABLE         = var.clicks_table_name
+      CLICK_TTL_DAYS       = var.click_ttl_days
+      COUNTERS_TABLE       = var.counters_table_name
+      CLICK_COUNTER_MODE   = "sharded"
+      CLICK_COUNTER_SHARDS = var.click_counter_shards
+      ROLLUPS_TABLE        = var.rollups_table_name
+      STATS_SOURCE         = "rollups"
     }
   }
 }
@@ -63,6 +224,7 @@ resource "aws_lambda_function" "get_site_stats" {
   runtime = "python3.10"
   handler = "get_site_stats.handler"
   role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
   timeout = 30
 
   filename         = "${path.module}/builds/stats.zip"
@@ -70,8 +232,132 @@ resource "aws_lambda_function" "get_site_stats" {
 
   environment {
     variables = {
-      URLS_TABLE  = var.urls_table_name
-      STATS_TABLE = var.stats_table_name
+      URLS_TABLE           = var.urls_table_name
+      EXCLUDE_EXPIRED_URLS = "true"
+      CLICKS_TABLE         = var.clicks_table_name
+      CLICK_TTL_DAYS       = var.click_ttl_days
+      COUNTERS_TABLE       = var.counters_table_name
+      CLICK_COUNTER_MODE   = "sharded"
+      CLICK_COUNTER_SHARDS = var.click_counter_shards
+      ROLLUPS_TABLE        = var.rollups_table_name
+      STATS_SOURCE         = "rollups"
+      SITE_STATS_SOURCE    = "summary"
+      SCAN_SEGMENTS        = var.scan_segments
     }
   }
-}
\ No newline at end of file
+}
+
+# Lambda 함수 5: URL 목록 조회 (GSI 페이지네이션)
+resource "aws_lambda_function" "list_urls" {
+  function_name = "${var.project_name}-list-urls-${var.environment}"
+
+  runtime = "python3.10"
+  handler = "list_urls.handler"
+  role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
+  timeout = 10
+
+  filename         = "${path.module}/builds/stats.zip"
+  source_code_hash = filebase64sha256("${path.module}/builds/stats.zip")
+
+  environment {
+    variables = {
+      URLS_TABLE           = var.urls_table_name
+      EXCLUDE_EXPIRED_URLS = "true"
+      LIST_KEY_SHARDS      = var.url_list_key_shards
+    }
+  }
+}
+
+# 사이트 요약 문서 재계산 (stats.zip 공유, EventBridge 스케줄로 주기 실행)
+resource "aws_lambda_function" "reconcile_site_summary" {
+  function_name = "${var.project_name}-reconcile-site-summary-${var.environment}"
+
+  runtime = "python3.10"
+  handler = "reconcile_site_summary.handler"
+  role    = var.lambda_role_arn
+  layers  = [aws_lambda_layer_version.common.arn]
+  timeout = 300
+
+  filename         = "${path.module}/builds/stats.zip"
+  source_code_hash = filebase64sha256("${path.module}/builds/stats.zip")
+
+  environment {
+    variables = {
+      URLS_TABLE           = var.urls_table_name
+      EXCLUDE_EXPIRED_URLS = "true"
+      CLICKS_TABLE         = var.clicks_table_name
+      COUNTERS_TABLE       = var.counters_table_name
+      CLICK_COUNTER_MODE   = "sharded"
+      CLICK_COUNTER_SHARDS = var.click_counter_shards
+      ROLLUPS_TABLE        = var.rollups_table_name
+      STATS_SOURCE         = "rollups"
+      SCAN_SEGMENTS        = var.scan_segments
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "reconcile_site_summary" {
+  name                = "${var.project_name}-reconcile-site-summary-${var.environment}"
+  schedule_expression = var.site_summary_reconcile_schedule
+}
+
+resource "aws_cloudwatch_event_target" "reconcile_site_summary" {
+  rule = aws_cloudwatch_event_rule.reconcile_site_summary.name
+  arn  = aws_lambda_function.reconcile_site_summary.arn
+}
+
+resource "aws_lambda_permission" "reconcile_site_summary" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.reconcile_site_summary.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.reconcile_site_summary.arn
+}
+
+# 원시 클릭 보관 (stats.zip 공유, 매일 TTL 만료 전 날짜를 압축 파일로 기록)
+resource "aws_lambda_function" "compact_clicks" {
+  function_name = "${var.project_name}-compact-clicks-${var.environment}"
+
+  runtime     = "python3.10"
+  handler     = "compact_clicks.handler"
+  role        = var.lambda_role_arn
+  layers      = [aws_lambda_layer_version.common.arn]
+  timeout     = 900
+  memory_size = 1024
+
+  filename         = "${path.module}/builds/stats.zip"
+  source_code_hash = filebase64sha256("${path.module}/builds/stats.zip")
+
+  environment {
+    variables = {
+      CLICKS_TABLE            = var.clicks_table_name
+      ROLLUPS_TABLE           = var.rollups_table_name
+      CLICK_TTL_DAYS          = var.click_ttl_days
+      ARCHIVE_URL             = var.archive_url
+      ARCHIVE_FORMAT          = var.archive_format
+      ARCHIVE_AFTER_DAYS      = var.archive_after_days
+      COMPACTION_FOLD_ROLLUPS = !var.rollups_enabled
+      COMPACTION_MAX_DAYS     = "3"
+      SCAN_SEGMENTS           = var.scan_segments
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "compact_clicks" {
+  name                = "${var.project_name}-compact-clicks-${var.environment}"
+  schedule_expression = var.compaction_schedule
+}
+
+resource "aws_cloudwatch_event_target" "compact_clicks" {
+  rule = aws_cloudwatch_event_rule.compact_clicks.name
+  arn  = aws_lambda_function.compact_clicks.arn
+}
+
+resource "aws_lambda_permission" "compact_clicks" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.compact_clicks.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.compact_clicks.arn
+}
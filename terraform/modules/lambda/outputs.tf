@@ -37,3 +37,48 @@ output "get_site_stats_invoke_arn" {
   description = "get site stats Lambda function invoke ARN"
   value       = aws_lambda_function.get_site_stats.invoke_arn
 }
+
+output "shorten_batch_function_name" {
+  description = "shorten batch Lambda function name"
+  value       = aws_lambda_function.shorten_batch.function_name
+}
+
+output "shorten_batch_invoke_arn" {
+  description = "shorten batch Lambda function invoke ARN"
+  value       = aws_lambda_function.shorten_batch.invoke_arn
+}
+
+output "list_urls_function_name" {
+  description = "list urls Lambda function name"
+  value       = aws_lambda_function.list_urls.function_name
+}
+
+output "list_urls_invoke_arn" {
+  description = "list urls Lambda function invoke ARN"
+  value       = aws_lambda_function.list_urls.invoke_arn
+}
+
+output "click_consumer_function_name" {
+  description = "click consumer Lambda function name"
+  value       = aws_lambda_function.click_consumer.function_name
+}
+
+output "reconcile_site_summary_function_name" {
+  description = "site summary reconcile Lambda function name"
+  value       = aws_lambda_function.reconcile_site_summary.function_name
+}
+
+output "edge_log_consumer_function_name" {
+  description = "edge log consumer Lambda function name"
+  value       = aws_lambda_function.edge_log_consumer.function_name
+}
+
+output "edge_log_consumer_arn" {
+  description = "edge log consumer Lambda function ARN"
+  value       = aws_lambda_function.edge_log_consumer.arn
+}
+
+output "compact_clicks_function_name" {
+  description = "raw click archive (compaction) Lambda function name"
+  value       = aws_lambda_function.compact_clicks.function_name
+}
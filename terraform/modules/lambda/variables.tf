@@ -18,7 +18,146 @@ variable "urls_table_name" {
   type        = string
 }
 
-variable "stats_table_name" {
-  description = "DynamoDB stats table name"
+variable "click_queue_url" {
+  description = "click events SQS queue URL"
   type        = string
 }
+
+variable "click_queue_arn" {
+  description = "click events SQS queue ARN"
+  type        = string
+}
+
+variable "counters_table_name" {
+  description = "DynamoDB counters table name"
+  type        = string
+}
+
+variable "click_counter_shards" {
+  description = "number of shard items per URL click counter"
+  type        = number
+  default     = 10
+}
+
+variable "url_list_key_shards" {
+  description = "number of listKey partitions for the URL listing GSIs (run backfill_url_listing.py after changing)"
+  type        = number
+  default     = 8
+}
+
+variable "clicks_table_name" {
+  description = "DynamoDB clicks table name"
+  type        = string
+}
+
+variable "click_ttl_days" {
+  description = "raw click retention in the clicks table (days)"
+  type        = number
+  default     = 90
+}
+
+variable "rollups_table_name" {
+  description = "DynamoDB rollups table name"
+  type        = string
+}
+
+variable "rollups_enabled" {
+  description = "update rollup buckets when click batches are consumed; when false the daily compaction folds archived clicks into the rollups instead"
+  type        = bool
+  default     = true
+}
+
+variable "site_summary_reconcile_schedule" {
+  description = "EventBridge schedule for rebuilding the site summary document"
+  type        = string
+  default     = "rate(1 hour)"
+}
+
+variable "url_id_length" {
+  description = "length of generated base62 short codes"
+  type        = number
+  default     = 7
+}
+
+variable "dedup_table_name" {
+  description = "DynamoDB dedup table name"
+  type        = string
+}
+
+variable "click_source" {
+  description = "where clicks are counted: origin (redirect Lambda) or edge (CDN access logs)"
+  type        = string
+  default     = "origin"
+}
+
+variable "redirect_default_status" {
+  description = "default redirect status for new links (301, 302, 308)"
+  type        = number
+  default     = 301
+}
+
+variable "redirect_default_max_age" {
+  description = "default Cache-Control max-age (seconds) for new 301/308 links, 0 = no-cache"
+  type        = number
+  default     = 0
+}
+
+variable "scan_segments" {
+  description = "parallel scan segments (threads) for full-table scans in site stats / reconcile, 1 = sequential"
+  type        = number
+  default     = 4
+}
+
+variable "click_schema" {
+  description = "clicks table item format for new clicks: full (raw user agent / referer / ISO timestamp / IP) or compact (classified at write time)"
+  type        = string
+  default     = "compact"
+}
+
+variable "click_ip_mode" {
+  description = "compact schema IP handling: hash (salted sha256 prefix) or drop"
+  type        = string
+  default     = "hash"
+}
+
+variable "click_ip_salt" {
+  description = "salt for hashed client IPs in compact click items"
+  type        = string
+  default     = ""
+  sensitive   = true
+}
+
+variable "bot_filter_mode" {
+  description = "redirect bot/prefetch/HEAD filtering: off (count everything), skip (don't record, metrics only) or tally (also per-URL flt# rollup buckets, tallied by click_consumer from queued events)"
+  type        = string
+  default     = "tally"
+}
+
+variable "archive_url" {
+  description = "raw click archive location: s3://bucket/prefix (or file:///path locally)"
+  type        = string
+}
+
+variable "archive_format" {
+  description = "raw click archive file format: ndjson (gzip NDJSON) or parquet (needs pyarrow in the layer)"
+  type        = string
+  default     = "ndjson"
+}
+
+variable "archive_after_days" {
+  description = "archive a day of raw clicks once it is this many days old (late clicks settled)"
+  type        = number
+  default     = 2
+}
+
+variable "compaction_schedule" {
+  description = "EventBridge schedule for archiving raw clicks before TTL expiry"
+  type        = string
+  default     = "cron(30 3 * * ? *)"
+}
+
+variable "url_expired_retention_days" {
+  description = "days an expired link stays in the urls table (answering 410) before DynamoDB TTL deletes it and its code can be reused"
+  type        = number
+  default     = 7
+}
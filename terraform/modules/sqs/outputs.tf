@@ -0,0 +1,9 @@
+output "click_queue_url" {
+  description = "click events SQS queue URL"
+  value       = aws_sqs_queue.click_events.url
+}
+
+output "click_queue_arn" {
+  description = "click events SQS queue ARN"
+  value       = aws_sqs_queue.click_events.arn
+}
@@ -0,0 +1,17 @@
+# 클릭 이벤트 큐 (redirect → click_consumer)
+resource "aws_sqs_queue" "click_events" {
+  name                       = "${var.project_name}-click-events-${var.environment}"
+  visibility_timeout_seconds = 60 # consumer timeout보다 길게
+  message_retention_seconds  = 345600 # 4일
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.click_events_dlq.arn
+    maxReceiveCount     = 5
+  })
+}
+
+# 처리 실패 이벤트 보관용 DLQ
+resource "aws_sqs_queue" "click_events_dlq" {
+  name                      = "${var.project_name}-click-events-dlq-${var.environment}"
+  message_retention_seconds = 1209600 # 14일
+}
@@ -0,0 +1,9 @@
+variable "project_name" {
+  description = "project name"
+  type        = string
+}
+
+variable "environment" {
+  description = "environment (dev, prod)"
+  type        = string
+}
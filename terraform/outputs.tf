@@ -13,6 +13,11 @@ output "nameservers" {
   value       = module.route53.nameservers
 }
 
+output "cdn_domain_name" {
+  description = "CloudFront 도메인 (enable_cdn=true일 때)"
+  value       = var.enable_cdn ? module.cdn[0].distribution_domain_name : null
+}
+
 output "urls_table_name" {
   description = "DynamoDB urls table name"
   value       = module.dynamodb.urls_table_name
@@ -23,6 +28,16 @@ output "stats_table_name" {
   value       = module.dynamodb.stats_table_name
 }
 
+output "clicks_table_name" {
+  description = "DynamoDB clicks table name"
+  value       = module.dynamodb.clicks_table_name
+}
+
+output "click_archive_bucket" {
+  description = "raw click archive S3 bucket"
+  value       = module.archive.bucket_name
+}
+
 # ============================================
 # CloudWatch & Discord Alert Outputs
 # ============================================
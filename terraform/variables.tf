@@ -22,6 +22,18 @@ variable "domain_name" {
   default     = "shmall.store"
 }
 
+variable "enable_cdn" {
+  description = "CloudFront CDN으로 리다이렉트를 엣지 캐시하고 클릭을 엣지 로그에서 집계"
+  type        = bool
+  default     = false
+}
+
+variable "redirect_default_max_age" {
+  description = "CDN 사용 시 새 링크(301/308)의 기본 캐시 시간 (초, expiresAt을 넘지 않음)"
+  type        = number
+  default     = 86400
+}
+
 # ============================================
 # CloudWatch & Discord Alert 설정
 # ============================================